@@ -0,0 +1,87 @@
+"""
+Microbenchmark for associating OCR blocks with layout regions.
+
+Compares the previous nested loop, which recomputes every OCR block center
+for every region, with lookups in a spatial index built once per page, on
+synthetic pages of increasing density.
+
+Usage:
+    python benchmarks/bench_association.py [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from pyscientificpdfparser.models import TextBlock
+from pyscientificpdfparser.spatial import SpatialIndex
+
+
+def _page(words: int, regions: int) -> tuple[list[TextBlock], list[TextBlock]]:
+    """Random word boxes and region boxes on a 300 DPI A4 page."""
+    rng = np.random.default_rng(0)
+
+    def boxes(count: int, size: tuple[float, float]) -> list[TextBlock]:
+        origins = rng.uniform(0, [2480 - size[0], 3508 - size[1]], size=(count, 2))
+        return [
+            TextBlock(
+                text=f"w{i}", bbox=(x, y, x + size[0], y + size[1]), page_number=1
+            )
+            for i, (x, y) in enumerate(origins.tolist())
+        ]
+
+    return boxes(words, (60, 20)), boxes(regions, (600, 200))
+
+
+def _legacy(ocr_blocks: list[TextBlock], regions: list[TextBlock]) -> list[str]:
+    """The original center-containment loop, kept here for comparison."""
+    texts = []
+    for element in regions:
+        contained = []
+        for block in ocr_blocks:
+            center_x = (block.bbox[0] + block.bbox[2]) / 2
+            center_y = (block.bbox[1] + block.bbox[3]) / 2
+            if (
+                element.bbox[0] <= center_x <= element.bbox[2]
+                and element.bbox[1] <= center_y <= element.bbox[3]
+            ):
+                contained.append(block.text)
+        texts.append(" ".join(contained))
+    return texts
+
+
+def _indexed(ocr_blocks: list[TextBlock], regions: list[TextBlock]) -> list[str]:
+    """Center containment through a spatial index built for the page."""
+    index = SpatialIndex.from_elements(ocr_blocks)
+    return [
+        " ".join(ocr_blocks[i].text for i in index.query_centers(element.bbox).tolist())
+        for element in regions
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'words':>6} {'regions':>8} {'legacy ms':>10} {'indexed ms':>11}")
+    for words, regions in ((500, 20), (2000, 60), (8000, 200)):
+        ocr_blocks, elements = _page(words, regions)
+        timings = []
+        for associate in (_legacy, _indexed):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                result = associate(ocr_blocks, elements)
+            timings.append((time.perf_counter() - start) / args.repeat)
+        assert result == _legacy(ocr_blocks, elements)
+        print(
+            f"{words:>6} {regions:>8} {timings[0] * 1000:>10.1f} "
+            f"{timings[1] * 1000:>11.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark of the OCR engines on rendered pages.
+
+Runs every available engine (pytesseract, which starts a `tesseract` process
+per page, and tesserocr, which keeps an in-process API handle) over the
+binarized pages of a PDF and reports the time per page, OCR'ing each page
+whole and split into overlapping bands that run in a thread pool. Engines
+that are not installed are skipped.
+
+Usage:
+    python benchmarks/bench_ocr_engines.py [PDF] [--dpi 300] [--pages 4] [--tiles 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import pathlib
+import time
+
+import fitz
+import numpy as np
+
+from pyscientificpdfparser.ocr import (
+    OcrEngine,
+    PytesseractEngine,
+    TesserocrEngine,
+    _image_to_data_tiled,
+    _process_ocr_data,
+)
+from pyscientificpdfparser.preprocessing import _pixmap_to_array, _preprocess_image
+
+DEFAULT_PDF = (
+    pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "arxiv-1410.6579.pdf"
+)
+
+
+def _binarized_pages(pdf_path: pathlib.Path, dpi: int, count: int) -> list[np.ndarray]:
+    """Renders the first pages of a PDF the way scanned pages are prepared."""
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    with fitz.open(pdf_path) as doc:
+        return [
+            _preprocess_image(
+                _pixmap_to_array(doc[i].get_pixmap(matrix=mat, colorspace=fitz.csGRAY))
+            )
+            for i in range(min(count, doc.page_count))
+        ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pdf", nargs="?", type=pathlib.Path, default=DEFAULT_PDF)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--tiles", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    pages = _binarized_pages(args.pdf, args.dpi, args.pages)
+    print(f"{len(pages)} pages at {args.dpi} DPI")
+    print(f"{'engine':<12} {'version':<20} {'tiles':>6} {'ms/page':>10} {'blocks':>8}")
+    for factory in (PytesseractEngine, TesserocrEngine):
+        try:
+            engine: OcrEngine = factory()
+            version = engine.version
+        except Exception as error:  # Engine or Tesseract not installed
+            print(f"{factory.name:<12} skipped: {error}")
+            continue
+
+        # Load the language model before timing
+        engine.image_to_data(pages[0][:64])
+        for tiles in sorted({1, args.tiles}):
+            blocks = 0
+            start = time.perf_counter()
+            for gray in pages:
+                data = _image_to_data_tiled(engine, gray, "eng", "", tiles, 64)
+                blocks += len(_process_ocr_data(data, 1))
+            elapsed = time.perf_counter() - start
+            print(
+                f"{engine.name:<12} {version:<20} {tiles:>6} "
+                f"{elapsed / len(pages) * 1000:>10.1f} {blocks:>8}"
+            )
+
+
+if __name__ == "__main__":
+    main()
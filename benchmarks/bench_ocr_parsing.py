@@ -0,0 +1,158 @@
+"""
+Microbenchmark for turning Tesseract `image_to_data` output into text blocks.
+
+Compares the previous per-token Python loop with the columnar NumPy
+implementation in `ocr._process_ocr_data`. Tesseract output is synthesized
+from the words of a real PDF (rendered at 300 DPI), laid out with the same
+page/block/paragraph/line/word hierarchy and columns Tesseract produces, so
+the benchmark does not need a Tesseract installation.
+
+Usage:
+    python benchmarks/bench_ocr_parsing.py [PDF] [--repeat 20]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import random
+import time
+from collections import defaultdict
+from typing import Any
+
+import fitz
+
+from pyscientificpdfparser.models import BoundingBox, TextBlock
+from pyscientificpdfparser.ocr import _process_ocr_data
+
+DEFAULT_PDF = (
+    pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "arxiv-1410.6579.pdf"
+)
+
+COLUMNS = (
+    "level",
+    "page_num",
+    "block_num",
+    "par_num",
+    "line_num",
+    "word_num",
+    "left",
+    "top",
+    "width",
+    "height",
+    "conf",
+    "text",
+)
+
+
+def _tesseract_data(page: fitz.Page, zoom: float) -> dict[str, list[Any]]:
+    """Lays out the words of a page like Tesseract's DICT output."""
+    data: dict[str, list[Any]] = {name: [] for name in COLUMNS}
+    rng = random.Random(0)
+
+    def row(
+        level: int, block: int, line: int, word: int, bbox: Any, conf: Any, text: str
+    ) -> None:
+        x0, y0, x1, y1 = (round(v * zoom) for v in bbox)
+        values = (level, 1, block, 1, line, word, x0, y0, x1 - x0, y1 - y0, conf, text)
+        for name, value in zip(COLUMNS, values):
+            data[name].append(value)
+
+    row(1, 0, 0, 0, page.rect, "-1", "")
+    current = (-1, -1)
+    for x0, y0, x1, y1, text, block, line, word in page.get_text("words"):
+        if (block, line) != current:
+            if block != current[0]:
+                row(2, block + 1, 0, 0, (x0, y0, x1, y1), "-1", "")
+            row(4, block + 1, line + 1, 0, (x0, y0, x1, y1), "-1", "")
+            current = (block, line)
+        row(
+            5,
+            block + 1,
+            line + 1,
+            word + 1,
+            (x0, y0, x1, y1),
+            rng.randint(40, 99),
+            text,
+        )
+    return data
+
+
+def _legacy_process_ocr_data(
+    ocr_data: dict[str, list[Any]], page_number: int, scale: float = 1.0
+) -> list[TextBlock]:
+    """The previous per-token implementation, kept here for comparison."""
+    blocks: defaultdict[int, dict[str, list[Any]]] = defaultdict(
+        lambda: {
+            "text": [],
+            "conf": [],
+            "left": [],
+            "top": [],
+            "width": [],
+            "height": [],
+        }
+    )
+    for i in range(len(ocr_data["level"])):
+        if not str(ocr_data["text"][i]).strip() or int(str(ocr_data["conf"][i])) < 0:
+            continue
+        block_num = int(str(ocr_data["block_num"][i]))
+        blocks[block_num]["text"].append(str(ocr_data["text"][i]))
+        blocks[block_num]["conf"].append(int(str(ocr_data["conf"][i])))
+        blocks[block_num]["left"].append(int(str(ocr_data["left"][i])))
+        blocks[block_num]["top"].append(int(str(ocr_data["top"][i])))
+        blocks[block_num]["width"].append(int(str(ocr_data["width"][i])))
+        blocks[block_num]["height"].append(int(str(ocr_data["height"][i])))
+
+    text_blocks = []
+    for data in blocks.values():
+        max_right = max(left + w for left, w in zip(data["left"], data["width"]))
+        max_bottom = max(t + h for t, h in zip(data["top"], data["height"]))
+        bbox: BoundingBox = (
+            min(data["left"]) / scale,
+            min(data["top"]) / scale,
+            max_right / scale,
+            max_bottom / scale,
+        )
+        text_blocks.append(
+            TextBlock(
+                text=" ".join(data["text"]),
+                bbox=bbox,
+                page_number=page_number,
+                confidence=sum(data["conf"]) / len(data["conf"]),
+            )
+        )
+    return text_blocks
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pdf", nargs="?", type=pathlib.Path, default=DEFAULT_PDF)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with fitz.open(args.pdf) as doc:
+        pages = [_tesseract_data(page, 300 / 72) for page in doc]
+    tokens = sum(len(data["level"]) for data in pages)
+    print(f"{len(pages)} pages, {tokens / len(pages):.0f} Tesseract rows per page")
+
+    # The legacy loop keeps no words, so blocks are compared without them
+    for data in pages:
+        assert [block.model_dump() for block in _process_ocr_data(data, 1)] == [
+            block.model_dump() for block in _legacy_process_ocr_data(data, 1)
+        ]
+
+    print(f"{'variant':<10} {'ms/page':>10}")
+    for name, process in (
+        ("legacy", _legacy_process_ocr_data),
+        ("columnar", _process_ocr_data),
+    ):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for data in pages:
+                process(data, 1)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed / (len(pages) * args.repeat) * 1000:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
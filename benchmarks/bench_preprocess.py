@@ -0,0 +1,90 @@
+"""
+Microbenchmark for the optional deskew/denoise stage of scan preprocessing.
+
+Renders the pages of a PDF to grayscale, rotates them by a known angle to
+simulate skewed scans, then compares the plain binarization path with the
+enhanced path (skew estimation on a downsampled copy, one full-resolution
+rotation, binarization and median-blur denoising). Also reports how far the
+estimated skew is from the simulated one.
+
+Usage:
+    python benchmarks/bench_preprocess.py [PDF] [--dpi 300] [--skew 1.5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import time
+
+import cv2
+import fitz
+import numpy as np
+
+from pyscientificpdfparser.preprocessing import (
+    _pixmap_to_array,
+    _preprocess_image,
+    estimate_skew,
+)
+
+DEFAULT_PDF = (
+    pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "arxiv-1410.6579.pdf"
+)
+
+
+def _skewed_pages(pdf_path: pathlib.Path, dpi: int, skew: float) -> list[np.ndarray]:
+    """Renders every page to grayscale and rotates it by `skew` degrees."""
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            gray = _pixmap_to_array(page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY))
+            height, width = gray.shape
+            matrix = cv2.getRotationMatrix2D((width / 2, height / 2), skew, 1)
+            pages.append(cv2.warpAffine(gray, matrix, (width, height), borderValue=255))
+    return pages
+
+
+def _plain(gray: np.ndarray) -> np.ndarray:
+    binary: np.ndarray = _preprocess_image(gray)
+    return binary
+
+
+def _enhanced(gray: np.ndarray) -> np.ndarray:
+    binary: np.ndarray = _preprocess_image(
+        gray, denoise=True, skew_angle=estimate_skew(gray)
+    )
+    return binary
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pdf", nargs="?", type=pathlib.Path, default=DEFAULT_PDF)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--skew", type=float, default=1.5)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = _skewed_pages(args.pdf, args.dpi, args.skew)
+    print(f"{len(pages)} pages at {args.dpi} DPI, skewed by {args.skew} degrees")
+
+    print(f"{'variant':<10} {'ms/page':>10}")
+    for name, variant in (("plain", _plain), ("enhanced", _enhanced)):
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for gray in pages:
+                variant(gray)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<10} {elapsed / (len(pages) * args.repeat) * 1000:>10.1f}")
+
+    start = time.perf_counter()
+    errors = [abs(estimate_skew(gray) + args.skew) for gray in pages]
+    elapsed = time.perf_counter() - start
+    print(
+        f"skew estimation: {elapsed / len(pages) * 1000:.1f} ms/page, "
+        f"max error {max(errors):.3f} degrees"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Microbenchmark for ordering the layout elements of a page.
+
+Compares the previous (top, left) sort with the XY-cut in
+`reading_order.xy_cut_order` on synthetic two-column pages with full-width
+figures, with hundreds of elements per page. Reports the time per page and
+the share of pages each method reads in the right order.
+
+Usage:
+    python benchmarks/bench_reading_order.py [--pages 50] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from pyscientificpdfparser.reading_order import xy_cut_order
+
+
+def _page(rng: np.random.Generator, elements: int) -> tuple[np.ndarray, list[int]]:
+    """
+    A two-column page with full-width figures, shuffled.
+
+    Returns the boxes and the indices of the boxes in reading order.
+    """
+    boxes: list[tuple[float, float, float, float]] = []
+    y = 0.0
+    while len(boxes) < elements:
+        # A block of both columns, then a full-width figure
+        lines = int(rng.integers(5, 30))
+        for x1, x2 in ((100.0, 1200.0), (1280.0, 2380.0)):
+            line_y = y
+            for _ in range(lines):
+                height = float(rng.uniform(20, 60))
+                boxes.append((x1, line_y, x2 - rng.uniform(0, 300), line_y + height))
+                line_y += height + float(rng.uniform(5, 15))
+        y += lines * 75 + 40
+        boxes.append((100.0, y, 2380.0, y + float(rng.uniform(200, 600))))
+        y = boxes[-1][3] + 40
+    permutation = rng.permutation(len(boxes))
+    expected = np.argsort(permutation).tolist()
+    return np.asarray(boxes)[permutation], expected
+
+
+def _legacy(boxes: np.ndarray) -> np.ndarray:
+    """The original (top, left) sort, kept here for comparison."""
+    return np.asarray(
+        sorted(range(len(boxes)), key=lambda i: (boxes[i][1], boxes[i][0]))
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--pages", type=int, default=50)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'elements':>8} {'method':>7} {'ms/page':>8} {'correct':>8}")
+    for elements in (100, 300, 1000):
+        pages = [_page(rng, elements) for _ in range(args.pages)]
+        for name, order in (("legacy", _legacy), ("xy-cut", xy_cut_order)):
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results = [order(boxes) for boxes, _ in pages]
+            elapsed = (time.perf_counter() - start) / args.repeat / len(pages)
+            correct = np.mean(
+                [
+                    result.tolist() == expected
+                    for result, (_, expected) in zip(results, pages)
+                ]
+            )
+            print(
+                f"{elements:>8} {name:>7} {elapsed * 1000:>8.2f} {correct * 100:>7.0f}%"
+            )
+
+
+if __name__ == "__main__":
+    main()
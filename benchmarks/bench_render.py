@@ -0,0 +1,88 @@
+"""
+Microbenchmark for page rasterization and scanned-page preprocessing.
+
+Compares the previous PIL-based path (RGB pixmap -> PIL -> NumPy -> BGR ->
+grayscale -> binarized -> PIL) with the buffer-based path (grayscale pixmap
+wrapped as a NumPy view -> binarized). Each variant runs in a fresh process
+so that peak memory can be compared.
+
+Usage:
+    python benchmarks/bench_render.py [PDF] [--dpi 300] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing
+import pathlib
+import resource
+import time
+
+import cv2
+import fitz
+import numpy as np
+from PIL import Image
+
+from pyscientificpdfparser.preprocessing import _pixmap_to_array, _preprocess_image
+
+DEFAULT_PDF = (
+    pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "arxiv-1410.6579.pdf"
+)
+
+
+def _legacy_page(page: fitz.Page, mat: fitz.Matrix) -> Image.Image:
+    """The original render + preprocess path, kept here for comparison."""
+    pix = page.get_pixmap(matrix=mat)
+    image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
+    cv_image = np.array(image.convert("RGB"))
+    cv_image = cv_image[:, :, ::-1].copy()
+    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    binary = cv2.adaptiveThreshold(
+        gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
+    )
+    return Image.fromarray(binary)
+
+
+def _buffer_page(page: fitz.Page, mat: fitz.Matrix) -> np.ndarray:
+    """The grayscale pixmap view path used by preprocessing."""
+    pix = page.get_pixmap(matrix=mat, colorspace=fitz.csGRAY)
+    binary: np.ndarray = _preprocess_image(_pixmap_to_array(pix))
+    return binary
+
+
+def _run(variant: str, pdf_path: str, dpi: int, repeat: int) -> tuple[float, int]:
+    """Processes every page and returns (seconds per page, peak RSS in KiB)."""
+    render = _legacy_page if variant == "legacy" else _buffer_page
+    mat = fitz.Matrix(dpi / 72, dpi / 72)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    pages = 0
+    start = time.perf_counter()
+    with fitz.open(pdf_path) as doc:
+        for _ in range(repeat):
+            for page in doc:
+                render(page, mat)
+                pages += 1
+    elapsed = time.perf_counter() - start
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - baseline_rss
+    return elapsed / pages, peak_rss
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pdf", nargs="?", type=pathlib.Path, default=DEFAULT_PDF)
+    parser.add_argument("--dpi", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    ctx = multiprocessing.get_context("spawn")
+    print(f"{'variant':<8} {'ms/page':>10} {'peak RSS growth (MiB)':>24}")
+    for variant in ("legacy", "buffer"):
+        with ctx.Pool(1) as pool:
+            per_page, peak_rss = pool.apply(
+                _run, (variant, str(args.pdf), args.dpi, args.repeat)
+            )
+        print(f"{variant:<8} {per_page * 1000:>10.1f} {peak_rss / 1024:>24.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Microbenchmark for building the cell grid of a table.
+
+Compares `tsr.build_table_grid`, which intersects all rows and columns and
+assigns all words at once, with a per-cell loop that scans the words of the
+table for every cell, on synthetic tables with hundreds of cells. Reports
+the time per table and whether both give the same cell texts.
+
+Usage:
+    python benchmarks/bench_table_grid.py [--tables 20] [--repeat 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from pyscientificpdfparser.models import TableCell, TextBlock
+from pyscientificpdfparser.spatial import SpatialIndex
+from pyscientificpdfparser.tsr import (
+    COLUMN_LABEL,
+    HEADER_LABEL,
+    ROW_LABEL,
+    build_table_grid,
+)
+
+TABLE_BBOX = (100.0, 100.0, 2300.0, 3100.0)
+
+
+def _table(
+    rng: np.random.Generator, n_rows: int, n_columns: int
+) -> tuple[np.ndarray, list[str], list[TextBlock]]:
+    """
+    A table with irregular row heights and column widths, and one to three
+    words per cell.
+
+    Returns the structure boxes, their labels and the words of the page.
+    """
+    x1, y1, x2, y2 = TABLE_BBOX
+    xs = np.sort(rng.uniform(x1, x2, n_columns - 1))
+    ys = np.sort(rng.uniform(y1, y2, n_rows - 1))
+    column_edges = np.concatenate(([x1], xs, [x2]))
+    row_edges = np.concatenate(([y1], ys, [y2]))
+    boxes = [
+        (left, y1, right, y2) for left, right in zip(column_edges, column_edges[1:])
+    ]
+    boxes += [(x1, top, x2, bottom) for top, bottom in zip(row_edges, row_edges[1:])]
+    boxes.append((x1, y1, x2, row_edges[1]))
+    labels = [COLUMN_LABEL] * n_columns + [ROW_LABEL] * n_rows + [HEADER_LABEL]
+    words: list[TextBlock] = []
+    for top, bottom in zip(row_edges, row_edges[1:]):
+        for left, right in zip(column_edges, column_edges[1:]):
+            for _ in range(int(rng.integers(1, 4))):
+                # A small word well inside its cell
+                cx = rng.uniform(left + (right - left) / 4, right - (right - left) / 4)
+                cy = rng.uniform(top + (bottom - top) / 4, bottom - (bottom - top) / 4)
+                words.append(
+                    TextBlock(
+                        text=f"w{len(words)}",
+                        bbox=(cx - 1, cy - 1, cx + 1, cy + 1),
+                        page_number=1,
+                    )
+                )
+    order = rng.permutation(len(boxes))
+    return np.asarray(boxes)[order], [labels[i] for i in order], words
+
+
+def _per_cell(
+    boxes: np.ndarray, labels: list[str], words: list[TextBlock]
+) -> list[list[TableCell]]:
+    """A straightforward cell-by-cell grid, kept here for comparison."""
+    rows = sorted(
+        (box for box, label in zip(boxes.tolist(), labels) if label == ROW_LABEL),
+        key=lambda box: box[1] + box[3],
+    )
+    columns = sorted(
+        (box for box, label in zip(boxes.tolist(), labels) if label == COLUMN_LABEL),
+        key=lambda box: box[0] + box[2],
+    )
+    headers = [
+        box for box, label in zip(boxes.tolist(), labels) if label == HEADER_LABEL
+    ]
+    table = []
+    for row in rows:
+        is_header = any(
+            min(row[3], header[3]) - max(row[1], header[1]) >= 0.5 * (row[3] - row[1])
+            for header in headers
+        )
+        cells = []
+        for column in columns:
+            bbox = (column[0], row[1], column[2], row[3])
+            text = " ".join(
+                word.text
+                for word in words
+                if bbox[0] <= (word.bbox[0] + word.bbox[2]) / 2 <= bbox[2]
+                and bbox[1] <= (word.bbox[1] + word.bbox[3]) / 2 <= bbox[3]
+            )
+            cells.append(TableCell(text=text, bbox=bbox, is_header=is_header))
+        table.append(cells)
+    return table
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("--tables", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'cells':>6} {'method':>8} {'ms/table':>9} {'same':>5}")
+    for n_rows, n_columns in ((10, 10), (30, 10), (50, 20)):
+        tables = [_table(rng, n_rows, n_columns) for _ in range(args.tables)]
+        indexes = [SpatialIndex.from_elements(words) for _, _, words in tables]
+        reference = [_per_cell(*table) for table in tables]
+        methods = {
+            "per-cell": lambda table, _: _per_cell(*table),
+            "grid": lambda table, index: build_table_grid(
+                table[0], table[1], TABLE_BBOX, table[2], index
+            ),
+        }
+        for name, method in methods.items():
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                results = [
+                    method(table, index) for table, index in zip(tables, indexes)
+                ]
+            elapsed = (time.perf_counter() - start) / args.repeat / len(tables)
+            same = all(
+                [[cell.text for cell in row] for row in result]
+                == [[cell.text for cell in row] for row in expected]
+                for result, expected in zip(results, reference)
+            )
+            print(
+                f"{n_rows * n_columns:>6} {name:>8} {elapsed * 1000:>9.2f} {same!s:>5}"
+            )
+
+
+if __name__ == "__main__":
+    main()
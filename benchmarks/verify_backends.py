@@ -0,0 +1,107 @@
+"""
+Verifies the inference backends of the layout and table models.
+
+Runs the DLA and TSR models with every available backend on the rendered
+pages of a PDF and compares each backend with eager PyTorch: the share of
+queries that get the same class, the largest difference of the normalized
+boxes, and the time per forward pass. Backends whose dependencies are not
+installed are skipped. Needs the models (the `ml` extra and a network
+connection or a populated Hugging Face cache).
+
+Usage:
+    python benchmarks/verify_backends.py [PDF] [--pages 4] [--threads N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import pathlib
+import tempfile
+import time
+from typing import Any
+
+import torch
+
+from pyscientificpdfparser import inference
+from pyscientificpdfparser.dla import LayoutAnalyzer
+from pyscientificpdfparser.preprocessing import iter_pdf_pages, to_rgb_array
+from pyscientificpdfparser.tsr import TableRecognizer
+
+DEFAULT_PDF = (
+    pathlib.Path(__file__).parent.parent / "tests" / "fixtures" / "arxiv-1410.6579.pdf"
+)
+
+
+def _run(
+    backend: inference.InferenceBackend, inputs: list[dict[str, torch.Tensor]]
+) -> tuple[list[dict[str, torch.Tensor]], float]:
+    """Runs a backend on every input; returns the outputs and seconds per call."""
+    backend(inputs[0])  # Warm-up, which also exports ONNX models
+    start = time.perf_counter()
+    outputs = [backend(batch) for batch in inputs]
+    return outputs, (time.perf_counter() - start) / len(inputs)
+
+
+def _compare(
+    name: str, analyzer: Any, images: list[Any], threads: int | None, onnx_dir: Any
+) -> None:
+    """Prints the agreement and latency of each backend for one model."""
+    inputs = [
+        dict(analyzer.processor(images=[to_rgb_array(image)], return_tensors="pt"))
+        for image in images
+    ]
+    reference, eager_time = _run(inference.EagerBackend(analyzer.model), inputs)
+    print(f"{name}: eager {eager_time * 1000:.1f} ms/page")
+    for backend_name in ("quantized", "onnx"):
+        try:
+            backend = inference.create_backend(
+                backend_name, analyzer.model, threads, onnx_dir, analyzer.model_name
+            )
+            outputs, elapsed = _run(backend, inputs)
+        except Exception as error:  # Missing dependency or unsupported export
+            print(f"  {backend_name:<10} skipped: {error}")
+            continue
+
+        same_class = torch.cat(
+            [
+                (out["logits"].argmax(-1) == ref["logits"].argmax(-1)).flatten()
+                for out, ref in zip(outputs, reference)
+            ]
+        )
+        box_delta = max(
+            float((out["pred_boxes"] - ref["pred_boxes"]).abs().max())
+            for out, ref in zip(outputs, reference)
+        )
+        print(
+            f"  {backend_name:<10} {elapsed * 1000:>8.1f} ms/page "
+            f"({eager_time / elapsed:.2f}x), "
+            f"class agreement {float(same_class.float().mean()) * 100:.2f}%, "
+            f"max box delta {box_delta:.4f}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+    parser.add_argument("pdf", nargs="?", type=pathlib.Path, default=DEFAULT_PDF)
+    parser.add_argument("--pages", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=None)
+    args = parser.parse_args()
+
+    layout_analyzer = LayoutAnalyzer()
+    images = [
+        page.model_image(layout_analyzer.input_size)
+        for page in iter_pdf_pages(args.pdf, pages=range(1, args.pages + 1))
+    ]
+    with tempfile.TemporaryDirectory() as onnx_dir:
+        for name, analyzer in (
+            ("DLA", layout_analyzer),
+            ("TSR", TableRecognizer()),
+        ):
+            if analyzer.model is None:
+                print(f"{name}: model not available, skipped")
+                continue
+            _compare(name, analyzer, images, args.threads, pathlib.Path(onnx_dir))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+# src/pyscientificpdfparser/cache.py
+"""
+Provides a persistent, size-bounded on-disk cache for pipeline results.
+
+Responsibilities:
+- Store cache entries as directories of plain files (e.g., `.npy` arrays that
+  can be memory-mapped on load, JSON metadata).
+- Derive stable keys from the inputs that determine a result.
+- Evict the least recently used entries once the cache exceeds its size.
+- Count hits and misses so the effectiveness of a cache can be verified.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+import pathlib
+import shutil
+import uuid
+from collections.abc import Callable
+
+import numpy as np
+
+# Default upper bound for the size of a single cache directory (2 GiB).
+DEFAULT_MAX_BYTES = 2 * 1024**3
+
+
+def file_sha256(path: pathlib.Path, chunk_size: int = 1024 * 1024) -> str:
+    """
+    Computes the SHA-256 hex digest of a file's content.
+
+    Args:
+        path: The file to hash.
+        chunk_size: The number of bytes read at a time.
+
+    Returns:
+        The hex digest.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def array_sha256(array: np.ndarray) -> str:
+    """
+    Computes the SHA-256 hex digest of an array's shape, dtype and content.
+
+    Args:
+        array: The array to hash, e.g., a page image.
+
+    Returns:
+        The hex digest.
+    """
+    digest = hashlib.sha256(f"{array.shape}{array.dtype}".encode("utf-8"))
+    digest.update(np.ascontiguousarray(array).data)
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    A directory of cache entries with least-recently-used eviction.
+
+    Each entry is a sub-directory named after its key. Reading an entry
+    refreshes its modification time, which is what eviction orders by, so the
+    cache can be shared by several processes without extra bookkeeping.
+    """
+
+    def __init__(
+        self, directory: pathlib.Path, max_bytes: int = DEFAULT_MAX_BYTES
+    ) -> None:
+        """
+        Initializes the cache, creating its directory if needed.
+
+        Args:
+            directory: The directory that holds the cache entries.
+            max_bytes: The size above which least recently used entries are
+                evicted.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._size = sum(self._entry_size(entry) for entry in self._entries())
+
+    @staticmethod
+    def key(*parts: object) -> str:
+        """Builds a cache key from the values that determine a cached result."""
+        return hashlib.sha256(repr(parts).encode("utf-8")).hexdigest()
+
+    @property
+    def size(self) -> int:
+        """The approximate total size of the cached entries, in bytes."""
+        return self._size
+
+    def get(self, key: str) -> pathlib.Path | None:
+        """
+        Looks up an entry and marks it as recently used.
+
+        Args:
+            key: The key of the entry.
+
+        Returns:
+            The directory of the entry, or None on a cache miss.
+        """
+        entry = self.directory / key
+        try:
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, write: Callable[[pathlib.Path], None]) -> pathlib.Path:
+        """
+        Stores an entry, then evicts old entries if the cache is too large.
+
+        The entry is written to a temporary directory and moved into place, so
+        readers never see a partially written entry.
+
+        Args:
+            key: The key of the entry.
+            write: A callable that writes the entry's files into the directory
+                it is given.
+
+        Returns:
+            The directory of the stored entry.
+        """
+        entry = self.directory / key
+        tmp_dir = self.directory / f".tmp-{uuid.uuid4().hex}"
+        tmp_dir.mkdir()
+        try:
+            write(tmp_dir)
+            size = self._entry_size(tmp_dir)
+            os.replace(tmp_dir, entry)
+            self._size += size
+        except OSError:
+            # Another process stored the same entry first.
+            if not entry.exists():
+                raise
+        finally:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        if self._size > self.max_bytes:
+            self.evict()
+        return entry
+
+    def evict(self) -> None:
+        """Removes least recently used entries until the cache fits its size."""
+        entries = []
+        for entry in self._entries():
+            try:
+                entries.append((entry.stat().st_mtime, self._entry_size(entry), entry))
+            except FileNotFoundError:
+                continue  # Evicted concurrently by another process
+        self._size = sum(size for _, size, _ in entries)
+
+        for _, size, entry in sorted(entries, key=lambda e: e[0]):
+            if self._size <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            self._size -= size
+
+    def clear(self) -> None:
+        """Removes every entry and resets the hit and miss counters."""
+        for entry in self._entries():
+            shutil.rmtree(entry, ignore_errors=True)
+        self._size = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _entries(self) -> list[pathlib.Path]:
+        return [
+            entry
+            for entry in self.directory.iterdir()
+            if entry.is_dir() and not entry.name.startswith(".")
+        ]
+
+    @staticmethod
+    def _entry_size(entry: pathlib.Path) -> int:
+        try:
+            return sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+        except FileNotFoundError:
+            return 0
@@ -2,11 +2,38 @@
 """Command-Line Interface for the pyScientificPdfParser."""
 from __future__ import annotations
 
+import os
 import pathlib
 
 import click
 
+from pyscientificpdfparser.cache import DiskCache
 from pyscientificpdfparser.core import parse_pdf
+from pyscientificpdfparser.registry import default_registry
+from pyscientificpdfparser.sectioning import starts_section
+
+
+def parse_page_range(
+    ctx: click.Context, param: click.Parameter, value: str | None
+) -> list[int] | None:
+    """
+    Parses a page selection such as "1-3,7" into a list of page numbers.
+    """
+    if value is None:
+        return None
+    pages: list[int] = []
+    try:
+        for part in value.split(","):
+            first, _, last = part.strip().partition("-")
+            start, stop = int(first), int(last or first)
+            if start < 1 or stop < start:
+                raise ValueError
+            pages.extend(range(start, stop + 1))
+    except ValueError:
+        raise click.BadParameter(
+            f"'{value}' is not a page range such as '1-3,7'."
+        ) from None
+    return pages
 
 
 @click.group()
@@ -33,7 +60,151 @@ def cli() -> None:
     default=False,
     help="Enable optional LLM-powered refinement for higher accuracy.",
 )
-def process(pdf_path: str, output_dir: str, llm_refine: bool) -> None:
+@click.option(
+    "--dpi",
+    default=300,
+    show_default=True,
+    type=click.IntRange(min=36),
+    help="Resolution pages are rendered and OCR'd at.",
+)
+@click.option(
+    "--layout-dpi",
+    default=None,
+    type=click.IntRange(min=36),
+    help="Render pages at this lower DPI for layout analysis (e.g. 150). "
+    "OCR and table/figure crops still use full resolution.",
+)
+@click.option(
+    "--render-workers",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of processes used to render pages in parallel.",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False, resolve_path=True),
+    help="Directory for persistent caches, so re-runs skip repeated work.",
+)
+@click.option(
+    "--cache-max-mb",
+    default=2048,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Size bound of each cache, in MiB.",
+)
+@click.option(
+    "--enhance-scans",
+    is_flag=True,
+    default=False,
+    help="Deskew and denoise scanned pages before OCR.",
+)
+@click.option(
+    "--pages",
+    default=None,
+    callback=parse_page_range,
+    help="Pages to parse, e.g. '1-3,7'. Other pages are never rendered.",
+)
+@click.option(
+    "--stop-at-section",
+    default=None,
+    help="Stop after the page on which this section starts (e.g. 'References').",
+)
+@click.option(
+    "--ocr-engine",
+    default="auto",
+    show_default=True,
+    type=click.Choice(["auto", "tesserocr", "pytesseract"]),
+    help="OCR engine for scanned pages. 'auto' prefers the persistent "
+    "in-process tesserocr engine when it is installed.",
+)
+@click.option(
+    "--layout-first",
+    is_flag=True,
+    default=False,
+    help="On scanned pages, run layout analysis first and only OCR the text "
+    "and table regions it finds.",
+)
+@click.option(
+    "--reocr-below",
+    default=None,
+    type=click.FloatRange(0, 100),
+    help="Re-OCR blocks of scanned pages whose confidence is below this "
+    "value from a higher resolution render, keeping the better result.",
+)
+@click.option(
+    "--reocr-dpi",
+    default=400,
+    show_default=True,
+    type=click.IntRange(min=36),
+    help="Resolution low-confidence blocks are re-rendered at.",
+)
+@click.option(
+    "--ocr-tiles",
+    default=1,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Split scanned pages into this many overlapping bands that are "
+    "OCR'd concurrently.",
+)
+@click.option(
+    "--layout-batch-size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of pages passed through the layout model at once "
+    "(1 with --stop-at-section, by default).",
+)
+@click.option(
+    "--table-batch-size",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Number of tables, from any pages, passed through the table model at once.",
+)
+@click.option(
+    "--inference-backend",
+    default="eager",
+    show_default=True,
+    type=click.Choice(["eager", "quantized", "onnx"]),
+    help="How the layout and table models run on CPU: stock PyTorch, "
+    "int8-quantized PyTorch, or ONNX Runtime.",
+)
+@click.option(
+    "--intra-op-threads",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Threads used within each operator by ONNX Runtime.",
+)
+@click.option(
+    "--model-server",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="Run the layout and table models in the model server listening on "
+    "this socket (see `serve`) instead of loading them in this process.",
+)
+def process(
+    pdf_path: str,
+    output_dir: str,
+    llm_refine: bool,
+    dpi: int,
+    layout_dpi: int | None,
+    render_workers: int,
+    cache_dir: str | None,
+    cache_max_mb: int,
+    enhance_scans: bool,
+    pages: list[int] | None,
+    stop_at_section: str | None,
+    ocr_engine: str,
+    layout_first: bool,
+    reocr_below: float | None,
+    reocr_dpi: int,
+    ocr_tiles: int,
+    layout_batch_size: int | None,
+    table_batch_size: int | None,
+    inference_backend: str,
+    intra_op_threads: int | None,
+    model_server: str | None,
+) -> None:
     """
     Process a single PDF file and save the output.
     """
@@ -48,16 +219,135 @@ def process(pdf_path: str, output_dir: str, llm_refine: bool) -> None:
     if llm_refine:
         click.echo("LLM refinement is enabled.")
 
+    layout_analyzer, table_recognizer = None, None
+    if model_server:
+        # Imported here: the server module uses Unix sockets and user ids
+        from pyscientificpdfparser import server
+
+        layout_analyzer, table_recognizer = server.connect(model_server, _authkey())
+
     # Call the core parsing function
     parse_pdf(
         pdf_path=pdf_path_obj,
         output_dir=output_dir_obj,
         llm_refine=llm_refine,
+        dpi=dpi,
+        layout_dpi=layout_dpi,
+        render_workers=render_workers,
+        cache_dir=pathlib.Path(cache_dir) if cache_dir else None,
+        cache_max_bytes=cache_max_mb * 1024 * 1024,
+        enhance_scans=enhance_scans,
+        pages=pages,
+        stop_condition=starts_section(stop_at_section) if stop_at_section else None,
+        ocr_engine=ocr_engine,
+        layout_first=layout_first,
+        reocr_threshold=reocr_below,
+        reocr_dpi=reocr_dpi,
+        ocr_tiles=ocr_tiles,
+        layout_batch_size=layout_batch_size,
+        table_batch_size=table_batch_size,
+        inference_backend=inference_backend,
+        intra_op_threads=intra_op_threads,
+        layout_analyzer=layout_analyzer,
+        table_recognizer=table_recognizer,
     )
 
     click.echo("Processing finished.")
 
 
+@cli.command()
+@click.option(
+    "--socket",
+    "address",
+    default=None,
+    type=click.Path(dir_okay=False),
+    help="The Unix socket the server listens on. Defaults to models.sock in "
+    "$XDG_RUNTIME_DIR/scipdfparser, or in a per-user temporary directory.",
+)
+@click.option(
+    "--max-batch-size",
+    default=8,
+    show_default=True,
+    type=click.IntRange(min=1),
+    help="Number of pages (or tables) from all workers run in one batch.",
+)
+@click.option(
+    "--max-wait-ms",
+    default=10.0,
+    show_default=True,
+    type=click.FloatRange(min=0),
+    help="How long a batch waits for requests from other workers.",
+)
+@click.option(
+    "--cache-dir",
+    default=None,
+    type=click.Path(file_okay=False, resolve_path=True),
+    help="Directory for the layout cache shared by all workers.",
+)
+@click.option(
+    "--inference-backend",
+    default="eager",
+    show_default=True,
+    type=click.Choice(["eager", "quantized", "onnx"]),
+    help="How the layout and table models run on CPU.",
+)
+@click.option(
+    "--intra-op-threads",
+    default=None,
+    type=click.IntRange(min=1),
+    help="Threads used within each operator by ONNX Runtime.",
+)
+def serve(
+    address: str | None,
+    max_batch_size: int,
+    max_wait_ms: float,
+    cache_dir: str | None,
+    inference_backend: str,
+    intra_op_threads: int | None,
+) -> None:
+    """
+    Serve the layout and table models to `process --model-server` workers.
+
+    Workers must present a key to connect: the SCIPDF_SERVER_KEY environment
+    variable if set, or else a random key the server keeps in a file only its
+    user can read, which workers of the same user find on their own.
+    """
+    from pyscientificpdfparser import server
+
+    cache_path = pathlib.Path(cache_dir) if cache_dir else None
+    model_server = server.ModelServer(
+        address,
+        max_batch_size=max_batch_size,
+        max_wait=max_wait_ms / 1000,
+        authkey=_authkey(),
+        cache=DiskCache(cache_path / "layout") if cache_path else None,
+    )
+    onnx_dir = cache_path / "onnx" if cache_path else None
+    for name in ("layout", "table"):
+        model = default_registry.get(name)
+        model.set_backend(inference_backend, intra_op_threads, onnx_dir)
+    default_registry.warm_up()
+    click.echo(f"Serving the models on {model_server.address}. Press Ctrl+C to stop.")
+    if _authkey() is None:
+        click.echo(f"Workers authenticate with the key in {server.default_key_file()}.")
+    try:
+        model_server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    click.echo(f"Stopped. Batches run: {model_server.stats}.")
+
+
+def _authkey() -> bytes | None:
+    """
+    The model server key, from the SCIPDF_SERVER_KEY environment variable.
+
+    If it is not set, the server and its workers use the key file of
+    `server.server_authkey` instead.
+    """
+    key = os.environ.get("SCIPDF_SERVER_KEY")
+    return key.encode("utf-8") if key else None
+
+
 def main() -> None:
     """Main entry point for the CLI."""
     cli()
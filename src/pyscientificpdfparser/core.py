@@ -7,61 +7,301 @@ of the parsing pipeline, from input processing to final output generation.
 """
 from __future__ import annotations
 
+import contextlib
+import itertools
 import pathlib
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-from . import models, ocr, output, preprocessing, sectioning, tsr
-from .dla import LayoutAnalyzer
+from . import cache, models, ocr, output, preprocessing, registry, sectioning, spatial
 
-# Instantiate the ML model analyzers once at the module level.
-# This is a form of singleton pattern to avoid reloading the heavy models
-# on every function call.
-print("Initializing Layout and Table models...")
-layout_analyzer = LayoutAnalyzer()
-table_recognizer = tsr.TableRecognizer()
-print("Models initialized.")
+if TYPE_CHECKING:
+    from .dla import LayoutAnalyzer, LayoutElement
+    from .server import RemoteLayoutAnalyzer, RemoteTableRecognizer
+    from .tsr import TableRecognizer
 
 
 def parse_pdf(
     pdf_path: pathlib.Path,
     output_dir: pathlib.Path | None = None,
     llm_refine: bool = False,
+    layout_dpi: int | None = None,
+    render_workers: int = 1,
+    cache_dir: pathlib.Path | None = None,
+    cache_max_bytes: int = cache.DEFAULT_MAX_BYTES,
+    enhance_scans: bool = False,
+    pages: Iterable[int] | None = None,
+    stop_condition: Callable[[list[LayoutElement]], bool] | None = None,
+    ocr_engine: str = "auto",
+    layout_first: bool = False,
+    dpi: int = 300,
+    reocr_threshold: float | None = None,
+    reocr_dpi: int = 400,
+    ocr_tiles: int = 1,
+    layout_batch_size: int | None = None,
+    table_batch_size: int | None = None,
+    inference_backend: str | None = None,
+    intra_op_threads: int | None = None,
+    layout_analyzer: LayoutAnalyzer | RemoteLayoutAnalyzer | None = None,
+    table_recognizer: TableRecognizer | RemoteTableRecognizer | None = None,
 ) -> models.Document:
     """
     Parses a single scientific PDF document and returns a structured Document object.
 
     This function orchestrates the entire pipeline.
+
+    Args:
+        pdf_path: The path to the PDF file.
+        output_dir: The directory where output files are written, if any.
+        llm_refine: Whether to refine the parsed document with an LLM.
+        layout_dpi: Enables multi-resolution rendering: layout analysis runs on
+            page images rendered at this (lower) DPI, while OCR of scanned pages
+            and table/figure crops are rendered at full resolution.
+        render_workers: The number of processes used to rasterize pages ahead
+            of the rest of the pipeline.
+        cache_dir: An optional directory for persistent caches. Rendered pages,
+            OCR results and layout detections are cached there, so re-running
+            on the same PDF skips rendering, OCR and layout inference of
+            unchanged pages.
+        cache_max_bytes: The size bound of each cache in `cache_dir`.
+        enhance_scans: Whether scanned pages are deskewed and denoised before
+            OCR.
+        pages: The 1-based numbers of the pages to parse, or None for every
+            page. Other pages are never rendered.
+        stop_condition: An optional callable evaluated with the layout
+            elements of each processed page; once it returns True, no further
+            pages are rendered or processed (see
+            `sectioning.starts_section`). Tables may not have their cells
+            yet when it is evaluated.
+        ocr_engine: The OCR engine for scanned pages: "tesserocr",
+            "pytesseract", or "auto" to prefer tesserocr when installed.
+        layout_first: Whether scanned pages run layout analysis before OCR,
+            so that only their text and table regions are OCR'd, in parallel.
+        dpi: The resolution pages are rendered and OCR'd at. All bounding
+            boxes are pixel coordinates at this resolution.
+        reocr_threshold: If set, OCR blocks of scanned pages with a confidence
+            below this value (0-100) are re-rendered at `reocr_dpi` and
+            re-OCR'd, keeping the better result.
+        reocr_dpi: The resolution low-confidence blocks are re-rendered at.
+        ocr_tiles: The number of overlapping bands each scanned page is split
+            into and OCR'd concurrently; more bands use more cores per page.
+        layout_batch_size: The number of pages buffered and passed through the
+            layout model in one forward pass. Defaults to the analyzer's batch
+            size, or to 1 with a `stop_condition`, so that no page after the
+            stopping page is processed. With a larger batch, the pages
+            buffered after the stopping page are rendered and run through the
+            layout model, then discarded.
+        table_batch_size: The number of tables, from any pages, passed through
+            the table model in one forward pass. Table crops are kept until a
+            batch is full (or the last page is processed). Defaults to the
+            recognizer's batch size.
+        inference_backend: How the DLA and TSR models run on CPU: "eager"
+            PyTorch, dynamically int8-"quantized" PyTorch, or exported "onnx"
+            Runtime sessions. Exported models are kept in `cache_dir`. If
+            None, the models keep the backend they were set up with, e.g. a
+            preloaded analyzer, and freshly loaded models run eager PyTorch.
+        intra_op_threads: The intra-op threads of the ONNX Runtime sessions.
+        layout_analyzer: A preloaded LayoutAnalyzer, or a client of a model
+            server (see `server.connect`). Defaults to the one of the default
+            model registry, which is loaded on first use.
+        table_recognizer: A preloaded TableRecognizer, or a client of a model
+            server. Defaults to the one of the default model registry.
     """
     print(f"1. Preprocessing: Rendering PDF pages for {pdf_path.name}...")
-    preprocessed_pages = preprocessing.render_pdf_to_images(pdf_path)
+    # Pages are rendered lazily and released once processed, so memory use
+    # stays flat regardless of the number of pages in the PDF.
+    render_cache = (
+        cache.DiskCache(cache_dir / "render", cache_max_bytes) if cache_dir else None
+    )
+    ocr_cache = (
+        cache.DiskCache(cache_dir / "ocr", cache_max_bytes) if cache_dir else None
+    )
+    layout_cache = (
+        cache.DiskCache(cache_dir / "layout", cache_max_bytes) if cache_dir else None
+    )
+    page_iterator = preprocessing.iter_pdf_pages(
+        pdf_path,
+        dpi=dpi,
+        layout_dpi=layout_dpi,
+        workers=render_workers,
+        cache=render_cache,
+        enhance=enhance_scans,
+        pages=pages,
+    )
+    assets_dir = output_dir / "assets" if output_dir else None
+    engine = ocr.get_engine(ocr_engine)
+    if layout_analyzer is None:
+        layout_analyzer = registry.default_registry.layout_analyzer
+    if table_recognizer is None:
+        table_recognizer = registry.default_registry.table_recognizer
+    if inference_backend is not None:
+        onnx_dir = cache_dir / "onnx" if cache_dir else None
+        layout_analyzer.set_backend(inference_backend, intra_op_threads, onnx_dir)
+        table_recognizer.set_backend(inference_backend, intra_op_threads, onnx_dir)
 
-    all_elements = []
-    page_images = [p.image for p in preprocessed_pages]
+    # Pages buffered after the stopping page would already be rendered and
+    # analyzed, so an early stop only batches pages when asked to.
+    batch_size = layout_batch_size or (
+        1 if stop_condition is not None else layout_analyzer.batch_size
+    )
+    table_batch_size = table_batch_size or table_recognizer.batch_size
 
-    for page in preprocessed_pages:
-        print(f"  - Processing page {page.page_number}...")
-        # 2. OCR
-        ocr_blocks = ocr.extract_text_from_page(page)
+    all_elements: list[LayoutElement] = []
+    # The tables awaiting structure recognition, from any pages
+    pending_tables: list[_PendingTable] = []
 
-        # 3. Document Layout Analysis
-        # The DLA uses the original (not preprocessed for OCR) image
-        original_image = page_images[page.page_number - 1]
-        layout_elements = layout_analyzer.analyze_page(
-            original_image, page.page_number, ocr_blocks
-        )
+    # Closing the iterator when the loop stops early releases the PDF and
+    # cancels pages being rendered ahead.
+    with contextlib.closing(page_iterator):
+        stopped = False
+        while not stopped:
+            # Pages are buffered so that layout analysis runs one forward pass
+            # per batch of pages instead of one per page.
+            batch = list(itertools.islice(page_iterator, batch_size))
+            if not batch:
+                break
+            # The pages derive the model input once from their grayscale buffer.
+            model_images = [
+                page.model_image(layout_analyzer.input_size) for page in batch
+            ]
+            regions_first = [
+                index
+                for index, page in enumerate(batch)
+                if layout_first and page.is_scanned and layout_analyzer.is_available
+            ]
+            regions = {}
+            if regions_first:
+                # 2. Document Layout Analysis, on the low-resolution images
+                detected = layout_analyzer.detect_regions_batch(
+                    [model_images[index] for index in regions_first],
+                    [batch[index].page_number for index in regions_first],
+                    [batch[index].page_size for index in regions_first],
+                    batch_size=batch_size,
+                    cache=layout_cache,
+                )
+                regions = dict(zip(regions_first, detected))
+
+            batch_ocr_blocks = []
+            batch_ocr_indexes = []
+            for index, page in enumerate(batch):
+                print(f"  - Processing page {page.page_number}...")
+                if index in regions:
+                    # 3. OCR of the text and table regions only
+                    ocr_blocks = ocr.extract_text_from_regions(
+                        page, regions[index], engine=engine
+                    )
+                else:
+                    # 2. OCR
+                    ocr_blocks = ocr.extract_text_from_page(
+                        page, engine=engine, tiles=ocr_tiles, cache=ocr_cache
+                    )
+
+                if reocr_threshold is not None and page.is_scanned:
+                    # Re-OCR low-confidence blocks from a higher resolution render
+                    ocr_blocks = ocr.refine_low_confidence_blocks(
+                        page, ocr_blocks, reocr_threshold, dpi=reocr_dpi, engine=engine
+                    )
+                page.release("binarized")
+                batch_ocr_blocks.append(ocr_blocks)
+                # DLA looks up the OCR blocks by region
+                batch_ocr_indexes.append(spatial.SpatialIndex.from_elements(ocr_blocks))
+
+            batch_layout_elements = {
+                index: layout_analyzer.associate_text(
+                    page_regions, batch_ocr_blocks[index], batch_ocr_indexes[index]
+                )
+                for index, page_regions in regions.items()
+            }
+            remaining = [index for index in range(len(batch)) if index not in regions]
+            if remaining:
+                # 3. Document Layout Analysis
+                analyzed = layout_analyzer.analyze_pages(
+                    [model_images[index] for index in remaining],
+                    [batch[index].page_number for index in remaining],
+                    [batch_ocr_blocks[index] for index in remaining],
+                    [batch[index].page_size for index in remaining],
+                    batch_size=batch_size,
+                    ocr_indexes=[batch_ocr_indexes[index] for index in remaining],
+                    cache=layout_cache,
+                )
+                batch_layout_elements.update(zip(remaining, analyzed))
+            del model_images
+
+            for index, page in enumerate(batch):
+                page.release("layout", "rgb", "model")
+                ocr_blocks = batch_ocr_blocks[index]
+
+                processed_layout_elements = []
+                page_words: list[models.TextBlock] | None = None
+                word_index: spatial.SpatialIndex | None = None
+                for element_index, element in enumerate(batch_layout_elements[index]):
+                    if isinstance(element, models.Table):
+                        crop = _crop_element(page, element)
+                        if crop is not None:
+                            if page_words is None:
+                                # Cells are filled with the words of the page,
+                                # indexed once for all of its tables.
+                                page_words = spatial.split_words(ocr_blocks)
+                                word_index = spatial.SpatialIndex.from_elements(
+                                    page_words
+                                )
+                            # Tables are cropped now, while the page image is
+                            # still in memory, and recognized later in batches.
+                            # All words of the page are kept so the recognizer
+                            # can find the text within the table's bbox.
+                            pending_tables.append(
+                                _PendingTable(
+                                    len(all_elements) + element_index,
+                                    # A copy: the crop is a view that would
+                                    # keep the whole page image alive until the
+                                    # batch runs.
+                                    crop.copy(),
+                                    element,
+                                    page_words,
+                                    word_index,
+                                )
+                            )
+                    elif isinstance(element, models.Figure) and assets_dir is not None:
+                        # Export figures now, while the page image is still in memory.
+                        crop = _crop_element(page, element)
+                        if crop is not None:
+                            output.save_figure_image(
+                                element, crop, assets_dir, element_index
+                            )
+                    processed_layout_elements.append(element)
+                page.release()
+
+                all_elements.extend(processed_layout_elements)
+
+                if stop_condition is not None and stop_condition(
+                    processed_layout_elements
+                ):
+                    print(f"  - Stop condition met on page {page.page_number}.")
+                    stopped = True
+                    break
 
-        # 4. Table Structure Recognition
-        processed_layout_elements = []
-        for element in layout_elements:
-            if isinstance(element, models.Table):
-                table_image = original_image.crop(element.bbox)
-                # Pass all OCR blocks from the page to the recognizer
-                # so it can find the text within the table's bbox.
-                element = table_recognizer.recognize_table(
-                    table_image, element, ocr_blocks
+            # 4. Table Structure Recognition, one forward pass per full batch
+            full = len(pending_tables) // table_batch_size * table_batch_size
+            if full:
+                _recognize_tables(
+                    table_recognizer,
+                    pending_tables[:full],
+                    all_elements,
+                    table_batch_size,
                 )
-            processed_layout_elements.append(element)
+                del pending_tables[:full]
 
-        all_elements.extend(processed_layout_elements)
+    # The remaining tables, fewer than a batch
+    _recognize_tables(table_recognizer, pending_tables, all_elements, table_batch_size)
+
+    if ocr_cache is not None:
+        print(f"  - OCR cache: {ocr_cache.hits} hits, {ocr_cache.misses} misses.")
+    if layout_cache is not None:
+        print(
+            f"  - Layout cache: {layout_cache.hits} hits, "
+            f"{layout_cache.misses} misses."
+        )
 
     # 5. Section Segmentation
     print("5. Segmenting document into logical sections...")
@@ -84,10 +324,62 @@ def parse_pdf(
     # 7. Write output files
     if output_dir:
         print(f"6. Writing output files to {output_dir}...")
-        # output.write_outputs(document, output_dir, page_images)
         # Use the PDF filename (without extension) for the markdown
         pdf_stem = pdf_path.stem
-        output.write_outputs(document, output_dir, page_images, filename=pdf_stem)
+        output.write_outputs(document, output_dir, filename=pdf_stem)
 
     print("Parsing complete.")
     return document
+
+
+def _crop_element(
+    page: preprocessing.PreprocessedPage, element: LayoutElement
+) -> preprocessing.PageArray | None:
+    """
+    Crops an element from its page, or returns None if the crop is empty.
+
+    A box outside of the page, or too thin to cover a pixel, has nothing to
+    recognize or export: the element is kept as detected.
+    """
+    crop = page.crop(element.bbox)
+    if crop.size == 0:
+        print(
+            f"  - Skipping empty {element.element_type} crop on page "
+            f"{page.page_number}."
+        )
+        return None
+    return crop
+
+
+@dataclass
+class _PendingTable:
+    """A table awaiting structure recognition."""
+
+    position: int  # The table's position in the elements of the document
+    image: preprocessing.PageArray  # Owns its data, see `parse_pdf`
+    element: models.Table
+    ocr_blocks: list[models.TextBlock]  # The words of the table's page
+    index: spatial.SpatialIndex | None
+
+
+def _recognize_tables(
+    table_recognizer: TableRecognizer | RemoteTableRecognizer,
+    tables: list[_PendingTable],
+    elements: list[LayoutElement],
+    batch_size: int,
+) -> None:
+    """
+    Recognizes the structure of tables in batches and puts the results in
+    place of the tables in `elements`.
+    """
+    if not tables:
+        return
+    recognized = table_recognizer.recognize_tables(
+        [table.image for table in tables],
+        [table.element for table in tables],
+        [table.ocr_blocks for table in tables],
+        [table.index for table in tables],
+        batch_size=batch_size,
+    )
+    for table, result in zip(tables, recognized):
+        elements[table.position] = result
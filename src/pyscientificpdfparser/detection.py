@@ -0,0 +1,214 @@
+# src/pyscientificpdfparser/detection.py
+"""
+Post-processes the outputs of the object detection models (DLA and TSR).
+
+Responsibilities:
+- Turn the logits of every query into a class and a softmax score, over the
+  object classes only (not DETR's trailing "no object" class).
+- Drop detections below a per-class score threshold.
+- Suppress overlapping detections of the same class (class-aware NMS).
+- Map normalized boxes to a page coordinate space, from corners or from
+  centers and sizes.
+
+Everything runs on tensors, for all the queries of a page at once, so the
+cost does not grow with Python loops over queries.
+"""
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+
+import numpy as np
+import torch
+
+
+@dataclass
+class Detections:
+    """The detections kept for one image, by decreasing score."""
+
+    labels: list[int]
+    scores: list[float]
+    boxes: list[tuple[float, float, float, float]]
+
+    def __len__(self) -> int:
+        return len(self.labels)
+
+    def scaled(self, width: float, height: float) -> Detections:
+        """Returns the detections with their boxes scaled by the given size."""
+        boxes = np.asarray(self.boxes, dtype=np.float64).reshape(-1, 4)
+        boxes *= (width, height, width, height)
+        return Detections(
+            labels=self.labels,
+            scores=self.scores,
+            boxes=[(x1, y1, x2, y2) for x1, y1, x2, y2 in boxes.tolist()],
+        )
+
+
+def box_cxcywh_to_xyxy(boxes: torch.Tensor) -> torch.Tensor:
+    """
+    Converts (center x, center y, width, height) boxes to (x1, y1, x2, y2).
+
+    DETR-style detection heads, such as the Table Transformer and the layout
+    model, predict boxes as centers and sizes; `postprocess` expects corners.
+
+    Args:
+        boxes: A tensor of shape (..., 4).
+
+    Returns:
+        A tensor of the same shape.
+    """
+    centers, sizes = boxes[..., :2], boxes[..., 2:]
+    return torch.cat((centers - sizes / 2, centers + sizes / 2), dim=-1)
+
+
+def box_iou(boxes1: torch.Tensor, boxes2: torch.Tensor) -> torch.Tensor:
+    """
+    Computes the intersection over union of two sets of (x1, y1, x2, y2) boxes.
+
+    Args:
+        boxes1: A tensor of shape (N, 4).
+        boxes2: A tensor of shape (M, 4).
+
+    Returns:
+        A tensor of shape (N, M).
+    """
+    area1 = (boxes1[:, 2] - boxes1[:, 0]).clamp(min=0) * (
+        boxes1[:, 3] - boxes1[:, 1]
+    ).clamp(min=0)
+    area2 = (boxes2[:, 2] - boxes2[:, 0]).clamp(min=0) * (
+        boxes2[:, 3] - boxes2[:, 1]
+    ).clamp(min=0)
+    top_left = torch.maximum(boxes1[:, None, :2], boxes2[None, :, :2])
+    bottom_right = torch.minimum(boxes1[:, None, 2:], boxes2[None, :, 2:])
+    intersection = (bottom_right - top_left).clamp(min=0).prod(dim=-1)
+    union = area1[:, None] + area2[None, :] - intersection
+    return intersection / union.clamp(min=1e-9)
+
+
+def batched_nms(
+    boxes: torch.Tensor,
+    scores: torch.Tensor,
+    labels: torch.Tensor,
+    iou_threshold: float,
+) -> torch.Tensor:
+    """
+    Greedy non-maximum suppression within each class.
+
+    Boxes of different classes never suppress each other: they are shifted
+    apart by a per-class offset larger than any coordinate, so that a single
+    IoU matrix serves all classes.
+
+    Args:
+        boxes: The (x1, y1, x2, y2) boxes, of shape (N, 4).
+        scores: The score of each box, of shape (N,).
+        labels: The class of each box, of shape (N,).
+        iou_threshold: Boxes overlapping a better box of their class by more
+            than this IoU are dropped.
+
+    Returns:
+        The indices of the kept boxes, by decreasing score.
+    """
+    if boxes.numel() == 0:
+        return torch.empty(0, dtype=torch.long)
+    offsets = labels.to(boxes.dtype) * (boxes.max() + 1)
+    shifted = boxes + offsets[:, None]
+    order = scores.argsort(descending=True, stable=True)
+    overlaps = box_iou(shifted[order], shifted[order]) > iou_threshold
+    keep = torch.ones(len(order), dtype=torch.bool)
+    # Only the loop over kept boxes is sequential; each step is a vector op.
+    for i in range(len(order)):
+        if keep[i]:
+            keep[i + 1 :] &= ~overlaps[i, i + 1 :]
+    return order[keep]
+
+
+def postprocess(
+    logits: torch.Tensor,
+    pred_boxes: torch.Tensor,
+    sizes: Sequence[tuple[float, float]],
+    score_thresholds: torch.Tensor | float = 0.0,
+    iou_threshold: float | None = None,
+    keep_labels: Sequence[int] | None = None,
+) -> list[Detections]:
+    """
+    Post-processes a batch of detection model outputs.
+
+    Args:
+        logits: The class logits, of shape (batch, queries, classes + 1). The
+            last class is DETR's "no object" class: as in the Hugging Face
+            post-processing, the class and score of a query are the best of
+            the other classes, after a softmax over all of them.
+        pred_boxes: The normalized (x1, y1, x2, y2) boxes, of shape
+            (batch, queries, 4). They are clamped to the image, and boxes
+            without area inside it are dropped.
+        sizes: The (width, height) each image's boxes are mapped to.
+        score_thresholds: The minimum score, for all classes or as a tensor
+            indexed by class.
+        iou_threshold: The IoU above which detections of a class are
+            suppressed. If None, no suppression is done.
+        keep_labels: If set, only these classes are kept.
+
+    Returns:
+        The detections of each image.
+    """
+    scores, labels = logits.softmax(dim=-1)[..., :-1].max(dim=-1)
+    thresholds = torch.as_tensor(score_thresholds, dtype=scores.dtype)
+    if thresholds.dim() == 0:
+        keep = scores >= thresholds
+    else:
+        keep = scores >= thresholds[labels.clamp(max=len(thresholds) - 1)]
+        keep &= labels < len(thresholds)
+    if keep_labels is not None:
+        keep &= torch.isin(labels, torch.as_tensor(list(keep_labels)))
+    # Predicted boxes can reach past the image edges
+    pred_boxes = pred_boxes.clamp(0.0, 1.0)
+    keep &= (pred_boxes[..., 2] > pred_boxes[..., 0]) & (
+        pred_boxes[..., 3] > pred_boxes[..., 1]
+    )
+    scales = torch.tensor(sizes, dtype=pred_boxes.dtype).repeat(1, 2)[:, None, :]
+    boxes = pred_boxes * scales
+
+    results = []
+    for page_keep, page_boxes, page_scores, page_labels in zip(
+        keep, boxes, scores, labels
+    ):
+        page_boxes = page_boxes[page_keep]
+        page_scores = page_scores[page_keep]
+        page_labels = page_labels[page_keep]
+        if iou_threshold is None:
+            order = page_scores.argsort(descending=True, stable=True)
+        else:
+            order = batched_nms(page_boxes, page_scores, page_labels, iou_threshold)
+        results.append(
+            Detections(
+                labels=page_labels[order].tolist(),
+                scores=page_scores[order].tolist(),
+                boxes=[tuple(box) for box in page_boxes[order].tolist()],
+            )
+        )
+    return results
+
+
+def class_thresholds(
+    id2label: Mapping[int, str],
+    thresholds: Mapping[str, float] | float,
+    default: float = 0.0,
+) -> torch.Tensor | float:
+    """
+    Builds the per-class score thresholds of `postprocess` from label names.
+
+    Args:
+        id2label: The class names of the model, by class id.
+        thresholds: A threshold for all classes, or thresholds by class name.
+        default: The threshold of classes missing from `thresholds`.
+
+    Returns:
+        A single threshold, or a tensor of thresholds indexed by class id.
+    """
+    if not isinstance(thresholds, Mapping):
+        return float(thresholds)
+    size = max(id2label, default=-1) + 1
+    values = [default] * size
+    for class_id, label in id2label.items():
+        values[class_id] = thresholds.get(label, default)
+    return torch.tensor(values)
@@ -6,35 +6,90 @@ Responsibilities:
 - Use a SOTA model (e.g., LayoutLMv3, DiT) to identify page regions.
 - Classify regions into types (Title, Text, Table, Figure, etc.).
 - Determine the logical reading order of the identified regions.
+- Run the model on batches of pages, one forward pass per batch.
+- Keep only confident regions: per-class score thresholds and class-aware
+  non-maximum suppression of overlapping regions.
+- Optionally cache the detected regions on disk, keyed by the page image and
+  the model, so re-processing a corpus skips the forward pass.
 """
 from __future__ import annotations
 
+import functools
+import json
+import pathlib
+from collections.abc import Mapping, Sequence
 from typing import Union
 
-import torch
+import numpy as np
 from PIL import Image
 from transformers import (
     AutoModelForObjectDetection,
     AutoProcessor,
 )
 
+from . import detection, inference, layout
+from .cache import DiskCache, array_sha256
 from .models import Figure, Table, TextBlock
+from .preprocessing import to_rgb_array
+from .spatial import SpatialIndex
 
 # A Union of all possible layout elements that DLA can produce
 LayoutElement = Union[TextBlock, Table, Figure]
 
+# Page images accepted by the analyzer: PIL Images or grayscale/RGB arrays.
+PageImage = Union[Image.Image, np.ndarray]
 
-class LayoutAnalyzer:
+# The region types turned into layout elements. Other labels (e.g., 'title',
+# 'list') are ignored for now but can be added.
+ELEMENT_LABELS = ("text", "table", "figure")
+
+# The minimum score of region types without a threshold of their own.
+DEFAULT_SCORE_THRESHOLD = 0.3
+
+# Part of the layout cache key. Bump it whenever a change to the
+# post-processing alters the detections produced, so stale entries are not
+# reused.
+DLA_CACHE_VERSION = 3
+
+
+class LayoutAnalyzer(inference.BackendMixin):
     """
     A class to analyze the layout of a document page using a LayoutLMv3 model.
     """
 
     def __init__(
-        self, model_name: str = "HYPJUDY/layoutlmv3-base-finetuned-publaynet"
+        self,
+        model_name: str = "HYPJUDY/layoutlmv3-base-finetuned-publaynet",
+        batch_size: int = 4,
+        min_overlap: float | None = None,
+        backend: str = "eager",
+        intra_op_threads: int | None = None,
+        score_threshold: Mapping[str, float] | float = DEFAULT_SCORE_THRESHOLD,
+        nms_threshold: float | None = 0.5,
     ):
         """
         Initializes the LayoutAnalyzer by loading the model and processor.
+
+        Args:
+            model_name: The Hugging Face model to load.
+            batch_size: The number of pages passed through the model at once.
+            min_overlap: If set, each OCR block is assigned to the text region
+                covering the largest fraction of its area, if at least this
+                fraction. By default, OCR blocks are assigned to every text
+                region that contains their center.
+            backend: How the model runs (see `inference.BackendMixin`).
+            intra_op_threads: The intra-op threads of an ONNX Runtime session.
+            score_threshold: The minimum softmax score of a region, for all
+                region types or by label (e.g., {"text": 0.3, "table": 0.5});
+                missing labels use `DEFAULT_SCORE_THRESHOLD`.
+            nms_threshold: Regions overlapping a higher-scoring region of the
+                same type by more than this IoU are dropped. None keeps them.
         """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.min_overlap = min_overlap
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
         try:
             self.processor = AutoProcessor.from_pretrained(model_name)
             self.model = (
@@ -49,117 +104,328 @@ class LayoutAnalyzer:
             # Handle model loading failure gracefully
             self.processor = None
             self.model = None
+        self.set_backend(backend, intra_op_threads)
+
+    @property
+    def input_size(self) -> tuple[int, int] | None:
+        """
+        The (width, height) the processor resizes page images to, if fixed.
+
+        Passing images already at this size spares the processor a resize of
+        the full page.
+        """
+        image_processor = getattr(self.processor, "image_processor", None)
+        size = getattr(image_processor, "size", None)
+        if isinstance(size, dict) and "width" in size and "height" in size:
+            return (int(size["width"]), int(size["height"]))
+        return None
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the model was loaded, i.e. whether regions can be detected."""
+        return self.model is not None and self.processor is not None
+
+    def warm_up(self) -> None:
+        """
+        Runs the model once on a blank page.
+
+        This moves one-off costs (e.g., exporting an ONNX model, allocating
+        buffers) ahead of the first real page.
+        """
+        if self.is_available:
+            width, height = self.input_size or (224, 224)
+            self.detect_regions(np.full((height, width), 255, dtype=np.uint8), 0)
 
     def analyze_page(
-        self, image: Image.Image, page_number: int, ocr_blocks: list[TextBlock]
+        self,
+        image: Image.Image | np.ndarray,
+        page_number: int,
+        ocr_blocks: list[TextBlock],
+        page_size: tuple[int, int] | None = None,
     ) -> list[LayoutElement]:
         """
         Analyzes a single page image to identify and structure layout elements.
 
         Args:
-            image: The PIL Image of the page.
+            image: The page image, as a PIL Image or a grayscale/RGB array.
             page_number: The page number.
             ocr_blocks: A list of TextBlock objects from the OCR step.
+            page_size: The (width, height) of the page coordinate space, used
+                when the image is a downscaled render. Defaults to the image size.
 
         Returns:
             A sorted list of LayoutElement objects found on the page.
         """
+        return self.analyze_pages([image], [page_number], [ocr_blocks], [page_size])[0]
+
+    def analyze_pages(
+        self,
+        images: Sequence[PageImage],
+        page_numbers: Sequence[int],
+        ocr_blocks: Sequence[list[TextBlock]],
+        page_sizes: Sequence[tuple[int, int] | None] | None = None,
+        batch_size: int | None = None,
+        ocr_indexes: Sequence[SpatialIndex] | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[list[LayoutElement]]:
+        """
+        Analyzes several pages, running the model on batches of pages.
+
+        Args:
+            images: The page images, as PIL Images or grayscale/RGB arrays.
+            page_numbers: The page number of each image.
+            ocr_blocks: The TextBlock objects from the OCR step, per page.
+            page_sizes: The (width, height) of each page coordinate space, if
+                it differs from the image size.
+            batch_size: The number of pages per forward pass. Defaults to the
+                analyzer's `batch_size`.
+            ocr_indexes: Spatial indexes over the OCR blocks of each page, if
+                already built.
+            cache: An optional layout cache (see `detect_regions_batch`).
+
+        Returns:
+            A sorted list of LayoutElement objects for each page.
+        """
         if not self.model or not self.processor:
             print("LayoutAnalyzer not initialized. Skipping DLA.")
-            return ocr_blocks  # type: ignore
+            return [list(blocks) for blocks in ocr_blocks]
 
-        # 1. Prepare image for the model
-        inputs = self.processor(images=image, return_tensors="pt")
+        return layout.analyze_pages(
+            self,
+            images,
+            page_numbers,
+            ocr_blocks,
+            page_sizes,
+            batch_size,
+            ocr_indexes,
+            cache,
+        )
 
-        # 2. Perform inference
-        with torch.no_grad():
-            outputs = self.model(**inputs)
+    def detect_regions(
+        self,
+        image: Image.Image | np.ndarray,
+        page_number: int,
+        page_size: tuple[int, int] | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[LayoutElement]:
+        """
+        Detects the layout regions of a page, without their text.
 
-        # 3. Post-process the predictions
-        width, height = image.size
-        predictions = outputs["logits"].argmax(-1).squeeze().tolist()
-        boxes = outputs["pred_boxes"].squeeze().tolist()
+        This is the model half of `analyze_page`. It lets the pipeline run
+        layout analysis before OCR and only OCR the regions that need it.
 
-        # Denormalize bounding boxes
-        def denormalize_box(
-            box: list[float], w: int, h: int
-        ) -> tuple[float, float, float, float]:
-            return (box[0] * w, box[1] * h, box[2] * w, box[3] * h)
+        Args:
+            image: The page image, as a PIL Image or a grayscale/RGB array.
+            page_number: The page number.
+            page_size: The (width, height) of the page coordinate space, used
+                when the image is a downscaled render. Defaults to the image size.
+            cache: An optional layout cache (see `detect_regions_batch`).
 
-        denormalized_boxes = [
-            denormalize_box(box, width, height) for box in boxes
-        ]
+        Returns:
+            The detected elements, by decreasing score. TextBlocks have no
+            text yet.
+        """
+        return self.detect_regions_batch(
+            [image], [page_number], [page_size], cache=cache
+        )[0]
+
+    def detect_regions_batch(
+        self,
+        images: Sequence[PageImage],
+        page_numbers: Sequence[int],
+        page_sizes: Sequence[tuple[int, int] | None] | None = None,
+        batch_size: int | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[list[LayoutElement]]:
+        """
+        Detects the layout regions of several pages, without their text.
+
+        The processor and model run once per batch of pages, so the cost of
+        a forward pass is shared by the pages of a batch.
 
-        # 4. Create initial layout elements from predictions
+        With a `cache`, the detections of each page are looked up by a hash of
+        the page image together with the model, its revision, the backend and
+        the post-processing settings, and only the pages missing from the
+        cache go through the model.
+
+        Args:
+            images: The page images, as PIL Images or grayscale/RGB arrays.
+            page_numbers: The page number of each image.
+            page_sizes: The (width, height) of each page coordinate space, if
+                it differs from the image size.
+            batch_size: The number of pages per forward pass. Defaults to the
+                analyzer's `batch_size`.
+            cache: An optional layout cache.
+
+        Returns:
+            The detected elements of each page, by decreasing score.
+        """
+        if not self.runner or not self.processor:
+            print("LayoutAnalyzer not initialized. Skipping DLA.")
+            return [[] for _ in images]
+
+        sizes = list(page_sizes) if page_sizes is not None else [None] * len(images)
+        batch_size = batch_size or self.batch_size
         # The model's config contains the mapping from id to label
         id2label = self.model.config.id2label
+        keep_labels = [
+            label_id for label_id, label in id2label.items() if label in ELEMENT_LABELS
+        ]
+        thresholds = detection.class_thresholds(
+            id2label, self.score_threshold, DEFAULT_SCORE_THRESHOLD
+        )
+
+        # 1. Prepare the images for the model, and look them up in the cache
+        rgb_images = [to_rgb_array(image) for image in images]
+        keys: list[str] = []
+        detections: list[detection.Detections | None] = [None] * len(images)
+        if cache is not None:
+            keys = [self._cache_key(cache, rgb_image) for rgb_image in rgb_images]
+            for index, key in enumerate(keys):
+                entry = cache.get(key)
+                if entry is not None:
+                    detections[index] = _load_cached_detections(entry)
+        misses = [index for index, found in enumerate(detections) if found is None]
+
+        for start in range(0, len(misses), batch_size):
+            batch = misses[start : start + batch_size]
+            inputs = self.processor(
+                images=[rgb_images[index] for index in batch], return_tensors="pt"
+            )
+
+            # 2. Perform inference
+            outputs = self.runner(inputs)
+
+            # 3. Score and filter the predictions of the batch. Boxes stay
+            # normalized until the elements are built, so cached detections
+            # do not depend on the page size.
+            batch_detections = detection.postprocess(
+                outputs["logits"],
+                # Like the Table Transformer, the head predicts centers and sizes
+                detection.box_cxcywh_to_xyxy(outputs["pred_boxes"]),
+                [(1, 1)] * len(batch),
+                thresholds,
+                self.nms_threshold,
+                keep_labels,
+            )
+            for index, page_detections in zip(batch, batch_detections):
+                detections[index] = page_detections
+                if cache is not None:
+                    cache.put(
+                        keys[index],
+                        functools.partial(
+                            _save_cached_detections, detections=page_detections
+                        ),
+                    )
+
+        # 4. Map the normalized boxes straight to the page coordinate space,
+        # regardless of the image resolution.
+        elements = []
+        for index, found in enumerate(detections):
+            assert found is not None
+            width, height = sizes[index] or (
+                rgb_images[index].shape[1],
+                rgb_images[index].shape[0],
+            )
+            elements.append(
+                self._build_elements(
+                    found.scaled(width, height),
+                    page_numbers[index],
+                    id2label,
+                )
+            )
+        return elements
+
+    def _cache_key(self, cache: DiskCache, rgb_image: np.ndarray) -> str:
+        """The layout cache key of a page image, for the current settings."""
+        score_threshold = (
+            sorted(self.score_threshold.items())
+            if isinstance(self.score_threshold, Mapping)
+            else self.score_threshold
+        )
+        return cache.key(
+            array_sha256(rgb_image),
+            self.model_name,
+            self.model_revision,
+            self.backend_config[0] if self.backend_config else None,
+            score_threshold,
+            self.nms_threshold,
+            DLA_CACHE_VERSION,
+        )
+
+    def _build_elements(
+        self,
+        detections: detection.Detections,
+        page_number: int,
+        id2label: Mapping[int, str],
+    ) -> list[LayoutElement]:
+        """
+        Creates layout elements from the detections of the model for a page.
+        """
         raw_elements: list[LayoutElement] = []
-        for label_id, bbox in zip(predictions, denormalized_boxes):
+        for label_id, score, bbox in zip(
+            detections.labels, detections.scores, detections.boxes
+        ):
             label = id2label.get(label_id, "unknown")
-            # For now, we only care about a few key types
             if label == "text":
                 # TextBlocks will be populated by associating OCR blocks
                 raw_elements.append(
-                    TextBlock(text="", bbox=bbox, page_number=page_number, confidence=None)
-                )  # noqa: E501
+                    TextBlock(text="", bbox=bbox, page_number=page_number, score=score)
+                )
             elif label == "table":
-                raw_elements.append(Table(bbox=bbox, page_number=page_number, rows=[]))
+                raw_elements.append(
+                    Table(bbox=bbox, page_number=page_number, rows=[], score=score)
+                )
             elif label == "figure":
                 # Placeholder, figure extraction happens later
                 raw_elements.append(
-                    Figure(bbox=bbox, page_number=page_number, image_path="")
+                    Figure(
+                        bbox=bbox, page_number=page_number, image_path="", score=score
+                    )
                 )
-            # Other labels like 'title', 'list', etc., are ignored for now but can be added.
-
-        # 5. Associate OCR text with the DLA text blocks
-        layout_elements = self._associate_ocr_to_layout(raw_elements, ocr_blocks)
 
-        # 6. Sort elements by reading order
-        sorted_elements = self._sort_elements_by_reading_order(layout_elements)
+        return raw_elements
 
-        return sorted_elements
-
-    def _associate_ocr_to_layout(
-        self, layout_elements: list[LayoutElement], ocr_blocks: list[TextBlock]
+    def associate_text(
+        self,
+        raw_elements: list[LayoutElement],
+        ocr_blocks: list[TextBlock],
+        index: SpatialIndex | None = None,
     ) -> list[LayoutElement]:
         """
-        Assigns text from OCR blocks to the containing DLA-identified layout elements.
-        """
-        # This is a simple association based on containment. More complex logic
-        # could handle overlapping regions.
-        for element in layout_elements:
-            if isinstance(element, TextBlock):
-                contained_texts = []
-                for ocr_block in ocr_blocks:
-                    # Check if the center of the OCR block is inside the DLA element
-                    ocr_center_x = (ocr_block.bbox[0] + ocr_block.bbox[2]) / 2
-                    ocr_center_y = (ocr_block.bbox[1] + ocr_block.bbox[3]) / 2
-                    if (
-                        element.bbox[0] <= ocr_center_x <= element.bbox[2]
-                        and element.bbox[1]
-                        <= ocr_center_y
-                        <= element.bbox[3]
-                    ):
-                        contained_texts.append(ocr_block.text)
-
-                element.text = " ".join(contained_texts)
-
-        # Filter out text blocks that didn't get any text assigned
-        # and keep non-text blocks (tables, figures)
-        final_elements = [
-            elem
-            for elem in layout_elements
-            if (isinstance(elem, TextBlock) and elem.text.strip())
-            or not isinstance(elem, TextBlock)
-        ]
-        return final_elements
+        Fills detected regions with OCR text and sorts them by reading order.
 
-    def _sort_elements_by_reading_order(
-        self, elements: list[LayoutElement]
-    ) -> list[LayoutElement]:
-        """
-        Sorts elements in a top-to-bottom, left-to-right reading order.
-        This is a simple heuristic and may not work for complex multi-column layouts.
+        Args:
+            raw_elements: The elements returned by `detect_regions`.
+            ocr_blocks: A list of TextBlock objects from the OCR step.
+            index: A spatial index over `ocr_blocks`, if already built.
+
+        Returns:
+            A sorted list of LayoutElement objects.
         """
-        # Sort primarily by top coordinate, then by left coordinate
-        return sorted(elements, key=lambda e: (e.bbox[1], e.bbox[0]))
+        return layout.associate_text(raw_elements, ocr_blocks, index, self.min_overlap)
+
+
+def _save_cached_detections(
+    entry: pathlib.Path, detections: detection.Detections
+) -> None:
+    """Writes normalized detections into a layout cache entry, one row each."""
+    rows = [
+        [label, score, *box]
+        for label, score, box in zip(
+            detections.labels, detections.scores, detections.boxes
+        )
+    ]
+    (entry / "detections.json").write_text(
+        json.dumps(rows, separators=(",", ":")), encoding="utf-8"
+    )
+
+
+def _load_cached_detections(entry: pathlib.Path) -> detection.Detections:
+    """Loads the normalized detections of a page from a layout cache entry."""
+    rows = json.loads((entry / "detections.json").read_text(encoding="utf-8"))
+    return detection.Detections(
+        labels=[label for label, *_ in rows],
+        scores=[score for _, score, *_ in rows],
+        boxes=[(x1, y1, x2, y2) for _, _, x1, y1, x2, y2 in rows],
+    )
@@ -0,0 +1,329 @@
+# src/pyscientificpdfparser/inference.py
+"""
+Runs the forward pass of the DLA and TSR models on CPU.
+
+Responsibilities:
+- Provide interchangeable inference backends for a loaded Hugging Face model:
+  eager PyTorch, dynamically int8-quantized PyTorch, and an ONNX Runtime
+  session exported from the model.
+- Let the number of intra-op threads of the ONNX Runtime session be set.
+- Name exported ONNX files after the model, its revision and the torch
+  version, so a stale export is never loaded for a different model.
+- Return the model outputs as tensors, whichever backend produced them, so the
+  post-processing of the analyzers does not depend on the backend.
+- Let the DLA and TSR models switch backends the same way (`BackendMixin`).
+"""
+from __future__ import annotations
+
+import abc
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import uuid
+from collections.abc import Mapping, Sequence
+from typing import Any
+
+import torch
+
+try:
+    import onnxruntime
+except ImportError:  # Optional dependency, see the `onnx` extra
+    onnxruntime = None
+
+# The names of the selectable backends, for configuration and the CLI.
+BACKENDS = ("eager", "quantized", "onnx")
+
+# The outputs the DLA and TSR detection models are post-processed from.
+DETECTION_OUTPUTS = ("logits", "pred_boxes")
+
+
+def model_revision(model: Any) -> str | None:
+    """The revision (commit hash) a Hugging Face model was loaded from, if known."""
+    config = getattr(model, "config", None)
+    revision = getattr(config, "_commit_hash", None)
+    return str(revision) if revision is not None else None
+
+
+def onnx_file_name(model_name: str, model: Any) -> str:
+    """
+    The file name an exported model is kept under.
+
+    The name includes the model revision and the torch version that exported
+    it, so that an updated model or exporter never loads an older export.
+
+    Args:
+        model_name: The name of the model, e.g. "org/model".
+        model: The loaded model.
+
+    Returns:
+        A file name without directory separators.
+    """
+    parts = [
+        model_name,
+        model_revision(model) or "unknown",
+        f"torch{torch.__version__}",
+    ]
+    return re.sub(r"[^\w.+-]", "--", "-".join(parts)) + ".onnx"
+
+
+class InferenceBackend(abc.ABC):
+    """
+    The interface of an inference backend.
+
+    A backend wraps a model in evaluation mode and is called with the tensors
+    returned by its processor.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def __call__(self, inputs: Mapping[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+        """
+        Runs the forward pass.
+
+        Args:
+            inputs: The model inputs, as returned by the processor.
+
+        Returns:
+            The model outputs by name.
+        """
+
+
+class EagerBackend(InferenceBackend):
+    """Runs the stock PyTorch model."""
+
+    name = "eager"
+
+    def __init__(self, model: Any) -> None:
+        self.model = model
+
+    def __call__(self, inputs: Mapping[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+        with torch.no_grad():
+            outputs: dict[str, torch.Tensor] = self.model(**inputs)
+        return outputs
+
+
+class QuantizedBackend(EagerBackend):
+    """
+    Runs a copy of the model with its linear layers quantized to int8.
+
+    Weights are quantized once and activations on the fly, which needs no
+    calibration data. The transformer layers of the DLA and TSR models are
+    dominated by linear layers, so most of the forward pass runs in int8.
+    """
+
+    name = "quantized"
+
+    def __init__(self, model: Any) -> None:
+        super().__init__(
+            torch.ao.quantization.quantize_dynamic(
+                model, {torch.nn.Linear}, dtype=torch.qint8
+            )
+        )
+
+
+class _OutputTuple(torch.nn.Module):
+    """Adapts a model called with keyword inputs to positional export."""
+
+    def __init__(
+        self, model: Any, input_names: Sequence[str], output_names: Sequence[str]
+    ) -> None:
+        super().__init__()
+        self.model = model
+        self.input_names = list(input_names)
+        self.output_names = list(output_names)
+
+    def forward(self, *args: torch.Tensor) -> tuple[torch.Tensor, ...]:
+        outputs = self.model(**dict(zip(self.input_names, args)))
+        return tuple(outputs[name] for name in self.output_names)
+
+
+class OnnxBackend(InferenceBackend):
+    """
+    Runs the model in an ONNX Runtime session.
+
+    The model is exported on the first call, from the inputs of that call.
+    The batch dimension and the height and width of the images (the last two
+    axes of every input with more than two) are dynamic, so the session
+    accepts any batch of pages or tables. The exported file is kept, so later
+    runs with the same `onnx_path` skip the export.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model: Any,
+        intra_op_threads: int | None = None,
+        onnx_path: pathlib.Path | None = None,
+        output_names: Sequence[str] = DETECTION_OUTPUTS,
+    ) -> None:
+        """
+        Prepares the backend.
+
+        Args:
+            model: The PyTorch model to export.
+            intra_op_threads: The threads ONNX Runtime uses within an
+                operator. Defaults to the number of CPUs.
+            onnx_path: Where the exported model is stored. Defaults to a file
+                in a temporary directory.
+            output_names: The model outputs to export.
+
+        Raises:
+            ImportError: If onnxruntime is not installed.
+        """
+        if onnxruntime is None:
+            raise ImportError(
+                "onnxruntime is not installed. "
+                "Install it with `pip install pyscientificpdfparser[onnx]`."
+            )
+        self.model = model
+        self.intra_op_threads = intra_op_threads or os.cpu_count() or 1
+        self.onnx_path = onnx_path or (
+            pathlib.Path(tempfile.mkdtemp(prefix="scipdf-onnx-")) / "model.onnx"
+        )
+        self.output_names = list(output_names)
+        self._session: Any = None
+        self._lock = threading.Lock()
+
+    def _export(self, inputs: Mapping[str, torch.Tensor]) -> None:
+        """Exports the model to `onnx_path`, using `inputs` as examples."""
+        input_names = list(inputs)
+        dynamic_axes: dict[str, dict[int, str]] = {}
+        for name in input_names:
+            axes = {0: "batch"}
+            # pixel_values is (batch, channels, height, width) and pixel_mask
+            # (batch, height, width): the processor pads each batch to its
+            # largest image, so the image size changes from batch to batch.
+            if inputs[name].dim() > 2:
+                axes[inputs[name].dim() - 2] = "height"
+                axes[inputs[name].dim() - 1] = "width"
+            dynamic_axes[name] = axes
+        for name in self.output_names:
+            dynamic_axes[name] = {0: "batch"}
+        self.onnx_path.parent.mkdir(parents=True, exist_ok=True)
+        # Exported aside and moved into place, like cache entries, so that an
+        # interrupted export or a concurrent run never leaves a partial model
+        # where later runs would load it.
+        temp_path = self.onnx_path.with_name(f".tmp-{uuid.uuid4().hex}.onnx")
+        try:
+            torch.onnx.export(
+                _OutputTuple(self.model, input_names, self.output_names),
+                tuple(inputs[name] for name in input_names),
+                str(temp_path),
+                input_names=input_names,
+                output_names=self.output_names,
+                dynamic_axes=dynamic_axes,
+                dynamo=False,
+            )
+            os.replace(temp_path, self.onnx_path)
+        finally:
+            temp_path.unlink(missing_ok=True)
+
+    def session(self, inputs: Mapping[str, torch.Tensor]) -> Any:
+        """Returns the ONNX Runtime session, exporting the model if needed."""
+        with self._lock:
+            if self._session is None:
+                if not self.onnx_path.exists():
+                    with torch.no_grad():
+                        self._export(inputs)
+                options = onnxruntime.SessionOptions()
+                options.intra_op_num_threads = self.intra_op_threads
+                self._session = onnxruntime.InferenceSession(
+                    str(self.onnx_path),
+                    sess_options=options,
+                    providers=["CPUExecutionProvider"],
+                )
+            return self._session
+
+    def __call__(self, inputs: Mapping[str, torch.Tensor]) -> dict[str, torch.Tensor]:
+        session = self.session(inputs)
+        feed = {
+            node.name: inputs[node.name].cpu().numpy() for node in session.get_inputs()
+        }
+        results = session.run(self.output_names, feed)
+        return {
+            name: torch.from_numpy(result)
+            for name, result in zip(self.output_names, results)
+        }
+
+
+def create_backend(
+    name: str,
+    model: Any,
+    intra_op_threads: int | None = None,
+    onnx_dir: pathlib.Path | None = None,
+    model_name: str = "model",
+) -> InferenceBackend:
+    """
+    Wraps a loaded model in an inference backend.
+
+    Args:
+        name: "eager", "quantized" or "onnx".
+        model: The PyTorch model, in evaluation mode.
+        intra_op_threads: The intra-op threads of the ONNX Runtime session.
+        onnx_dir: An optional directory where the ONNX backend keeps exported
+            models, so they are only exported once.
+        model_name: The name of the model, which names its exported file
+            together with the model revision and the torch version.
+
+    Returns:
+        The backend.
+
+    Raises:
+        ValueError: If the backend name is unknown.
+        ImportError: If the backend's dependencies are not installed.
+    """
+    if name == "eager":
+        return EagerBackend(model)
+    if name == "quantized":
+        return QuantizedBackend(model)
+    if name == "onnx":
+        onnx_path = onnx_dir / onnx_file_name(model_name, model) if onnx_dir else None
+        return OnnxBackend(model, intra_op_threads, onnx_path)
+    raise ValueError(f"Unknown inference backend {name!r}; expected one of {BACKENDS}.")
+
+
+class BackendMixin:
+    """
+    Runs the forward pass of a loaded model through a selectable backend.
+
+    The class using it sets `model` (None if it failed to load) and
+    `model_name`, then calls `set_backend`; the forward pass runs through
+    `runner`.
+    """
+
+    model: Any
+    model_name: str
+    runner: InferenceBackend | None = None
+    # The arguments of the last `set_backend` call that created `runner`.
+    backend_config: tuple[object, ...] | None = None
+
+    def set_backend(
+        self,
+        backend: str = "eager",
+        intra_op_threads: int | None = None,
+        onnx_dir: pathlib.Path | None = None,
+    ) -> None:
+        """
+        Selects how the forward pass of the model runs.
+
+        Args:
+            backend: One of `BACKENDS`.
+            intra_op_threads: The intra-op threads of an ONNX Runtime session.
+            onnx_dir: An optional directory for exported ONNX models.
+        """
+        config = (backend, intra_op_threads, onnx_dir)
+        if self.model is None or config == self.backend_config:
+            return
+        self.runner = create_backend(
+            backend, self.model, intra_op_threads, onnx_dir, self.model_name
+        )
+        self.backend_config = config
+
+    @property
+    def model_revision(self) -> str | None:
+        """The revision (commit hash) of the loaded model, if known."""
+        return model_revision(self.model)
@@ -0,0 +1,89 @@
+# src/pyscientificpdfparser/layout.py
+"""
+Turns detected layout regions into the layout elements of pages.
+
+Responsibilities:
+- Fill the detected text regions of a page with its OCR text and sort the
+  elements by reading order.
+- Analyze batches of pages: detect their regions, then associate their text.
+- Serve `dla.LayoutAnalyzer` and the model server's `RemoteLayoutAnalyzer`
+  alike, so both produce the same elements from the same detections.
+
+This module does not import PyTorch: model server workers use it without
+loading the models.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from . import reading_order
+from .cache import DiskCache
+from .models import TextBlock
+from .spatial import SpatialIndex, fill_text_regions
+
+if TYPE_CHECKING:
+    from .dla import LayoutAnalyzer, LayoutElement, PageImage
+    from .server import RemoteLayoutAnalyzer
+
+
+def associate_text(
+    raw_elements: list[LayoutElement],
+    ocr_blocks: list[TextBlock],
+    index: SpatialIndex | None = None,
+    min_overlap: float | None = None,
+) -> list[LayoutElement]:
+    """
+    Fills detected regions with OCR text and sorts them by reading order.
+
+    Args:
+        raw_elements: The detected elements of a page.
+        ocr_blocks: The TextBlock objects of the page from the OCR step.
+        index: A spatial index over `ocr_blocks`, if already built.
+        min_overlap: How OCR blocks are assigned to text regions (see
+            `spatial.fill_text_regions`).
+
+    Returns:
+        A sorted list of LayoutElement objects.
+    """
+    return reading_order.sort_elements(
+        fill_text_regions(raw_elements, ocr_blocks, index, min_overlap)
+    )
+
+
+def analyze_pages(
+    analyzer: LayoutAnalyzer | RemoteLayoutAnalyzer,
+    images: Sequence[PageImage],
+    page_numbers: Sequence[int],
+    ocr_blocks: Sequence[list[TextBlock]],
+    page_sizes: Sequence[tuple[int, int] | None] | None = None,
+    batch_size: int | None = None,
+    ocr_indexes: Sequence[SpatialIndex] | None = None,
+    cache: DiskCache | None = None,
+) -> list[list[LayoutElement]]:
+    """
+    Detects the regions of several pages and fills them with their OCR text.
+
+    Args:
+        analyzer: The analyzer that detects the regions.
+        images: The page images, as PIL Images or grayscale/RGB arrays.
+        page_numbers: The page number of each image.
+        ocr_blocks: The TextBlock objects from the OCR step, per page.
+        page_sizes: The (width, height) of each page coordinate space, if
+            it differs from the image size.
+        batch_size: The number of pages per forward pass.
+        ocr_indexes: Spatial indexes over the OCR blocks of each page, if
+            already built.
+        cache: An optional layout cache.
+
+    Returns:
+        A sorted list of LayoutElement objects for each page.
+    """
+    detections = analyzer.detect_regions_batch(
+        images, page_numbers, page_sizes, batch_size, cache
+    )
+    indexes: Sequence[SpatialIndex | None] = ocr_indexes or [None] * len(detections)
+    return [
+        associate_text(raw_elements, blocks, index, analyzer.min_overlap)
+        for raw_elements, blocks, index in zip(detections, ocr_blocks, indexes)
+    ]
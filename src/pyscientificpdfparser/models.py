@@ -1,14 +1,44 @@
 # src/pyscientificpdfparser/models.py
 from __future__ import annotations
 
+from collections.abc import Iterable
+from dataclasses import dataclass
 from typing import Any, Literal, TypeAlias, Union
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, SkipValidation
 
 # Type alias for a bounding box: [x1, y1, x2, y2]
 BoundingBox: TypeAlias = tuple[float, float, float, float]
 
 
+@dataclass
+class Words:
+    """
+    The words of a text block, as columns.
+
+    A page has hundreds of words but only the words of tables are looked up
+    one by one, so they are kept as plain lists rather than one model each
+    (see `spatial.split_words`).
+    """
+
+    texts: list[str]
+    boxes: list[BoundingBox]
+    confidences: list[float | None]
+
+    def __len__(self) -> int:
+        return len(self.texts)
+
+    @classmethod
+    def concat(cls, words: Iterable[Words]) -> Words:
+        """Joins the words of several blocks, in order."""
+        joined = cls([], [], [])
+        for part in words:
+            joined.texts.extend(part.texts)
+            joined.boxes.extend(part.boxes)
+            joined.confidences.extend(part.confidences)
+        return joined
+
+
 class BaseElement(BaseModel):
     """Base model for any identifiable element on a page."""
 
@@ -17,6 +47,9 @@ class BaseElement(BaseModel):
         ..., description="The page number where the element is located."
     )
     element_type: str
+    score: float | None = Field(
+        None, description="The confidence of the layout model in the element."
+    )
 
 
 class TextBlock(BaseElement):
@@ -27,6 +60,13 @@ class TextBlock(BaseElement):
     confidence: float | None = Field(
         None, description="The OCR confidence score for the text block."
     )
+    # Not validated: the columns are built by the OCR post-processing.
+    words: SkipValidation[Words | None] = Field(
+        None,
+        exclude=True,
+        description="The words of the block, in reading order, for lookups "
+        "finer than a block (e.g. table cells). Not serialized.",
+    )
 
 
 class TableCell(BaseModel):
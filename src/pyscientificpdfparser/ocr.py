@@ -6,110 +6,789 @@ Responsibilities:
 - Use Tesseract to extract text, bounding boxes, and confidence scores.
 - Provide configuration options for Tesseract (e.g., language, PSM).
 - Output OCR data in a structured format (e.g., mapping to internal models).
+- Build text blocks directly from the PDF text layer for born-digital pages.
+- Provide interchangeable OCR engines: a pool of persistent in-process
+  Tesseract APIs (tesserocr) and the pytesseract command-line wrapper as a
+  fallback.
+- Split large pages into overlapping tiles that are OCR'd concurrently, on
+  thread pools shared by all pages.
+- Cache OCR results by the content of the page image, so re-runs skip OCR.
 """
 from __future__ import annotations
 
+import abc
+import contextlib
+import functools
+import json
+import math
+import os
+import pathlib
+import queue
+import shlex
+import threading
 from collections import defaultdict
-from typing import TypedDict
+from collections.abc import Callable, Iterator, Sequence
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 
+import numpy as np
 import pytesseract
 
-from .models import BoundingBox, TextBlock
-from .preprocessing import PreprocessedPage
+from .cache import DiskCache, array_sha256
+from .models import BaseElement, BoundingBox, TextBlock, Words
+from .preprocessing import PageArray, PreprocessedPage, TextLayerWord
 
+try:
+    import tesserocr
+except ImportError:  # Optional dependency, see the `ocr` extra
+    tesserocr = None
 
-class OcrBlock(TypedDict):
-    text: list[str]
-    conf: list[int]
-    left: list[int]
-    top: list[int]
-    width: list[int]
-    height: list[int]
+# Tesseract's `image_to_data` output, as columns of equal length.
+OcrData = dict[str, list[Any]]
+
+# Tesseract page segmentation mode used for each type of layout region:
+# text regions are uniform blocks of text (6), while table regions hold
+# scattered cell text that is best found as sparse text (11). Other regions,
+# such as figures, are not OCR'd.
+REGION_PSM: dict[str, int] = {"TextBlock": 6, "Table": 11}
+
+# Part of the OCR cache key. Bump it whenever a change to the OCR
+# post-processing alters the blocks produced, so stale entries are not reused.
+OCR_CACHE_VERSION = 3
+
+# Tiles shorter than this many pixels would cut too many text lines, so
+# small pages are split into fewer tiles than requested.
+MIN_TILE_HEIGHT = 256
+
+
+class OcrEngine(abc.ABC):
+    """
+    The interface of an OCR backend.
+
+    Engines recognize the words of a grayscale image held in memory and
+    return them as Tesseract `image_to_data` columns (at least 'block_num',
+    'left', 'top', 'width', 'height', 'conf' and 'text'), so every engine
+    shares the same post-processing.
+    """
+
+    name = "base"
+
+    @property
+    @abc.abstractmethod
+    def version(self) -> str:
+        """The engine version, part of any cache key for its results."""
+
+    @abc.abstractmethod
+    def image_to_data(
+        self, image: PageArray, lang: str = "eng", config: str = ""
+    ) -> OcrData:
+        """
+        Recognizes the words of an image.
+
+        Args:
+            image: A grayscale image array.
+            lang: The Tesseract language(s), e.g. "eng" or "eng+deu".
+            config: Tesseract command-line options (e.g., "--psm 6").
+
+        Returns:
+            The recognized words as Tesseract `image_to_data` columns.
+        """
+
+
+class PytesseractEngine(OcrEngine):
+    """
+    Runs the `tesseract` executable through pytesseract.
+
+    Every call starts a new process, which writes the image to a temporary
+    file and loads the language model again. Kept as the fallback when
+    tesserocr is not installed.
+    """
+
+    name = "pytesseract"
+
+    @functools.cached_property
+    def version(self) -> str:
+        return str(pytesseract.get_tesseract_version())
+
+    def image_to_data(
+        self, image: PageArray, lang: str = "eng", config: str = ""
+    ) -> OcrData:
+        data: OcrData = pytesseract.image_to_data(
+            image, lang=lang, config=config, output_type=pytesseract.Output.DICT
+        )
+        return data
+
+
+class TesserocrEngine(OcrEngine):
+    """
+    Runs Tesseract in-process through persistent tesserocr API handles.
+
+    The engine keeps a pool of API handles per (language, options). Each call
+    checks out an idle handle and returns it when done, so the traineddata is
+    loaded once rather than for every page, and the number of handles is
+    bounded by the concurrent calls, however many threads make them. Images
+    are passed as raw pixel buffers, without temporary files or encoding.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self, pool_size: int | None = None) -> None:
+        """
+        Initializes the engine. Requires the optional tesserocr package.
+
+        Args:
+            pool_size: The most API handles per language and options, i.e.
+                the most concurrent calls with the same settings; further
+                calls wait for a handle. Defaults to the number of CPUs.
+        """
+        if tesserocr is None:
+            raise ImportError(
+                "tesserocr is not installed. "
+                "Install it with `pip install pyscientificpdfparser[ocr]`."
+            )
+        self.pool_size = pool_size or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._pools: dict[tuple[str, str], queue.Queue[Any]] = {}
+        self._sizes: dict[tuple[str, str], int] = defaultdict(int)
+        self._apis: list[Any] = []
+
+    @functools.cached_property
+    def version(self) -> str:
+        return str(tesserocr.tesseract_version()).splitlines()[0]
+
+    def image_to_data(
+        self, image: PageArray, lang: str = "eng", config: str = ""
+    ) -> OcrData:
+        image = np.ascontiguousarray(image, dtype=np.uint8)
+        height, width = image.shape[:2]
+        columns = ("block_num", "left", "top", "width", "height", "conf", "text")
+        data: OcrData = {name: [] for name in columns}
+        with self._checkout(lang, config) as api:
+            api.SetImageBytes(image.tobytes(), width, height, 1, width)
+            api.Recognize()
+
+            level = tesserocr.RIL.WORD
+            block_num = 0
+            iterator = api.GetIterator()  # None when nothing was recognized
+            words = tesserocr.iterate_level(iterator, level) if iterator else []
+            for word in words:
+                if word.IsAtBeginningOf(tesserocr.RIL.BLOCK):
+                    block_num += 1
+                box = word.BoundingBox(level)
+                if box is None:
+                    continue
+                x1, y1, x2, y2 = box
+                data["block_num"].append(block_num)
+                data["left"].append(x1)
+                data["top"].append(y1)
+                data["width"].append(x2 - x1)
+                data["height"].append(y2 - y1)
+                data["conf"].append(word.Confidence(level))
+                data["text"].append(word.GetUTF8Text(level))
+            api.Clear()
+        return data
+
+    def close(self) -> None:
+        """
+        Releases every API handle created by the engine.
+
+        Must not be called while a recognition is running.
+        """
+        with self._lock:
+            for api in self._apis:
+                api.End()
+            self._apis.clear()
+            self._pools.clear()
+            self._sizes.clear()
+
+    @contextlib.contextmanager
+    def _checkout(self, lang: str, config: str) -> Iterator[Any]:
+        """
+        Lends an API handle for a language and options, for one call.
+
+        An idle handle is reused. If there is none, a new handle is created
+        while the pool is below `pool_size`; otherwise the call waits for a
+        handle to be returned.
+        """
+        key = (lang, config)
+        with self._lock:
+            pool = self._pools.setdefault(key, queue.Queue())
+            create = pool.empty() and self._sizes[key] < self.pool_size
+            if create:
+                self._sizes[key] += 1
+        if create:
+            try:
+                api = self._create_api(lang, config)
+            except BaseException:
+                with self._lock:
+                    self._sizes[key] -= 1
+                raise
+        else:
+            api = pool.get()
+        try:
+            yield api
+        finally:
+            pool.put(api)
+
+    def _create_api(self, lang: str, config: str) -> Any:
+        """Creates an API handle for a language and options."""
+        psm, oem, variables = _parse_config(config)
+        api = tesserocr.PyTessBaseAPI(
+            lang=lang,
+            psm=tesserocr.PSM.AUTO if psm is None else psm,
+            oem=tesserocr.OEM.DEFAULT if oem is None else oem,
+        )
+        for name, value in variables.items():
+            api.SetVariable(name, value)
+        with self._lock:
+            self._apis.append(api)
+        return api
+
+
+def _parse_config(config: str) -> tuple[int | None, int | None, dict[str, str]]:
+    """
+    Parses Tesseract command-line options for the tesserocr API.
+
+    Args:
+        config: Options such as "--psm 6 --oem 1 -c preserve_interword_spaces=1".
+
+    Returns:
+        The page segmentation mode, the engine mode and the variables to set.
+    """
+    psm: int | None = None
+    oem: int | None = None
+    variables: dict[str, str] = {}
+    args = iter(shlex.split(config))
+    for arg in args:
+        if arg == "--psm":
+            psm = int(next(args))
+        elif arg == "--oem":
+            oem = int(next(args))
+        elif arg == "-c":
+            name, _, value = next(args).partition("=")
+            variables[name] = value
+        else:
+            raise ValueError(f"Unsupported Tesseract option: {arg}")
+    return psm, oem, variables
+
+
+@functools.cache
+def _executor(max_workers: int) -> ThreadPoolExecutor:
+    """
+    Returns the thread pool of the given size that OCR jobs run on.
+
+    Pools are created once and shared by all pages, so a document does not
+    start and join new threads for every page, and the threads (with the
+    engine's API handles they use) are reused.
+    """
+    return ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="ocr")
+
+
+@functools.cache
+def get_engine(name: str = "auto") -> OcrEngine:
+    """
+    Returns a shared OCR engine, so persistent engines are reused across
+    pages and documents.
+
+    Args:
+        name: "tesserocr", "pytesseract", or "auto" to use tesserocr when it
+            is installed and pytesseract otherwise.
+
+    Returns:
+        The OCR engine.
+    """
+    if name == "auto":
+        name = TesserocrEngine.name if tesserocr is not None else "pytesseract"
+    if name == TesserocrEngine.name:
+        return TesserocrEngine()
+    if name == PytesseractEngine.name:
+        return PytesseractEngine()
+    raise ValueError(f"Unknown OCR engine: {name}")
 
 
 def extract_text_from_page(
-    page: PreprocessedPage, lang: str = "eng", config: str = ""
+    page: PreprocessedPage,
+    lang: str = "eng",
+    config: str = "",
+    use_text_layer: bool = True,
+    engine: OcrEngine | None = None,
+    tiles: int = 1,
+    tile_overlap: int = 64,
+    max_workers: int | None = None,
+    cache: DiskCache | None = None,
 ) -> list[TextBlock]:
     """
     Extracts text and layout information from a single preprocessed page image.
 
+    Born-digital pages carry their text in the PDF itself, so by default their
+    text layer is used directly and Tesseract only runs on scanned pages.
+
+    A single Tesseract call runs on one core. With `tiles` > 1 the page is
+    split into horizontal bands that overlap by `tile_overlap` pixels and are
+    OCR'd concurrently on a thread pool shared by all pages (Tesseract
+    releases the GIL). Each
+    word is kept by the band that owns its vertical center, so words in the
+    overlap zones are not duplicated; text blocks that cross a band boundary
+    are split in two.
+
+    With a `cache`, results are looked up by a hash of the OCR image together
+    with the language, configuration and engine version, so re-running the
+    pipeline on an unchanged page skips OCR entirely.
+
     Args:
         page: A PreprocessedPage object containing the image to process.
         lang: The language for Tesseract to use.
         config: Additional configuration options for Tesseract (e.g., "--psm 6").
+        use_text_layer: Whether to use the PDF text layer of digital pages
+            instead of running OCR on them.
+        engine: The OCR engine to use. Defaults to `get_engine()`.
+        tiles: The number of bands the page is split into for OCR.
+        tile_overlap: Pixels by which neighbouring bands overlap; at least
+            half the height of a text line.
+        max_workers: The size of the thread pool the bands are recognized
+            on. Defaults to the number of CPUs.
+        cache: An optional OCR cache.
 
     Returns:
         A list of TextBlock objects found on the page.
     """
+    if use_text_layer and not page.is_scanned and page.text_layer is not None:
+        return _process_text_layer(page.text_layer, page.page_number)
+
+    engine = engine or get_engine()
+    image = page.ocr_image
     try:
+        if cache is not None:
+            key = cache.key(
+                array_sha256(image),
+                lang,
+                config,
+                engine.name,
+                engine.version,
+                tiles,
+                tile_overlap,
+                page.scale,
+                page.skew_angle,
+                OCR_CACHE_VERSION,
+            )
+            entry = cache.get(key)
+            if entry is not None:
+                return _load_cached_blocks(entry, page.page_number)
+
         # R2.3: Use image_to_data to get detailed information
-        ocr_data = pytesseract.image_to_data(
-            page.image, lang=lang, config=config, output_type=pytesseract.Output.DICT
+        ocr_data = _image_to_data_tiled(
+            engine,
+            image,
+            lang=lang,
+            config=config,
+            tiles=tiles,
+            overlap=tile_overlap,
+            max_workers=max_workers,
         )
     except pytesseract.TesseractNotFoundError:
         print("Tesseract is not installed or not in your PATH.")
         # Depending on desired behavior, could raise an exception or return empty
         return []
 
-    return _process_ocr_data(ocr_data, page.page_number)
+    blocks = _process_ocr_data(ocr_data, page.page_number, page.scale)
+    if page.skew_angle:
+        # The binarized view was deskewed: map the boxes back onto the page.
+        _map_boxes(blocks, page.unskew)
+    if cache is not None:
+        cache.put(key, lambda entry_dir: _save_cached_blocks(entry_dir, blocks))
+    return blocks
+
+
+def _map_boxes(
+    blocks: list[TextBlock], mapping: Callable[[BoundingBox], BoundingBox]
+) -> None:
+    """Maps the boxes of OCR blocks and of their words, in place."""
+    for block in blocks:
+        block.bbox = mapping(block.bbox)
+        if block.words is not None:
+            words = block.words
+            block.words = Words(
+                words.texts, [mapping(box) for box in words.boxes], words.confidences
+            )
+
+
+def _save_cached_blocks(entry: pathlib.Path, blocks: list[TextBlock]) -> None:
+    """Writes OCR blocks into an OCR cache entry directory, one row each."""
+    rows = [
+        [
+            block.text,
+            *block.bbox,
+            block.confidence,
+            (
+                None
+                if block.words is None
+                else [block.words.texts, block.words.boxes, block.words.confidences]
+            ),
+        ]
+        for block in blocks
+    ]
+    (entry / "blocks.json").write_text(
+        json.dumps(rows, separators=(",", ":")), encoding="utf-8"
+    )
+
+
+def _load_cached_blocks(entry: pathlib.Path, page_number: int) -> list[TextBlock]:
+    """Loads the OCR blocks of a page from an OCR cache entry."""
+    rows = json.loads((entry / "blocks.json").read_text(encoding="utf-8"))
+    return [
+        TextBlock(
+            text=text,
+            bbox=(x1, y1, x2, y2),
+            page_number=page_number,
+            confidence=confidence,
+            words=(
+                None
+                if words is None
+                else Words(words[0], [tuple(box) for box in words[1]], words[2])
+            ),
+        )
+        for text, x1, y1, x2, y2, confidence, words in rows
+    ]
+
+
+def _image_to_data_tiled(
+    engine: OcrEngine,
+    image: PageArray,
+    lang: str,
+    config: str,
+    tiles: int,
+    overlap: int,
+    max_workers: int | None = None,
+) -> OcrData:
+    """
+    Runs OCR on overlapping horizontal bands of an image and merges the output.
+
+    The image is cut at `tiles - 1` evenly spaced rows. Every band is extended
+    by `overlap` pixels on both sides, so words on a cut are fully visible in
+    at least one band, and a word is kept only by the band whose own rows
+    contain its vertical center. Boxes are shifted back to image coordinates
+    and block numbers are offset per band so they stay unique.
+    """
+    height = image.shape[0]
+    tiles = max(1, min(tiles, height // MIN_TILE_HEIGHT))
+    if tiles == 1:
+        return engine.image_to_data(image, lang=lang, config=config)
+
+    cuts = np.linspace(0, height, tiles + 1).round().astype(int).tolist()
+    bands = list(zip(cuts[:-1], cuts[1:]))
+
+    def recognize(band: tuple[int, int]) -> OcrData:
+        top = max(band[0] - overlap, 0)
+        bottom = min(band[1] + overlap, height)
+        data = engine.image_to_data(image[top:bottom], lang=lang, config=config)
+        data["top"] = [int(value) + top for value in data["top"]]
+        return data
+
+    executor = _executor(max_workers or os.cpu_count() or 1)
+    results = list(executor.map(recognize, bands))
+
+    columns = ("left", "top", "width", "height", "conf", "text")
+    merged: OcrData = {name: [] for name in ("block_num", *columns)}
+    block_offset = 0
+    for (start, end), data in zip(bands, results):
+        centers = np.asarray(data["top"], dtype=np.float64) + (
+            np.asarray(data["height"], dtype=np.float64) / 2
+        )
+        owned = np.flatnonzero((centers >= start) & (centers < end)).tolist()
+        block_num = np.asarray(data["block_num"], dtype=np.int64)
+        merged["block_num"].extend((block_num[owned] + block_offset).tolist())
+        for name in columns:
+            merged[name].extend(data[name][i] for i in owned)
+        if len(block_num):
+            block_offset += int(block_num.max()) + 1
+    return merged
+
+
+def extract_text_from_regions(
+    page: PreprocessedPage,
+    regions: Sequence[BaseElement],
+    lang: str = "eng",
+    config: str = "",
+    engine: OcrEngine | None = None,
+    max_workers: int | None = None,
+    padding: int = 4,
+) -> list[TextBlock]:
+    """
+    Runs OCR on the text and table regions of a page only.
+
+    This is the OCR step of the layout-first ordering: layout analysis has
+    already found the regions, so figures and empty margins are never passed
+    to Tesseract. Each region is recognized separately, in a thread pool, with
+    the page segmentation mode of its type (see `REGION_PSM`).
+
+    Args:
+        page: The PreprocessedPage the regions were detected on.
+        regions: The layout regions, in page coordinates.
+        lang: The language for Tesseract to use.
+        config: Additional Tesseract options, appended to the region's PSM.
+        engine: The OCR engine to use. Defaults to `get_engine()`.
+        max_workers: The size of the thread pool the regions are recognized
+            on. Defaults to the number of CPUs.
+        padding: Pixels of context added around each region crop.
+
+    Returns:
+        A list of TextBlock objects, in page coordinates.
+    """
+    engine = engine or get_engine()
+    image = page.ocr_image  # Deskews the page first, if enabled
+    height, width = image.shape[:2]
+    scale = page.scale
+
+    jobs = []
+    for region in regions:
+        psm = REGION_PSM.get(region.element_type)
+        if psm is None:
+            continue
+        x1, y1, x2, y2 = page.deskew(region.bbox)
+        left = max(int(x1 * scale) - padding, 0)
+        top = max(int(y1 * scale) - padding, 0)
+        right = min(math.ceil(x2 * scale) + padding, width)
+        bottom = min(math.ceil(y2 * scale) + padding, height)
+        if right > left and bottom > top:
+            region_config = f"--psm {psm} {config}".strip()
+            jobs.append((image[top:bottom, left:right], region_config, left, top))
+
+    def recognize(job: tuple[PageArray, str, int, int]) -> list[TextBlock]:
+        crop, region_config, left, top = job
+        ocr_data = engine.image_to_data(crop, lang=lang, config=region_config)
+        blocks = _process_ocr_data(ocr_data, page.page_number, scale)
+        # Move the blocks from the crop to the page
+        dx, dy = left / scale, top / scale
+        _map_boxes(
+            blocks,
+            lambda box: page.unskew(
+                (box[0] + dx, box[1] + dy, box[2] + dx, box[3] + dy)
+            ),
+        )
+        return blocks
+
+    if not jobs:
+        return []
+    executor = _executor(max_workers or os.cpu_count() or 1)
+    try:
+        results = list(executor.map(recognize, jobs))
+    except pytesseract.TesseractNotFoundError:
+        print("Tesseract is not installed or not in your PATH.")
+        return []
+
+    return [block for blocks in results for block in blocks]
+
+
+def refine_low_confidence_blocks(
+    page: PreprocessedPage,
+    blocks: list[TextBlock],
+    threshold: float = 60.0,
+    dpi: int = 400,
+    lang: str = "eng",
+    config: str = "--psm 6",
+    engine: OcrEngine | None = None,
+    max_workers: int | None = None,
+    padding: float = 2.0,
+) -> list[TextBlock]:
+    """
+    Re-OCRs low-confidence blocks from a higher-resolution render.
+
+    Only the blocks whose confidence is below `threshold` are re-rendered, as
+    PyMuPDF clip rectangles of the source PDF at `dpi`, so pages can be OCR'd
+    at a cheaper resolution and only pay for high resolution where it helps.
+    A block is replaced when the new result has a higher confidence. Blocks
+    without a confidence (e.g., from the text layer) are left as they are.
+
+    Args:
+        page: The PreprocessedPage the blocks were found on.
+        blocks: The OCR blocks of the page, in page coordinates.
+        threshold: The confidence (0-100) below which a block is re-OCR'd.
+        dpi: The resolution to re-render low-confidence blocks at.
+        lang: The language for Tesseract to use.
+        config: Tesseract options for the block crops.
+        engine: The OCR engine to use. Defaults to `get_engine()`.
+        max_workers: The size of the thread pool the blocks are recognized
+            on. Defaults to the number of CPUs.
+        padding: Coordinate pixels of context added around each block.
+
+    Returns:
+        The blocks, with improved low-confidence blocks replaced.
+    """
+    low_confidence = [
+        index
+        for index, block in enumerate(blocks)
+        if block.confidence is not None and block.confidence < threshold
+    ]
+    if not low_confidence or page.source_path is None:
+        return blocks
+    engine = engine or get_engine()
+
+    # PyMuPDF is not thread-safe, so regions are rendered here and only the
+    # OCR runs in the thread pool.
+    jobs = []
+    for index in low_confidence:
+        x1, y1, x2, y2 = blocks[index].bbox
+        region = (
+            max(x1 - padding, 0),
+            max(y1 - padding, 0),
+            x2 + padding,
+            y2 + padding,
+        )
+        jobs.append((index, region, page.render_for_ocr(region, dpi)))
+
+    zoom = dpi / page.dpi
+
+    def recognize(
+        job: tuple[int, BoundingBox, PageArray],
+    ) -> tuple[int, TextBlock | None]:
+        index, region, image = job
+        ocr_data = engine.image_to_data(image, lang=lang, config=config)
+        found = _process_ocr_data(ocr_data, page.page_number, zoom)
+        if not found:
+            return index, None
+        # Move the words from the (deskewed) region render to the page
+        _map_boxes(found, lambda box: page.unskew_region(box, region))
+        confidences = [block.confidence or 0.0 for block in found]
+        return index, TextBlock(
+            text=" ".join(block.text for block in found),
+            bbox=blocks[index].bbox,
+            page_number=page.page_number,
+            confidence=sum(confidences) / len(confidences),
+            words=Words.concat(block.words for block in found if block.words),
+        )
+
+    executor = _executor(max_workers or os.cpu_count() or 1)
+    try:
+        results = list(executor.map(recognize, jobs))
+    except pytesseract.TesseractNotFoundError:
+        print("Tesseract is not installed or not in your PATH.")
+        return blocks
+
+    refined = list(blocks)
+    for index, candidate in results:
+        original = blocks[index].confidence or 0.0
+        if candidate is not None and (candidate.confidence or 0.0) > original:
+            refined[index] = candidate
+    return refined
 
 
 def _process_ocr_data(
-    ocr_data: dict[str, list[str | int]], page_number: int
+    ocr_data: OcrData, page_number: int, scale: float = 1.0
 ) -> list[TextBlock]:
     """
     Processes the raw dictionary output from Tesseract into TextBlock objects.
 
-    Groups words into blocks based on their 'block_num'.
-    """
-    blocks: defaultdict[int, OcrBlock] = defaultdict(
-        lambda: {
-            "text": [],
-            "conf": [],
-            "left": [],
-            "top": [],
-            "width": [],
-            "height": [],
-        }
-    )
+    Groups words into blocks based on their 'block_num', keeping the words
+    of each block as its `words` columns. The Tesseract columns
+    are converted to NumPy arrays once, so filtering, grouping and the
+    per-block reductions run in bulk rather than per token. Bounding boxes are
+    divided by `scale` to map image pixels back to page coordinates.
+    """
+    texts = np.asarray(ocr_data["text"], dtype=str)
+    conf = np.asarray(ocr_data["conf"], dtype=np.float64)
 
-    # Group data by block number
-    num_items = len(ocr_data["level"])
-    for i in range(num_items):
-        # Skip items with no text or very low confidence (often noise)
-        if not str(ocr_data["text"][i]).strip() or int(str(ocr_data["conf"][i])) < 0:
-            continue
+    # Skip items with no text or very low confidence (often noise)
+    keep = (np.char.str_len(np.char.strip(texts)) > 0) & (conf >= 0)
+    if not keep.any():
+        return []
+
+    def column(name: str) -> np.ndarray:
+        return np.asarray(ocr_data[name], dtype=np.int64)[keep]
+
+    block_num = column("block_num")
+    left, top = column("left"), column("top")
+    right, bottom = left + column("width"), top + column("height")
+    texts, conf = texts[keep], conf[keep]
+
+    # Group data by block number: a stable sort keeps the words of each block
+    # in Tesseract's reading order, and blocks are emitted in the order they
+    # first appear.
+    blocks, first_index, group = np.unique(
+        block_num, return_index=True, return_inverse=True
+    )
+    order = np.argsort(group, kind="stable")
+    counts = np.bincount(group, minlength=len(blocks))
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
 
-        block_num = int(str(ocr_data["block_num"][i]))
-        blocks[block_num]["text"].append(str(ocr_data["text"][i]))
-        blocks[block_num]["conf"].append(int(str(ocr_data["conf"][i])))
-        blocks[block_num]["left"].append(int(str(ocr_data["left"][i])))
-        blocks[block_num]["top"].append(int(str(ocr_data["top"][i])))
-        blocks[block_num]["width"].append(int(str(ocr_data["width"][i])))
-        blocks[block_num]["height"].append(int(str(ocr_data["height"][i])))
+    # Calculate bounding boxes and average confidences for all blocks at once
+    min_left = np.minimum.reduceat(left[order], starts) / scale
+    min_top = np.minimum.reduceat(top[order], starts) / scale
+    max_right = np.maximum.reduceat(right[order], starts) / scale
+    max_bottom = np.maximum.reduceat(bottom[order], starts) / scale
+    avg_conf = np.add.reduceat(conf[order], starts) / counts
+    words = texts[order].tolist()
+    word_boxes = list(
+        map(
+            tuple,
+            (
+                np.stack((left[order], top[order], right[order], bottom[order]), axis=1)
+                / scale
+            ).tolist(),
+        )
+    )
+    word_conf = conf[order].tolist()
 
-    # Create TextBlock objects from the grouped data
+    # Create TextBlock objects from the grouped data, keeping their words
     text_blocks = []
-    for block_num, data in blocks.items():
-        if not data["text"]:
-            continue
+    for i in np.argsort(first_index, kind="stable").tolist():
+        start, end = int(starts[i]), int(starts[i] + counts[i])
+        bbox: BoundingBox = (
+            float(min_left[i]),
+            float(min_top[i]),
+            float(max_right[i]),
+            float(max_bottom[i]),
+        )
+        text_blocks.append(
+            TextBlock(
+                text=" ".join(words[start:end]),
+                bbox=bbox,
+                page_number=page_number,
+                confidence=float(avg_conf[i]),
+                words=Words(
+                    words[start:end], word_boxes[start:end], word_conf[start:end]
+                ),
+            )
+        )
+
+    return text_blocks
 
-        # Calculate bounding box for the entire block
-        min_left = min(data["left"])
-        min_top = min(data["top"])
-        max_right = max(left + w for left, w in zip(data["left"], data["width"]))
-        max_bottom = max(t + h for t, h in zip(data["top"], data["height"]))
-        bbox: BoundingBox = (min_left, min_top, max_right, max_bottom)
 
-        # Calculate average confidence
-        avg_conf = sum(data["conf"]) / len(data["conf"]) if data["conf"] else 0.0
+def _process_text_layer(
+    words: list[TextLayerWord], page_number: int
+) -> list[TextBlock]:
+    """
+    Groups the words of a PDF text layer into TextBlock objects.
 
+    Words are grouped by their PyMuPDF block number, mirroring how Tesseract
+    output is grouped by 'block_num', and kept as the `words` of their block.
+    Native text has no OCR confidence.
+    """
+    blocks: defaultdict[int, list[TextLayerWord]] = defaultdict(list)
+    for word in words:
+        if word[4].strip():
+            blocks[word[5]].append(word)
+
+    text_blocks = []
+    for block_words in blocks.values():
+        # Words are reported in reading order within a block
+        block_words.sort(key=lambda w: (w[6], w[7]))
+        bbox: BoundingBox = (
+            min(w[0] for w in block_words),
+            min(w[1] for w in block_words),
+            max(w[2] for w in block_words),
+            max(w[3] for w in block_words),
+        )
         text_blocks.append(
             TextBlock(
-                text=" ".join(data["text"]),
+                text=" ".join(w[4] for w in block_words),
                 bbox=bbox,
                 page_number=page_number,
-                confidence=avg_conf,
+                confidence=None,
+                words=Words(
+                    [w[4] for w in block_words],
+                    [w[:4] for w in block_words],
+                    [None] * len(block_words),
+                ),
             )
         )
 
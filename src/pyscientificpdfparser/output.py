@@ -4,7 +4,8 @@ Generates the final output files from the structured document model.
 
 Responsibilities:
 - Convert the Document object into a GitHub Flavored Markdown file.
-- Generate GFM tables for structured table data.
+- Generate GFM tables for structured table data, with header rows and
+  spanning cells.
 - Save extracted figures to an assets directory and link them in the Markdown.
 - Provide a structured JSON output of the Document model.
 """
@@ -12,6 +13,7 @@ from __future__ import annotations
 
 import pathlib
 
+import numpy as np
 from PIL import Image
 from py_markdown_table.markdown_table import markdown_table
 
@@ -22,11 +24,15 @@ from .sectioning import is_section_header
 def write_outputs(
     document: Document,
     output_dir: pathlib.Path,
-    page_images: list[Image.Image],
+    page_images: list[Image.Image] | None = None,
     filename: str | None = None,
 ) -> None:
     """
     Writes all output files (JSON, Markdown, assets) to the specified directory.
+
+    Figures that were already exported while their page was being processed
+    (see `save_figure_image`) are linked as-is; `page_images` is only needed
+    for figures without an `image_path`.
     """
     output_dir.mkdir(parents=True, exist_ok=True)
 
@@ -50,8 +56,37 @@ def write_outputs(
         f.write(md_content)
 
 
+def save_figure_image(
+    figure: Figure,
+    figure_image: Image.Image | np.ndarray,
+    assets_dir: pathlib.Path,
+    index: int,
+) -> None:
+    """
+    Saves the image of a figure and records its `image_path`.
+
+    Args:
+        figure: The Figure element to export.
+        figure_image: The image of the figure, cropped from its page, as a
+            PIL Image or an array.
+        assets_dir: The directory where figure images are saved.
+        index: An index that makes the file name unique within the page.
+    """
+    assets_dir.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(figure_image, np.ndarray):
+        figure_image = Image.fromarray(figure_image)
+
+    # Save the figure image
+    figure_filename = f"figure_{figure.page_number}_{index}.png"
+    figure_image.save(assets_dir / figure_filename)
+    figure.image_path = f"{assets_dir.name}/{figure_filename}"
+
+
 def _generate_markdown(
-    document: Document, assets_dir: pathlib.Path, page_images: list[Image.Image]
+    document: Document,
+    assets_dir: pathlib.Path,
+    page_images: list[Image.Image] | None,
 ) -> str:
     """Generates the full Markdown string from a Document object."""
     md_lines = []
@@ -71,32 +106,81 @@ def _generate_markdown(
                 md_lines.append(element.text + "\n")
 
             elif isinstance(element, Table):
-                # Placeholder logic creates a simple 1x1 table
                 if element.rows and element.rows[0]:
-                    cell_text = element.rows[0][0].text.replace("\n", " ")
-                    table_data = [{"Content": cell_text}]
-                    md_table = markdown_table(table_data).get_markdown()
+                    md_table = markdown_table(_table_data(element)).get_markdown()
                     md_lines.append(md_table + "\n")
 
             elif isinstance(element, Figure):
-                # Crop the figure from the original page image
-                page_img = page_images[element.page_number - 1]
-                # The bounding box needs to be a tuple of integers for cropping
-                bbox_int: tuple[int, int, int, int] = (
-                    int(element.bbox[0]),
-                    int(element.bbox[1]),
-                    int(element.bbox[2]),
-                    int(element.bbox[3]),
-                )
-                figure_img = page_img.crop(bbox_int)
-
-                # Save the figure image
-                figure_filename = f"figure_{element.page_number}_{i}.png"
-                figure_path = assets_dir / figure_filename
-                figure_img.save(figure_path)
+                if not element.image_path:
+                    if page_images is None:
+                        continue
+                    # Crop the figure from the original page image
+                    page_img = page_images[element.page_number - 1]
+                    # The bounding box needs to be a tuple of integers for cropping
+                    bbox_int: tuple[int, int, int, int] = (
+                        int(element.bbox[0]),
+                        int(element.bbox[1]),
+                        int(element.bbox[2]),
+                        int(element.bbox[3]),
+                    )
+                    figure_img = page_img.crop(bbox_int)
+                    save_figure_image(element, figure_img, assets_dir, i)
 
                 # Add the markdown link
                 caption = element.caption or f"Figure {i+1}"
-                md_lines.append(f"![{caption}](assets/{figure_filename})\n")
+                md_lines.append(f"![{caption}]({element.image_path})\n")
 
     return "\n".join(md_lines)
+
+
+def _table_grid(table: Table) -> list[list[str]]:
+    """
+    Lays the cells of a table out on a rectangular grid of texts.
+
+    A spanning cell's text goes to its top-left slot; the other slots it
+    covers are left empty.
+    """
+    n_columns = sum(cell.col_span for cell in table.rows[0])
+    grid: list[list[str | None]] = [[None] * n_columns for _ in table.rows]
+    for i, row in enumerate(table.rows):
+        j = 0
+        for cell in row:
+            # Skip the slots taken by spanning cells of the rows above
+            while j < n_columns and grid[i][j] is not None:
+                j += 1
+            if j >= n_columns:
+                break
+            for k in range(i, min(i + cell.row_span, len(grid))):
+                for m in range(j, min(j + cell.col_span, n_columns)):
+                    grid[k][m] = ""
+            grid[i][j] = cell.text.replace("\n", " ")
+            j += cell.col_span
+    return [[text or "" for text in row] for row in grid]
+
+
+def _table_data(table: Table) -> list[dict[str, str]]:
+    """
+    Converts a table to the rows of `markdown_table`, keyed by column name.
+
+    The leading header rows name the columns. Tables without header rows get
+    generic names ("Content" for a single column).
+    """
+    grid = _table_grid(table)
+    n_headers = 0
+    while n_headers < len(grid) - 1 and all(
+        cell.is_header for cell in table.rows[n_headers]
+    ):
+        n_headers += 1
+
+    names: list[str] = []
+    for j in range(len(grid[0])):
+        name = " ".join(row[j] for row in grid[:n_headers] if row[j])
+        if not name:
+            name = "Content" if len(grid[0]) == 1 else f"Column {j + 1}"
+        # Column names are dict keys, so repeated names are made unique
+        unique, count = name, 1
+        while unique in names:
+            count += 1
+            unique = f"{name} ({count})"
+        names.append(unique)
+    return [dict(zip(names, row)) for row in grid[n_headers:]]
@@ -6,109 +6,907 @@ Responsibilities:
 - Accept various input types (single file, directory).
 - Render PDF pages to images for OCR and DLA.
 - Perform image enhancement (deskewing, denoising) to improve OCR quality.
+- Cache rendered pages on disk so repeated runs skip rasterization.
 """
 from __future__ import annotations
 
+import ctypes
+import json
+import multiprocessing
 import pathlib
+from collections import deque
+from collections.abc import Callable, Generator, Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, TypeAlias
 
 import cv2
 import fitz  # PyMuPDF
 import numpy as np
 from PIL import Image
-from pydantic import BaseModel, ConfigDict
+from pydantic import BaseModel, ConfigDict, PrivateAttr, field_validator
+
+from .cache import DiskCache, file_sha256
+from .models import BoundingBox
+
+# A word from the PDF text layer: (x0, y0, x1, y1, text, block_no, line_no,
+# word_no), with coordinates in the pixel space of the rendered page image.
+TextLayerWord: TypeAlias = tuple[float, float, float, float, str, int, int, int]
+
+# Page images are 2D uint8 grayscale arrays of shape (height, width).
+PageArray: TypeAlias = np.ndarray
+
+# Part of the render cache key. Bump it whenever a change to rendering or
+# preprocessing alters the pages produced, so stale entries are not reused.
+PREPROCESSING_VERSION = 2
 
 
 class PreprocessedPage(BaseModel):
     """
     Holds the preprocessed data for a single page.
+
+    The page keeps a single base buffer, `image`: the grayscale render of the
+    page. The forms wanted by the different stages (binarized for OCR, a
+    downscaled copy for layout analysis, RGB for the vision models, region
+    crops) are derived from it lazily, at most once, and memoized until they
+    are released with `release`.
     """
 
     page_number: int
-    image: Image.Image
+    image: PageArray
     is_scanned: bool
+    text_layer: list[TextLayerWord] | None = None
+    # Bounding boxes produced by every stage are pixel coordinates at `dpi`.
+    # `scale` is the ratio of `image` pixels to coordinate pixels; it is below
+    # one when a digital page is only rendered at the layout resolution.
+    dpi: int = 300
+    scale: float = 1.0
+    # Resolution of the image used for layout analysis, if lower than `dpi`.
+    layout_dpi: int | None = None
+    source_path: pathlib.Path | None = None
+    # Whether scanned pages are deskewed and denoised before binarization, and
+    # the skew angle (in degrees) that was corrected, once it is estimated.
+    enhance: bool = False
+    skew_angle: float = 0.0
 
     model_config = ConfigDict(arbitrary_types_allowed=True)
 
+    _views: dict[Any, PageArray] = PrivateAttr(default_factory=dict)
+
+    @field_validator("image", mode="before")
+    @classmethod
+    def _image_to_array(cls, value: Any) -> Any:
+        """Accepts Pillow images for convenience, storing them as arrays."""
+        if isinstance(value, Image.Image):
+            return np.asarray(value.convert("L"))
+        return value
+
+    @property
+    def page_size(self) -> tuple[int, int]:
+        """The (width, height) of the page in coordinate pixels."""
+        height, width = self.image.shape[:2]
+        return (round(width / self.scale), round(height / self.scale))
+
+    @property
+    def layout_scale(self) -> float:
+        """The ratio of `layout_image` pixels to coordinate pixels."""
+        if self.layout_dpi is None:
+            return self.scale
+        return min(self.scale, self.layout_dpi / self.dpi)
+
+    @property
+    def gray(self) -> PageArray:
+        """The grayscale base buffer of the page."""
+        return self.image
+
+    @property
+    def binarized(self) -> PageArray:
+        """The page enhanced and binarized for OCR."""
+
+        def compute() -> PageArray:
+            if self.enhance:
+                self.skew_angle = estimate_skew(self.image)
+            return _preprocess_image(
+                self.image, denoise=self.enhance, skew_angle=self.skew_angle
+            )
+
+        return self._view("binarized", compute)
+
+    @property
+    def ocr_image(self) -> PageArray:
+        """The image OCR should read: binarized for scanned pages."""
+        return self.binarized if self.is_scanned else self.image
+
+    @property
+    def layout_image(self) -> PageArray:
+        """The grayscale page at the layout analysis resolution."""
+        factor = self.layout_scale / self.scale
+        if factor >= 1.0:
+            return self.image
+        return self._view("layout", lambda: _resize(self.image, factor))
+
+    @property
+    def rgb(self) -> PageArray:
+        """The layout image as RGB, the form the vision models expect."""
+        return self._view("rgb", lambda: to_rgb_array(self.layout_image))
+
+    def model_image(self, size: tuple[int, int] | None = None) -> PageArray:
+        """
+        Returns the RGB page image resized for a model's fixed input size.
+
+        Resizing the grayscale buffer before the RGB conversion is much
+        cheaper than letting the model processor resize a full-page RGB image.
+
+        Args:
+            size: The (width, height) the model expects, or None for `rgb`.
+
+        Returns:
+            An RGB array.
+        """
+        if size is None:
+            return self.rgb
+
+        def compute() -> PageArray:
+            resized = cv2.resize(self.layout_image, size, interpolation=cv2.INTER_AREA)
+            return to_rgb_array(resized)
+
+        return self._view(("model", size), compute)
+
+    def crop(self, bbox: BoundingBox) -> PageArray:
+        """
+        Returns a region of the page at full coordinate resolution.
+
+        When the page image is a low-resolution render, the region is
+        re-rendered from the source PDF with a clip rectangle instead of
+        being upscaled from the page image.
+
+        Args:
+            bbox: The region to crop, in coordinate pixels.
+
+        Returns:
+            A grayscale array of the region. At full resolution this is a view
+            into the page image, not a copy.
+        """
+        if self.scale == 1.0:
+            return _crop_array(self.image, bbox)
+        x1, y1, x2, y2 = box = self.crop_box(bbox)
+        if x2 == x1 or y2 == y1:
+            # Nothing of the box is on the page
+            return np.zeros((y2 - y1, x2 - x1), dtype=self.image.dtype)
+        if self.source_path is not None:
+            source_path = self.source_path
+            return self._view(
+                ("crop", box),
+                lambda: render_region(source_path, self.page_number, box, self.dpi),
+            )
+
+        # No source to re-render from: upscale the low-resolution crop.
+        s = self.scale
+        region = _crop_array(self.image, (x1 * s, y1 * s, x2 * s, y2 * s))
+        if region.size == 0:
+            return region
+        return cv2.resize(region, (max(x2 - x1, 1), max(y2 - y1, 1)))
+
+    def crop_box(self, bbox: BoundingBox) -> tuple[int, int, int, int]:
+        """
+        Returns the region of the page that `crop` returns for a bounding box.
+
+        Crops are clamped to the page and cover whole pixels, so the region
+        can be smaller than the bounding box, and start elsewhere.
+
+        Args:
+            bbox: The region to crop, in coordinate pixels.
+
+        Returns:
+            The (x1, y1, x2, y2) of the crop, in coordinate pixels.
+        """
+        return _clamp_box(bbox, *self.page_size)
+
+    def render_for_ocr(self, bbox: BoundingBox, dpi: int) -> PageArray:
+        """
+        Re-renders a region of the page from the PDF at a higher resolution.
+
+        The region is prepared like the page's OCR image: scanned pages are
+        binarized, and deskewed by the page's skew angle and denoised if
+        enhancement is enabled. A deskewed region is rotated about its own
+        center; `unskew_region` maps boxes found on it back to the page.
+        Call it after the page's OCR image was computed, which estimates the
+        skew angle.
+
+        Args:
+            bbox: The region to render, in coordinate pixels.
+            dpi: The resolution to render the region at.
+
+        Returns:
+            An image of the region, with `dpi / self.dpi` pixels per
+            coordinate pixel.
+
+        Raises:
+            ValueError: If the page has no source PDF to render from.
+        """
+        if self.source_path is None:
+            raise ValueError("The page has no source PDF to re-render from.")
+        zoom = dpi / self.dpi
+        region = render_region(
+            self.source_path,
+            self.page_number,
+            (bbox[0] * zoom, bbox[1] * zoom, bbox[2] * zoom, bbox[3] * zoom),
+            dpi,
+        )
+        if not self.is_scanned:
+            return region
+        return _preprocess_image(
+            region, denoise=self.enhance, skew_angle=self.skew_angle
+        )
+
+    def unskew(self, bbox: BoundingBox) -> BoundingBox:
+        """
+        Maps a box found on the deskewed binarized view back to the page.
+
+        Args:
+            bbox: A box in the coordinates of the deskewed page.
+
+        Returns:
+            The axis-aligned box enclosing the region on the original page.
+        """
+        return self._rotate_box(bbox, -self.skew_angle)
+
+    def deskew(self, bbox: BoundingBox) -> BoundingBox:
+        """
+        Maps a box on the page onto the deskewed binarized view.
+
+        Args:
+            bbox: A box in page coordinates.
+
+        Returns:
+            The axis-aligned box enclosing the region on the deskewed page.
+        """
+        return self._rotate_box(bbox, self.skew_angle)
+
+    def unskew_region(self, bbox: BoundingBox, region: BoundingBox) -> BoundingBox:
+        """
+        Maps a box found on a `render_for_ocr` image back to the page.
+
+        Args:
+            bbox: A box in coordinate pixels relative to the top left corner
+                of the region, as deskewed by `render_for_ocr`.
+            region: The region that was rendered, in page coordinates.
+
+        Returns:
+            The axis-aligned box enclosing the region on the original page.
+        """
+        left, top, right, bottom = region
+        center = ((right - left) / 2, (bottom - top) / 2)
+        x1, y1, x2, y2 = _rotate_box(bbox, -self.skew_angle, center)
+        return (x1 + left, y1 + top, x2 + left, y2 + top)
+
+    def _rotate_box(self, bbox: BoundingBox, angle: float) -> BoundingBox:
+        """Rotates a box about the page center, returning its bounding box."""
+        width, height = self.page_size
+        return _rotate_box(bbox, angle, (width / 2, height / 2))
+
+    def release(self, *views: str) -> None:
+        """
+        Releases memoized views once the stages that need them are done.
+
+        Args:
+            views: The names of the views to release ("binarized", "layout",
+                "rgb", "model", "crop"). Releases every view if none are given.
+        """
+        for key in list(self._views):
+            name = key[0] if isinstance(key, tuple) else key
+            if not views or name in views:
+                del self._views[key]
+
+    def _view(self, key: Any, compute: Callable[[], PageArray]) -> PageArray:
+        """Returns a memoized view, computing it on first use."""
+        view = self._views.get(key)
+        if view is None:
+            view = self._views[key] = compute()
+        return view
 
-def _preprocess_image(image: Image.Image) -> Image.Image:
+
+def _resize(image: PageArray, factor: float) -> PageArray:
+    """Downscales an image by a factor, averaging pixel areas."""
+    height, width = image.shape[:2]
+    size = (max(round(width * factor), 1), max(round(height * factor), 1))
+    return cv2.resize(image, size, interpolation=cv2.INTER_AREA)
+
+
+def crop_origin(bbox: BoundingBox) -> tuple[int, int]:
+    """
+    Returns the position of the top left pixel of a crop of a bounding box.
+
+    Crops start at whole pixels and are clamped to the page, so a crop of a
+    box that sticks out of the page starts at the page edge, not at the box.
+
+    Args:
+        bbox: The cropped region.
+
+    Returns:
+        The (x, y) of the crop's top left corner.
+    """
+    return max(int(bbox[0]), 0), max(int(bbox[1]), 0)
+
+
+def _clamp_box(bbox: BoundingBox, width: int, height: int) -> tuple[int, int, int, int]:
+    """Clamps a bounding box to whole pixels of a width x height image."""
+    x1, y1 = crop_origin(bbox)
+    x2, y2 = min(int(bbox[2]), width), min(int(bbox[3]), height)
+    return x1, y1, max(x2, x1), max(y2, y1)
+
+
+def _crop_array(image: PageArray, bbox: BoundingBox) -> PageArray:
+    """Crops an image array to a bounding box, clamped to the image bounds."""
+    height, width = image.shape[:2]
+    x1, y1, x2, y2 = _clamp_box(bbox, width, height)
+    return image[y1:y2, x1:x2]
+
+
+def to_rgb_array(image: Image.Image | np.ndarray) -> np.ndarray:
+    """
+    Converts a page image or crop to an RGB array for the vision models.
+
+    Args:
+        image: A Pillow Image, or a grayscale or RGB array.
+
+    Returns:
+        An array of shape (height, width, 3).
+    """
+    if isinstance(image, Image.Image):
+        return np.asarray(image.convert("RGB"), dtype=np.uint8)
+    if image.ndim == 2:
+        return cv2.cvtColor(image, cv2.COLOR_GRAY2RGB)
+    return image
+
+
+def _pixmap_to_array(pix: fitz.Pixmap) -> PageArray:
+    """
+    Wraps the samples of a grayscale pixmap as a NumPy array without copying.
+
+    The returned array (and every view derived from it) keeps the pixmap
+    alive, since the pixel memory belongs to MuPDF.
+    """
+    buffer = (ctypes.c_ubyte * (pix.stride * pix.height)).from_address(pix.samples_ptr)
+    buffer._pixmap = pix
+    rows = np.frombuffer(buffer, dtype=np.uint8).reshape(pix.height, pix.stride)
+    return rows[:, : pix.width * pix.n]
+
+
+def _dpi_matrix(dpi: int) -> fitz.Matrix:
+    """Returns the PyMuPDF matrix that renders a page at the given DPI."""
+    zoom = dpi / 72  # PyMuPDF uses 72 DPI as the base
+    return fitz.Matrix(zoom, zoom)
+
+
+def estimate_skew(
+    gray: PageArray,
+    max_angle: float = 5.0,
+    sample_size: int = 1024,
+    max_points: int = 20_000,
+) -> float:
+    """
+    Estimates the skew of a scanned page from horizontal projection profiles.
+
+    The page is downsampled and its ink pixels are projected onto the rows of
+    the page rotated by every candidate angle at once; text lines are
+    horizontal where the projection profile is sharpest. A coarse search is
+    refined around its best angle.
+
+    Args:
+        gray: A grayscale page image array.
+        max_angle: The largest skew, in degrees, that is searched for.
+        sample_size: The size of the longest side of the downsampled copy.
+        max_points: The maximum number of ink pixels that are projected.
+
+    Returns:
+        The angle in degrees to rotate the page by (counter-clockwise, as in
+        `cv2.getRotationMatrix2D`) to straighten it, or 0.0 for blank pages.
+    """
+    # Only the position of ink matters here, so cheap bilinear sampling is
+    # good enough for the downsampled copy.
+    factor = sample_size / max(gray.shape[:2])
+    small = gray
+    if factor < 1.0:
+        size = (round(gray.shape[1] * factor), round(gray.shape[0] * factor))
+        small = cv2.resize(gray, size, interpolation=cv2.INTER_LINEAR)
+    _, ink = cv2.threshold(small, 0, 255, cv2.THRESH_BINARY_INV | cv2.THRESH_OTSU)
+    ys, xs = np.nonzero(ink)
+    if len(ys) < 100:
+        return 0.0
+    stride = max(1, len(ys) // max_points)
+    xs = xs[::stride].astype(np.float32)
+    ys = ys[::stride].astype(np.float32)
+
+    def best_angle(angles: np.ndarray) -> float:
+        radians = np.deg2rad(angles).astype(np.float32)[:, None]
+        # Row of every point on the page rotated by every candidate angle.
+        rows = np.rint(ys * np.cos(radians) - xs * np.sin(radians)).astype(np.intp)
+        rows -= rows.min()
+        height = int(rows.max()) + 1
+        rows += np.arange(len(angles))[:, None] * height
+        profiles = np.bincount(rows.ravel(), minlength=len(angles) * height)
+        profiles = profiles.reshape(len(angles), height).astype(np.float64)
+        return float(angles[np.argmax((profiles**2).sum(axis=1))])
+
+    coarse = best_angle(np.linspace(-max_angle, max_angle, round(max_angle * 8) + 1))
+    return round(best_angle(np.linspace(coarse - 0.25, coarse + 0.25, 21)), 3)
+
+
+def _rotate_box(
+    bbox: BoundingBox, angle: float, center: tuple[float, float]
+) -> BoundingBox:
+    """Rotates a box about a point, returning its axis-aligned bounding box."""
+    if not angle:
+        return bbox
+    matrix = cv2.getRotationMatrix2D(center, angle, 1)
+    x1, y1, x2, y2 = bbox
+    corners = np.array([[x1, y1, 1], [x2, y1, 1], [x1, y2, 1], [x2, y2, 1]])
+    xs, ys = (corners @ matrix.T).T
+    return (float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max()))
+
+
+def _preprocess_image(
+    gray: PageArray, denoise: bool = False, skew_angle: float = 0.0
+) -> PageArray:
     """
     Applies preprocessing steps to an image to enhance it for OCR.
 
     Args:
-        image: A Pillow Image object.
+        gray: A grayscale page image array.
+        denoise: Whether to remove speckle noise from the binarized image.
+        skew_angle: The angle in degrees to rotate the image by before
+            binarization, as estimated by `estimate_skew`.
 
     Returns:
-        A preprocessed Pillow Image object.
+        A new, binarized image array. The input is left untouched.
     """
-    # Convert Pillow Image to OpenCV format (numpy array)
-    cv_image = np.array(image.convert("RGB"))
-    cv_image = cv_image[:, :, ::-1].copy()  # Convert RGB to BGR
+    # 1. Pages are rendered straight to grayscale, so no color conversion is
+    # needed before binarization.
 
-    # 1. Convert to grayscale
-    gray = cv2.cvtColor(cv_image, cv2.COLOR_BGR2GRAY)
+    # 2. Deskewing: rotate once, at full resolution, before binarization so
+    # that the interpolation works on grayscale values.
+    if abs(skew_angle) >= 0.05:
+        height, width = gray.shape[:2]
+        matrix = cv2.getRotationMatrix2D((width / 2, height / 2), skew_angle, 1)
+        gray = cv2.warpAffine(
+            gray,
+            matrix,
+            (width, height),
+            flags=cv2.INTER_LINEAR,
+            borderMode=cv2.BORDER_CONSTANT,
+            borderValue=255,
+        )
 
-    # 2. Apply adaptive thresholding for binarization
+    # 3. Apply adaptive thresholding for binarization
     # This is often better than a simple global threshold for varying lighting
     binary = cv2.adaptiveThreshold(
         gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY, 11, 2
     )
 
-    # (Optional placeholder for future enhancements)
-    # 3. Denoising
-    # denoised = cv2.medianBlur(binary, 3)
+    # 4. Denoising
+    if denoise:
+        binary = cv2.medianBlur(binary, 3)
+
+    return binary
 
-    # (Optional placeholder for future enhancements)
-    # 4. Deskewing
-    # deskewed = deskew(denoised)
 
-    # Convert back to Pillow Image from the processed OpenCV image
-    return Image.fromarray(binary)
+def _extract_text_layer(page: fitz.Page, mat: fitz.Matrix) -> list[TextLayerWord]:
+    """
+    Extracts the words of a page's text layer in rendered image coordinates.
 
+    Args:
+        page: The PyMuPDF page to extract words from.
+        mat: The transformation matrix used to render the page.
 
-def render_pdf_to_images(
-    pdf_path: pathlib.Path, dpi: int = 300
+    Returns:
+        A list of words, empty if the page has no extractable text.
+    """
+    # Words are reported on the unrotated page, while the pixmap is rendered
+    # with the page rotation applied.
+    transform = page.rotation_matrix * mat
+    words: list[TextLayerWord] = []
+    for x0, y0, x1, y1, text, block_no, line_no, word_no in page.get_text("words"):
+        rect = fitz.Rect(x0, y0, x1, y1) * transform
+        words.append(
+            (rect.x0, rect.y0, rect.x1, rect.y1, text, block_no, line_no, word_no)
+        )
+    return words
+
+
+def _render_page(
+    page: fitz.Page,
+    page_number: int,
+    dpi: int,
+    layout_dpi: int | None = None,
+    source_path: pathlib.Path | None = None,
+    enhance: bool = False,
+) -> PreprocessedPage:
+    """
+    Renders and preprocesses a single PDF page.
+
+    Args:
+        page: The PyMuPDF page to render.
+        page_number: The 1-based page number.
+        dpi: The resolution of the page coordinate space, also used for OCR.
+        layout_dpi: An optional lower resolution for the page image used by
+            layout analysis. Scanned pages are still rendered at `dpi` for OCR.
+        source_path: The path of the PDF, used to re-render regions later.
+        enhance: Whether scanned pages are deskewed and denoised for OCR.
+
+    Returns:
+        A PreprocessedPage object.
+    """
+    mat = _dpi_matrix(dpi)
+
+    # R1.2: Detect if a page is image-based (scanned)
+    # Heuristic: if a page has no extractable text, it's likely scanned.
+    text_layer = _extract_text_layer(page, mat)
+    is_scanned = not text_layer
+
+    if layout_dpi is not None and layout_dpi >= dpi:
+        layout_dpi = None
+
+    # Render page straight to a grayscale pixmap and wrap its memory; this is
+    # the page's base buffer. Scanned pages are rendered at full resolution
+    # for OCR, while digital pages only need the layout resolution: their text
+    # comes from the text layer. R1.3: the preprocessing of scanned pages for
+    # OCR is derived lazily from the base buffer (see PreprocessedPage).
+    render_dpi = dpi if is_scanned or layout_dpi is None else layout_dpi
+    pix = page.get_pixmap(matrix=_dpi_matrix(render_dpi), colorspace=fitz.csGRAY)
+
+    return PreprocessedPage(
+        page_number=page_number,
+        image=_pixmap_to_array(pix),
+        is_scanned=is_scanned,
+        text_layer=None if is_scanned else text_layer,
+        dpi=dpi,
+        scale=render_dpi / dpi,
+        layout_dpi=layout_dpi,
+        source_path=source_path,
+        enhance=enhance,
+    )
+
+
+def render_region(
+    pdf_path: pathlib.Path, page_number: int, bbox: BoundingBox, dpi: int = 300
+) -> PageArray:
+    """
+    Renders a single region of a page using a PyMuPDF clip rectangle.
+
+    Only the clipped area is rasterized, which makes high-resolution crops of
+    tables and figures cheap compared to rendering the whole page.
+
+    Args:
+        pdf_path: The path to the PDF file.
+        page_number: The 1-based page number.
+        bbox: The region to render, in pixel coordinates at `dpi`.
+        dpi: The resolution to render the region at.
+
+    Returns:
+        A grayscale array of the region.
+    """
+    zoom = dpi / 72
+    # Clip rectangles are given in (rotated) page coordinates, i.e. points.
+    clip = fitz.Rect(*bbox) / zoom
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_number - 1].get_pixmap(
+            matrix=_dpi_matrix(dpi), clip=clip, colorspace=fitz.csGRAY
+        )
+    return _pixmap_to_array(pix)
+
+
+def _save_cached_page(entry: pathlib.Path, page: PreprocessedPage) -> None:
+    """Writes a rendered page into a render cache entry directory."""
+    np.save(entry / "image.npy", page.image)
+    if page.is_scanned:
+        # Scanned pages are always binarized for OCR, so store that view too.
+        np.save(entry / "binarized.npy", page.binarized)
+    metadata = {
+        "is_scanned": page.is_scanned,
+        "scale": page.scale,
+        "layout_dpi": page.layout_dpi,
+        "enhance": page.enhance,
+        "skew_angle": page.skew_angle,
+        "text_layer": page.text_layer,
+    }
+    (entry / "page.json").write_text(json.dumps(metadata), encoding="utf-8")
+
+
+def _load_cached_page(
+    entry: pathlib.Path, page_number: int, dpi: int, source_path: pathlib.Path
+) -> PreprocessedPage:
+    """Loads a page from a render cache entry, memory-mapping its images."""
+    metadata = json.loads((entry / "page.json").read_text(encoding="utf-8"))
+    text_layer = metadata["text_layer"]
+    page = PreprocessedPage(
+        page_number=page_number,
+        image=np.load(entry / "image.npy", mmap_mode="r"),
+        is_scanned=metadata["is_scanned"],
+        text_layer=(
+            [tuple(word) for word in text_layer] if text_layer is not None else None
+        ),
+        dpi=dpi,
+        scale=metadata["scale"],
+        layout_dpi=metadata["layout_dpi"],
+        source_path=source_path,
+        enhance=metadata["enhance"],
+        skew_angle=metadata["skew_angle"],
+    )
+    binarized_path = entry / "binarized.npy"
+    if binarized_path.exists():
+        page._views["binarized"] = np.load(binarized_path, mmap_mode="r")
+    return page
+
+
+def _load_or_render_page(
+    page: fitz.Page,
+    page_number: int,
+    dpi: int,
+    layout_dpi: int | None,
+    pdf_path: pathlib.Path,
+    cache: DiskCache | None = None,
+    pdf_hash: str | None = None,
+    enhance: bool = False,
+) -> PreprocessedPage:
+    """
+    Returns a page from the render cache, rendering and storing it on a miss.
+
+    Args:
+        page: The PyMuPDF page, only rasterized on a cache miss.
+        page_number: The 1-based page number.
+        dpi: The resolution (dots per inch) to use for rendering.
+        layout_dpi: An optional lower resolution for layout analysis images.
+        pdf_path: The path to the PDF file.
+        cache: The render cache, if any.
+        pdf_hash: The SHA-256 of the PDF content, required with a cache.
+        enhance: Whether scanned pages are deskewed and denoised for OCR.
+
+    Returns:
+        A PreprocessedPage object.
+    """
+    if cache is None or pdf_hash is None:
+        return _render_page(page, page_number, dpi, layout_dpi, pdf_path, enhance)
+
+    key = cache.key(
+        pdf_hash, page_number - 1, dpi, layout_dpi, enhance, PREPROCESSING_VERSION
+    )
+    entry = cache.get(key)
+    if entry is not None:
+        return _load_cached_page(entry, page_number, dpi, pdf_path)
+
+    rendered = _render_page(page, page_number, dpi, layout_dpi, pdf_path, enhance)
+    cache.put(key, lambda entry_dir: _save_cached_page(entry_dir, rendered))
+    return rendered
+
+
+def _select_pages(page_count: int, pages: Iterable[int] | None) -> list[int]:
+    """
+    Resolves a page selection to sorted, unique 0-based page indices.
+
+    Args:
+        page_count: The number of pages in the document.
+        pages: 1-based page numbers, or None for every page. Page numbers past
+            the end of the document are ignored.
+
+    Returns:
+        The 0-based indices of the selected pages.
+    """
+    if pages is None:
+        return list(range(page_count))
+    selected = sorted(set(pages))
+    if selected and selected[0] < 1:
+        raise ValueError(f"Page numbers start at 1, got {selected[0]}.")
+    return [number - 1 for number in selected if number <= page_count]
+
+
+def _render_page_range(
+    pdf_path: pathlib.Path,
+    indices: list[int],
+    dpi: int,
+    layout_dpi: int | None,
+    cache: DiskCache | None = None,
+    pdf_hash: str | None = None,
+    enhance: bool = False,
 ) -> list[PreprocessedPage]:
     """
-    Renders a PDF document to a list of preprocessed images, one per page.
+    Renders a chunk of pages with a document handle of its own.
+
+    This is the unit of work of parallel rendering: PyMuPDF documents cannot
+    be shared between threads or processes, so each worker opens the PDF.
 
     Args:
         pdf_path: The path to the PDF file.
+        indices: The 0-based indices of the pages to render, in order.
         dpi: The resolution (dots per inch) to use for rendering.
+        layout_dpi: An optional lower resolution for layout analysis images.
+        cache: The render cache, if any.
+        pdf_hash: The SHA-256 of the PDF content, required with a cache.
+        enhance: Whether scanned pages are deskewed and denoised for OCR.
 
     Returns:
-        A list of PreprocessedPage objects.
+        The rendered pages, in page order.
     """
-    preprocessed_pages = []
-    zoom = dpi / 72  # PyMuPDF uses 72 DPI as the base
-    mat = fitz.Matrix(zoom, zoom)
+    with fitz.open(pdf_path) as doc:
+        pages = [
+            _load_or_render_page(
+                doc[index],
+                index + 1,
+                dpi,
+                layout_dpi,
+                pdf_path,
+                cache,
+                pdf_hash,
+                enhance,
+            )
+            for index in indices
+        ]
+    # Binarize scanned pages here as well, so that work is parallelized too.
+    for page in pages:
+        if page.is_scanned:
+            page.binarized
+    return pages
+
+
+def _iter_pdf_pages_parallel(
+    pdf_path: pathlib.Path,
+    dpi: int,
+    layout_dpi: int | None,
+    workers: int,
+    cache: DiskCache | None = None,
+    pdf_hash: str | None = None,
+    enhance: bool = False,
+    pages: Iterable[int] | None = None,
+) -> Iterator[PreprocessedPage]:
+    """
+    Renders pages in a process pool and yields them in page order.
 
+    The selected pages are split into small chunks, and only a bounded number of
+    chunks is in flight at any time so memory stays flat for long documents.
+    Workers consult and fill the render cache themselves, so its hit and miss
+    counters are not updated in the calling process.
+    """
     with fitz.open(pdf_path) as doc:
-        for page_num, page in enumerate(doc):
-            # R1.2: Detect if a page is image-based (scanned)
-            # Heuristic: if a page has no extractable text, it's likely scanned.
-            if not page.get_text("text").strip():
-                is_scanned = True
-            else:
-                is_scanned = False
-
-            # Render page to a pixmap
-            pix = page.get_pixmap(matrix=mat)
-            image = Image.frombytes("RGB", (pix.width, pix.height), pix.samples)
-
-            # R1.3: Apply preprocessing if the page is scanned
-            if is_scanned:
-                processed_image = _preprocess_image(image)
-            else:
-                # Even for digital PDFs, converting to grayscale can be beneficial
-                # for some layout analysis models.
-                processed_image = image.convert("L")
-
-            preprocessed_pages.append(
-                PreprocessedPage(
-                    page_number=page_num + 1,
-                    image=processed_image,
-                    is_scanned=is_scanned,
+        indices = _select_pages(doc.page_count, pages)
+
+    # Small chunks balance the load between workers and bound the number of
+    # rendered pages waiting to be consumed.
+    chunk_size = max(1, min(4, len(indices) // (workers * 4)))
+    chunks = (
+        indices[start : start + chunk_size]
+        for start in range(0, len(indices), chunk_size)
+    )
+    max_in_flight = workers * 2
+
+    # Workers are spawned, not forked: the parent may already run threads (the
+    # OCR pool, PyTorch), and a forked child could inherit their locks held.
+    executor = ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    )
+    pending: deque[Future[list[PreprocessedPage]]] = deque()
+
+    def submit_next() -> None:
+        chunk = next(chunks, None)
+        if chunk is not None:
+            pending.append(
+                executor.submit(
+                    _render_page_range,
+                    pdf_path,
+                    chunk,
+                    dpi,
+                    layout_dpi,
+                    cache,
+                    pdf_hash,
+                    enhance,
                 )
             )
 
-    return preprocessed_pages
+    try:
+        for _ in range(max_in_flight):
+            submit_next()
+        while pending:
+            rendered = pending.popleft().result()
+            submit_next()
+            yield from rendered
+    finally:
+        # Stop rendering pages nobody will consume if iteration ends early.
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_pdf_pages(
+    pdf_path: pathlib.Path,
+    dpi: int = 300,
+    layout_dpi: int | None = None,
+    workers: int = 1,
+    cache: DiskCache | None = None,
+    enhance: bool = False,
+    pages: Iterable[int] | None = None,
+) -> Generator[PreprocessedPage, None, None]:
+    """
+    Lazily renders a PDF document, yielding one preprocessed page at a time.
+
+    Only the page currently being consumed is held in memory, so peak memory
+    does not grow with the number of pages. The PDF stays open until the
+    iterator is exhausted or closed; closing it early (e.g. once a stop
+    condition is met) means the remaining pages are never rendered.
+
+    Args:
+        pdf_path: The path to the PDF file.
+        dpi: The resolution (dots per inch) to use for rendering.
+        layout_dpi: If lower than `dpi`, enables multi-resolution mode: page
+            images are rendered at this resolution for layout analysis, while
+            OCR and table/figure crops still use `dpi`.
+        workers: The number of processes used to render pages. With more than
+            one worker, pages are rendered ahead in a process pool (each
+            worker opening its own document handle) and still yielded in order.
+        cache: An optional render cache. Pages are looked up by the PDF
+            content hash, page index, resolution and preprocessing version;
+            cached pages are memory-mapped instead of being rendered.
+        enhance: Whether scanned pages are deskewed and denoised before they
+            are binarized for OCR.
+        pages: The 1-based numbers of the pages to render, or None for every
+            page. Page numbers past the end of the document are ignored.
+
+    Yields:
+        PreprocessedPage objects in page order.
+    """
+    pdf_hash = file_sha256(pdf_path) if cache is not None else None
+
+    if workers > 1:
+        yield from _iter_pdf_pages_parallel(
+            pdf_path, dpi, layout_dpi, workers, cache, pdf_hash, enhance, pages
+        )
+        return
+
+    with fitz.open(pdf_path) as doc:
+        for index in _select_pages(len(doc), pages):
+            yield _load_or_render_page(
+                doc[index],
+                index + 1,
+                dpi,
+                layout_dpi,
+                pdf_path,
+                cache,
+                pdf_hash,
+                enhance,
+            )
+
+
+def render_pdf_to_images(
+    pdf_path: pathlib.Path,
+    dpi: int = 300,
+    layout_dpi: int | None = None,
+    workers: int = 1,
+    cache: DiskCache | None = None,
+    enhance: bool = False,
+    pages: Iterable[int] | None = None,
+) -> list[PreprocessedPage]:
+    """
+    Renders a PDF document to a list of preprocessed images, one per page.
+
+    This materializes every page at once; prefer `iter_pdf_pages` for long
+    documents.
+
+    Args:
+        pdf_path: The path to the PDF file.
+        dpi: The resolution (dots per inch) to use for rendering.
+        layout_dpi: An optional lower resolution for layout analysis images.
+        workers: The number of processes used to render pages.
+        cache: An optional render cache.
+        enhance: Whether scanned pages are deskewed and denoised for OCR.
+        pages: The 1-based numbers of the pages to render, or None for every
+            page.
+
+    Returns:
+        A list of PreprocessedPage objects.
+    """
+    return list(
+        iter_pdf_pages(
+            pdf_path,
+            dpi=dpi,
+            layout_dpi=layout_dpi,
+            workers=workers,
+            cache=cache,
+            enhance=enhance,
+            pages=pages,
+        )
+    )
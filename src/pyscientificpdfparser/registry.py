@@ -0,0 +1,142 @@
+# src/pyscientificpdfparser/registry.py
+"""
+Provides lazy, thread-safe access to the ML models of the pipeline.
+
+Responsibilities:
+- Load each model (layout analysis, table recognition) on first use rather
+  than at import, so importing the package and running commands that do not
+  need the models stay fast.
+- Make sure a model is loaded only once, even when several threads ask for it
+  at the same time.
+- Let callers register preloaded instances, warm models up ahead of the first
+  page, and unload them to free memory.
+"""
+from __future__ import annotations
+
+import gc
+import threading
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .dla import LayoutAnalyzer
+    from .tsr import TableRecognizer
+
+
+def _load_layout_analyzer() -> LayoutAnalyzer:
+    # Imported here: the model modules pull in torch and transformers.
+    from .dla import LayoutAnalyzer
+
+    return LayoutAnalyzer()
+
+
+def _load_table_recognizer() -> TableRecognizer:
+    from .tsr import TableRecognizer
+
+    return TableRecognizer()
+
+
+class ModelRegistry:
+    """
+    A set of named models, each loaded by its factory on first use.
+    """
+
+    def __init__(self, factories: dict[str, Callable[[], Any]] | None = None) -> None:
+        """
+        Initializes the registry. No model is loaded yet.
+
+        Args:
+            factories: Callables that load each model, by model name.
+        """
+        self._factories = dict(factories or {})
+        self._instances: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """Adds or replaces the factory of a model, unloading the old model."""
+        with self._lock:
+            self._factories[name] = factory
+            self._instances.pop(name, None)
+
+    def set(self, name: str, instance: Any) -> None:
+        """Uses an already loaded instance for a model."""
+        with self._lock:
+            self._instances[name] = instance
+
+    def get(self, name: str) -> Any:
+        """
+        Returns a model, loading it on first use.
+
+        Args:
+            name: The name of the model.
+
+        Returns:
+            The model instance.
+
+        Raises:
+            KeyError: If no factory is registered under `name`.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        with self._lock:
+            factory = self._factories[name]
+            model_lock = self._locks.setdefault(name, threading.Lock())
+        # Models load under their own lock, so loading one does not block
+        # threads that use another.
+        with model_lock:
+            instance = self._instances.get(name)
+            if instance is None:
+                print(f"Loading the {name} model...")
+                instance = factory()
+                with self._lock:
+                    self._instances[name] = instance
+            return instance
+
+    def is_loaded(self, name: str) -> bool:
+        """Whether a model has been loaded (or set)."""
+        return name in self._instances
+
+    def warm_up(self, *names: str) -> None:
+        """
+        Loads models ahead of use and runs one inference on each.
+
+        Args:
+            names: The models to warm up. Defaults to every registered model.
+        """
+        for name in names or tuple(self._factories):
+            instance = self.get(name)
+            warm_up = getattr(instance, "warm_up", None)
+            if callable(warm_up):
+                warm_up()
+
+    def unload(self, *names: str) -> None:
+        """
+        Drops loaded models so their memory can be reclaimed.
+
+        Args:
+            names: The models to unload. Defaults to every loaded model.
+        """
+        with self._lock:
+            for name in names or tuple(self._instances):
+                self._instances.pop(name, None)
+        gc.collect()
+
+    @property
+    def layout_analyzer(self) -> LayoutAnalyzer:
+        """The document layout analysis model."""
+        analyzer: LayoutAnalyzer = self.get("layout")
+        return analyzer
+
+    @property
+    def table_recognizer(self) -> TableRecognizer:
+        """The table structure recognition model."""
+        recognizer: TableRecognizer = self.get("table")
+        return recognizer
+
+
+# The registry the pipeline takes its models from.
+default_registry = ModelRegistry(
+    {"layout": _load_layout_analyzer, "table": _load_table_recognizer}
+)
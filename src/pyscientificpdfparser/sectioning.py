@@ -10,27 +10,55 @@ Responsibilities:
 from __future__ import annotations
 
 import re
+from collections.abc import Callable
+from typing import TYPE_CHECKING
 
-from .dla import LayoutElement
 from .models import Section, TextBlock
 
+if TYPE_CHECKING:
+    from .dla import LayoutElement
+
+# Regex to match patterns like "1. Introduction", "II. METHODS", "Abstract"
+# It looks for optional numbering (digits, roman numerals, dots) followed by
+# a keyword.
+HEADER_PATTERN = re.compile(
+    r"^\s*([IVXLCDM\d\.]*)\s*"  # Lenient numbering check
+    r"(Abstract|Introduction|Background|Methods|Methodology|"
+    r"Materials and Methods|Results|Discussion|Conclusion|Acknowledgments|"
+    r"References)\s*$",
+    re.IGNORECASE,
+)
+
 
 def is_section_header(text: str) -> bool:
     """
     Determines if a text block is likely a section header using regex.
     This is a rule-based approach.
     """
-    # Regex to match patterns like "1. Introduction", "II. METHODS", "Abstract"
-    # It looks for optional numbering (digits, roman numerals, dots) followed by
-    # a keyword.
-    header_pattern = re.compile(
-        r"^\s*([IVXLCDM\d\.]*)\s*"  # Lenient numbering check
-        r"(Abstract|Introduction|Background|Methods|Methodology|"
-        r"Materials and Methods|Results|Discussion|Conclusion|Acknowledgments|"
-        r"References)\s*$",
-        re.IGNORECASE,
-    )
-    return bool(header_pattern.match(text.strip()))
+    return bool(HEADER_PATTERN.match(text.strip()))
+
+
+def starts_section(title: str) -> Callable[[list[LayoutElement]], bool]:
+    """
+    Builds a stop condition for `parse_pdf` that holds once a section starts.
+
+    Args:
+        title: The section keyword to wait for, e.g. "References".
+
+    Returns:
+        A callable that takes the layout elements of a page and returns True
+        if one of them is the header of the given section.
+    """
+
+    def condition(elements: list[LayoutElement]) -> bool:
+        for element in elements:
+            if isinstance(element, TextBlock):
+                match = HEADER_PATTERN.match(element.text.strip())
+                if match and match.group(2).lower() == title.lower():
+                    return True
+        return False
+
+    return condition
 
 
 def segment_into_sections(elements: list[LayoutElement]) -> list[Section]:
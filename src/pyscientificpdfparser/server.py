@@ -0,0 +1,637 @@
+# src/pyscientificpdfparser/server.py
+"""
+Serves the layout and table models to several parse worker processes.
+
+Responsibilities:
+- Keep a single copy of the DLA and TSR model weights in one server process,
+  instead of one copy in every worker process.
+- Accept requests from workers over a Unix socket
+  (`multiprocessing.connection`) that only the user running the server can
+  open, and only from workers presenting the server's authentication key.
+- Batch the requests of concurrent workers dynamically: requests that arrive
+  within a short window share a forward pass, up to a maximum batch size.
+- Provide lightweight clients that stand in for `LayoutAnalyzer` and
+  `TableRecognizer` in `parse_pdf`. Clients import neither torch nor
+  transformers; OCR text is still associated with regions in the worker.
+
+Requests and results are pickled, so a server must only be reachable by
+trusted workers. The default socket lives in a per-user directory of mode
+0700 (under `$XDG_RUNTIME_DIR` when set), every socket is made readable and
+writable by its owner only, and a key is always required: the one given, or
+a random key kept in a file of that directory for the workers of the same
+user.
+"""
+from __future__ import annotations
+
+import os
+import pathlib
+import queue
+import secrets
+import socket
+import stat
+import tempfile
+import threading
+import time
+from collections.abc import Callable, Sequence
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Client, Connection, Listener
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+from PIL import Image
+
+from . import layout, registry
+from .cache import DiskCache
+from .models import Table, TextBlock
+from .spatial import SpatialIndex, split_words
+
+if TYPE_CHECKING:
+    from .dla import LayoutAnalyzer, LayoutElement
+    from .tsr import TableRecognizer
+
+
+def runtime_dir() -> pathlib.Path:
+    """
+    The per-user directory of the default socket and authentication key.
+
+    It is under `$XDG_RUNTIME_DIR`, which only its user can access, when set,
+    and in the temporary directory, named after the user id, otherwise.
+    """
+    base = os.environ.get("XDG_RUNTIME_DIR")
+    if base:
+        return pathlib.Path(base) / "scipdfparser"
+    return pathlib.Path(tempfile.gettempdir()) / f"scipdfparser-{os.getuid()}"
+
+
+def default_address() -> str:
+    """The socket the server listens on, unless another one is given."""
+    return str(runtime_dir() / "models.sock")
+
+
+def default_key_file() -> pathlib.Path:
+    """The key servers and workers use when none is given."""
+    return runtime_dir() / "models.key"
+
+
+def _private_dir(path: pathlib.Path) -> None:
+    """
+    Creates a directory that only the current user can access.
+
+    Raises:
+        PermissionError: If the directory exists and another user owns it,
+            or other users can access it.
+    """
+    path.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = path.lstat()
+    if (
+        not stat.S_ISDIR(info.st_mode)
+        or info.st_uid != os.getuid()
+        or stat.S_IMODE(info.st_mode) & 0o077
+    ):
+        raise PermissionError(
+            f"{path} must be a directory owned by the current user, with mode 0700."
+        )
+
+
+def server_authkey(key_file: pathlib.Path | None = None) -> bytes:
+    """
+    Returns the model server key of the current user, creating it if needed.
+
+    The key is random and kept in a file only the user can read, in a
+    directory only the user can access, so that the workers of the same user
+    find it without it being passed around.
+
+    Args:
+        key_file: The key file. Defaults to `default_key_file()`.
+
+    Returns:
+        The key.
+    """
+    key_file = key_file or default_key_file()
+    _private_dir(key_file.parent)
+    if not key_file.exists():
+        # Written aside and linked into place, so a worker never reads a
+        # partly written key, and concurrent servers agree on one key.
+        fd, temp_name = tempfile.mkstemp(dir=key_file.parent)  # Mode 0600
+        try:
+            with os.fdopen(fd, "w") as temp_file:
+                temp_file.write(secrets.token_hex(32))
+            os.link(temp_name, key_file)
+        except FileExistsError:
+            pass
+        finally:
+            os.unlink(temp_name)
+    return read_authkey(key_file)
+
+
+def read_authkey(key_file: pathlib.Path | None = None) -> bytes:
+    """
+    Reads the key created by `server_authkey`.
+
+    Args:
+        key_file: The key file. Defaults to `default_key_file()`.
+
+    Returns:
+        The key.
+
+    Raises:
+        FileNotFoundError: If no server of the current user created the key.
+    """
+    key_file = key_file or default_key_file()
+    try:
+        return key_file.read_bytes().strip()
+    except FileNotFoundError:
+        raise FileNotFoundError(
+            f"No model server key in {key_file}. Start the server as the same "
+            "user, or pass the key it was started with."
+        ) from None
+
+
+def _is_listening(address: str) -> bool:
+    """Whether a process accepts connections on a Unix socket."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(address)
+        except OSError:
+            return False
+    return True
+
+
+class _Request:
+    """Items submitted together by one worker, and their results."""
+
+    def __init__(self, items: list[Any]) -> None:
+        self.items = items
+        self.results: list[Any] = []
+        self.error: BaseException | None = None
+        self.done = threading.Event()
+
+
+class _Batcher:
+    """
+    Runs a function on batches of the items submitted from many threads.
+
+    A batch is started by the first pending request and takes the requests
+    that arrive within `max_wait` seconds, until it holds `max_batch_size`
+    items. Requests are never split, so a batch may exceed the maximum size
+    when a single request does.
+    """
+
+    def __init__(
+        self,
+        run: Callable[[list[Any]], list[Any]],
+        max_batch_size: int,
+        max_wait: float,
+    ) -> None:
+        self.run = run
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0
+        self.items = 0
+        self._queue: queue.Queue[_Request | None] = queue.Queue()
+        self._thread = threading.Thread(target=self._loop, daemon=True)
+        self._thread.start()
+
+    def submit(self, items: list[Any]) -> list[Any]:
+        """Runs the function on `items`, batched with other requests."""
+        request = _Request(items)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.results
+
+    def close(self) -> None:
+        """Stops the batching thread once the pending requests are done."""
+        self._queue.put(None)
+        self._thread.join()
+
+    def _loop(self) -> None:
+        while True:
+            first = self._queue.get()
+            if first is None:
+                return
+            batch = [first]
+            size = len(first.items)
+            deadline = time.monotonic() + self.max_wait
+            stopping = False
+            while size < self.max_batch_size:
+                try:
+                    request = self._queue.get(
+                        timeout=max(deadline - time.monotonic(), 0)
+                    )
+                except queue.Empty:
+                    break
+                if request is None:
+                    stopping = True
+                    break
+                batch.append(request)
+                size += len(request.items)
+            self._run(batch)
+            if stopping:
+                return
+
+    def _run(self, batch: list[_Request]) -> None:
+        items = [item for request in batch for item in request.items]
+        try:
+            results = self.run(items)
+        except Exception as error:  # Reported to every waiting worker
+            for request in batch:
+                request.error = error
+        else:
+            self.batches += 1
+            self.items += len(items)
+            start = 0
+            for request in batch:
+                request.results = results[start : start + len(request.items)]
+                start += len(request.items)
+        for request in batch:
+            request.done.set()
+
+
+class ModelServer:
+    """
+    Serves a layout analyzer and a table recognizer over a Unix socket.
+    """
+
+    def __init__(
+        self,
+        address: str | None = None,
+        layout_analyzer: LayoutAnalyzer | None = None,
+        table_recognizer: TableRecognizer | None = None,
+        max_batch_size: int = 8,
+        max_wait: float = 0.01,
+        authkey: bytes | None = None,
+        cache: DiskCache | None = None,
+    ) -> None:
+        """
+        Prepares the server. The models are loaded by `start`.
+
+        Args:
+            address: The path of the Unix socket to listen on. Defaults to
+                `default_address()`.
+            layout_analyzer: The layout model. Defaults to the model of the
+                default registry.
+            table_recognizer: The table model. Defaults to the model of the
+                default registry.
+            max_batch_size: The number of pages (or tables) that a batch
+                collects before it runs.
+            max_wait: How long, in seconds, a batch waits for more requests.
+            authkey: The key that clients must present to connect. Defaults
+                to the key of `server_authkey`.
+            cache: An optional layout cache, shared by all workers.
+        """
+        self.address = address or default_address()
+        self.layout_analyzer = layout_analyzer
+        self.table_recognizer = table_recognizer
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.authkey = authkey
+        self.cache = cache
+        self._listener: Listener | None = None
+        self._closed = threading.Event()
+        self._batchers: dict[str, _Batcher] = {}
+        self._connections: set[Connection] = set()
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Loads the models and starts accepting workers in the background."""
+        if self.authkey is None:
+            self.authkey = server_authkey()
+        if not self.authkey:
+            raise ValueError("A model server requires a non-empty authkey.")
+        default_dir = pathlib.Path(default_address()).parent
+        if pathlib.Path(self.address).parent == default_dir:
+            _private_dir(default_dir)
+        if self.layout_analyzer is None:
+            self.layout_analyzer = registry.default_registry.layout_analyzer
+        if self.table_recognizer is None:
+            self.table_recognizer = registry.default_registry.table_recognizer
+        self._batchers = {
+            "detect": _Batcher(self._detect, self.max_batch_size, self.max_wait),
+            "table": _Batcher(self._recognize, self.max_batch_size, self.max_wait),
+        }
+        if os.path.exists(self.address):
+            if _is_listening(self.address):
+                raise OSError(f"A model server is already running on {self.address}.")
+            # A socket left behind by a server that did not shut down cleanly
+            os.unlink(self.address)
+        self._listener = Listener(self.address, family="AF_UNIX", authkey=self.authkey)
+        os.chmod(self.address, 0o600)
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+
+    def serve_forever(self) -> None:
+        """Starts the server and blocks until it is closed."""
+        self.start()
+        try:
+            self._closed.wait()
+        finally:
+            self.close()
+
+    def close(self) -> None:
+        """Stops accepting workers, disconnects them and removes the socket."""
+        if self._listener is None:
+            return
+        self._closed.set()
+        # Wakes up the accept loop, which is blocked in accept()
+        _is_listening(self.address)
+        self._listener.close()
+        self._listener = None
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+        for batcher in self._batchers.values():
+            batcher.close()
+
+    @property
+    def stats(self) -> dict[str, tuple[int, int]]:
+        """The number of batches run and items processed, by request type."""
+        return {
+            name: (batcher.batches, batcher.items)
+            for name, batcher in self._batchers.items()
+        }
+
+    def _accept_loop(self) -> None:
+        listener = self._listener
+        assert listener is not None
+        while not self._closed.is_set():
+            try:
+                connection = listener.accept()
+            except (OSError, EOFError, AuthenticationError):
+                # A client that failed to authenticate or hung up
+                continue
+            if self._closed.is_set():
+                connection.close()
+                break
+            with self._lock:
+                self._connections.add(connection)
+            threading.Thread(
+                target=self._handle, args=(connection,), daemon=True
+            ).start()
+
+    def _handle(self, connection: Connection) -> None:
+        """Answers the requests of one worker, one at a time."""
+        try:
+            while True:
+                try:
+                    method, args = connection.recv()
+                except (EOFError, OSError):
+                    break
+                try:
+                    reply: tuple[str, Any] = ("ok", self._dispatch(method, args))
+                except Exception as error:
+                    reply = ("error", f"{type(error).__name__}: {error}")
+                try:
+                    connection.send(reply)
+                except OSError:
+                    break
+        finally:
+            with self._lock:
+                self._connections.discard(connection)
+            connection.close()
+
+    def _dispatch(self, method: str, args: tuple[Any, ...]) -> Any:
+        assert self.layout_analyzer is not None
+        assert self.table_recognizer is not None
+        if method == "info":
+            return {
+                "batch_size": self.layout_analyzer.batch_size,
+                "input_size": self.layout_analyzer.input_size,
+                "min_overlap": self.layout_analyzer.min_overlap,
+                "layout_available": self.layout_analyzer.is_available,
+                "table_available": self.table_recognizer.is_available,
+                "table_batch_size": self.table_recognizer.batch_size,
+            }
+        if method == "detect":
+            images, page_numbers, page_sizes = args
+            return self._batchers["detect"].submit(
+                list(zip(images, page_numbers, page_sizes))
+            )
+        if method == "table":
+            images, elements, ocr_blocks = args
+            return self._batchers["table"].submit(
+                list(zip(images, elements, ocr_blocks))
+            )
+        raise ValueError(f"Unknown request {method!r}.")
+
+    def _detect(self, items: list[Any]) -> list[list[LayoutElement]]:
+        assert self.layout_analyzer is not None
+        images, page_numbers, page_sizes = zip(*items)
+        return self.layout_analyzer.detect_regions_batch(
+            images,
+            page_numbers,
+            page_sizes,
+            batch_size=self.max_batch_size,
+            cache=self.cache,
+        )
+
+    def _recognize(self, items: list[Any]) -> list[Table]:
+        assert self.table_recognizer is not None
+        images, elements, ocr_blocks = zip(*items)
+        return self.table_recognizer.recognize_tables(
+            images, elements, ocr_blocks, batch_size=self.max_batch_size
+        )
+
+
+class ModelClient:
+    """A connection to a model server. Calls may come from several threads."""
+
+    def __init__(self, address: str | None = None, authkey: bytes | None = None):
+        """
+        Connects to a model server.
+
+        Args:
+            address: The path of the server's Unix socket. Defaults to
+                `default_address()`.
+            authkey: The key the server requires. Defaults to the key of
+                `read_authkey`.
+        """
+        self.address = address or default_address()
+        if authkey is None:
+            authkey = read_authkey()
+        self._connection = Client(self.address, family="AF_UNIX", authkey=authkey)
+        self._lock = threading.Lock()
+
+    def call(self, method: str, *args: Any) -> Any:
+        """
+        Sends a request and waits for its result.
+
+        Raises:
+            RuntimeError: If the request failed in the server.
+        """
+        with self._lock:
+            self._connection.send((method, args))
+            status, result = self._connection.recv()
+        if status == "error":
+            raise RuntimeError(f"Model server error: {result}")
+        return result
+
+    def close(self) -> None:
+        """Closes the connection."""
+        self._connection.close()
+
+
+class RemoteLayoutAnalyzer:
+    """
+    Stands in for a `LayoutAnalyzer`, running the model in a model server.
+
+    Region detection runs in the server; OCR text is associated with the
+    regions locally, as `LayoutAnalyzer` does.
+    """
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+        info = client.call("info")
+        self.batch_size: int = info["batch_size"]
+        self.input_size: tuple[int, int] | None = info["input_size"]
+        self.min_overlap: float | None = info["min_overlap"]
+        self.is_available: bool = info["layout_available"]
+
+    def set_backend(self, *args: Any, **kwargs: Any) -> None:
+        """Does nothing: the backend is chosen when the server starts."""
+
+    def detect_regions_batch(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+        page_numbers: Sequence[int],
+        page_sizes: Sequence[tuple[int, int] | None] | None = None,
+        batch_size: int | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[list[LayoutElement]]:
+        """
+        Detects the layout regions of several pages in the server.
+
+        `batch_size` and `cache` are accepted for compatibility and ignored:
+        the server batches requests and owns the layout cache.
+        """
+        sizes = list(page_sizes) if page_sizes is not None else [None] * len(images)
+        detections: list[list[LayoutElement]] = self.client.call(
+            "detect", list(images), list(page_numbers), sizes
+        )
+        return detections
+
+    def detect_regions(
+        self,
+        image: Image.Image | np.ndarray,
+        page_number: int,
+        page_size: tuple[int, int] | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[LayoutElement]:
+        """Detects the layout regions of a page in the server."""
+        return self.detect_regions_batch([image], [page_number], [page_size])[0]
+
+    def associate_text(
+        self,
+        raw_elements: list[LayoutElement],
+        ocr_blocks: list[TextBlock],
+        index: SpatialIndex | None = None,
+    ) -> list[LayoutElement]:
+        """Fills detected regions with OCR text and sorts them by reading order."""
+        return layout.associate_text(raw_elements, ocr_blocks, index, self.min_overlap)
+
+    def analyze_pages(
+        self,
+        images: Sequence[Image.Image | np.ndarray],
+        page_numbers: Sequence[int],
+        ocr_blocks: Sequence[list[TextBlock]],
+        page_sizes: Sequence[tuple[int, int] | None] | None = None,
+        batch_size: int | None = None,
+        ocr_indexes: Sequence[SpatialIndex] | None = None,
+        cache: DiskCache | None = None,
+    ) -> list[list[LayoutElement]]:
+        """Analyzes several pages, like `LayoutAnalyzer.analyze_pages`."""
+        if not self.is_available:
+            return [list(blocks) for blocks in ocr_blocks]
+        return layout.analyze_pages(
+            self, images, page_numbers, ocr_blocks, page_sizes, ocr_indexes=ocr_indexes
+        )
+
+    def analyze_page(
+        self,
+        image: Image.Image | np.ndarray,
+        page_number: int,
+        ocr_blocks: list[TextBlock],
+        page_size: tuple[int, int] | None = None,
+    ) -> list[LayoutElement]:
+        """Analyzes a single page, like `LayoutAnalyzer.analyze_page`."""
+        return self.analyze_pages([image], [page_number], [ocr_blocks], [page_size])[0]
+
+
+class RemoteTableRecognizer:
+    """Stands in for a `TableRecognizer`, running the model in a model server."""
+
+    def __init__(self, client: ModelClient) -> None:
+        self.client = client
+        info = client.call("info")
+        self.batch_size: int = info["table_batch_size"]
+        self.is_available: bool = info["table_available"]
+
+    def set_backend(self, *args: Any, **kwargs: Any) -> None:
+        """Does nothing: the backend is chosen when the server starts."""
+
+    def recognize_table(
+        self,
+        table_image: Image.Image | np.ndarray,
+        table_element: Table,
+        ocr_blocks: list[TextBlock],
+        index: SpatialIndex | None = None,
+    ) -> Table:
+        """Recognizes the structure of a table in the server."""
+        return self.recognize_tables(
+            [table_image], [table_element], [ocr_blocks], [index]
+        )[0]
+
+    def recognize_tables(
+        self,
+        table_images: Sequence[Image.Image | np.ndarray],
+        table_elements: Sequence[Table],
+        ocr_blocks: Sequence[list[TextBlock]],
+        indexes: Sequence[SpatialIndex | None] | None = None,
+        batch_size: int | None = None,
+    ) -> list[Table]:
+        """
+        Recognizes the structure of several tables in the server.
+
+        Only the OCR words inside each table are sent to the server.
+        `batch_size` is accepted for compatibility and ignored: the server
+        batches requests.
+        """
+        if not self.is_available:
+            return list(table_elements)
+        all_indexes = indexes or [None] * len(table_elements)
+        contained = []
+        for element, blocks, index in zip(table_elements, ocr_blocks, all_indexes):
+            if any(block.words for block in blocks):
+                # Send the words of paragraph-level blocks, not the blocks
+                blocks, index = split_words(blocks), None
+            if index is None:
+                index = SpatialIndex.from_elements(blocks)
+            contained.append(
+                [blocks[i] for i in index.query_centers(element.bbox).tolist()]
+            )
+        tables: list[Table] = self.client.call(
+            "table",
+            [np.asarray(image) for image in table_images],
+            list(table_elements),
+            contained,
+        )
+        return tables
+
+
+def connect(
+    address: str | None = None, authkey: bytes | None = None
+) -> tuple[RemoteLayoutAnalyzer, RemoteTableRecognizer]:
+    """
+    Connects to a model server.
+
+    Args:
+        address: The path of the server's Unix socket. Defaults to
+            `default_address()`.
+        authkey: The key the server requires. Defaults to the key of
+            `read_authkey`.
+
+    Returns:
+        The layout analyzer and table recognizer to pass to `parse_pdf`.
+    """
+    client = ModelClient(address, authkey)
+    return RemoteLayoutAnalyzer(client), RemoteTableRecognizer(client)
@@ -0,0 +1,267 @@
+# src/pyscientificpdfparser/spatial.py
+"""
+Provides a spatial index over the bounding boxes of a page.
+
+Responsibilities:
+- Hold the boxes of a page (e.g., OCR blocks) as NumPy arrays, built once per
+  page and shared by the stages that look up text by region.
+- Answer containment queries (boxes whose center lies in a region) and
+  overlap queries (boxes covered by a region by at least a given fraction).
+- Assign every box to the region that covers most of it.
+- Fill the text regions of a page with the text of its OCR blocks.
+- Split OCR blocks into their words, for lookups finer than a paragraph.
+
+The index is a uniform grid over box centers: a query only visits the grid
+cells its region touches, so associating the blocks of a page with its
+regions costs close to linear time even on dense pages.
+"""
+from __future__ import annotations
+
+from collections.abc import Sequence
+from typing import TypeVar
+
+import numpy as np
+
+from .models import BaseElement, BoundingBox, TextBlock
+
+Element = TypeVar("Element", bound=BaseElement)
+
+
+class SpatialIndex:
+    """
+    A uniform grid over the centers of a set of bounding boxes.
+
+    Query results are indices into the boxes the index was built from, in
+    ascending order, so callers keep the original (reading) order of their
+    elements.
+    """
+
+    def __init__(
+        self,
+        boxes: Sequence[BoundingBox] | np.ndarray,
+        cell_size: float | None = None,
+    ) -> None:
+        """
+        Builds the index.
+
+        Args:
+            boxes: The (x1, y1, x2, y2) boxes to index.
+            cell_size: The side of a grid cell. Defaults to twice the median
+                box extent, so a typical box center query visits a few cells.
+        """
+        self.boxes = np.asarray(boxes, dtype=np.float64).reshape(-1, 4)
+        self.centers = (self.boxes[:, :2] + self.boxes[:, 2:]) / 2
+        self.areas = np.prod(
+            np.maximum(self.boxes[:, 2:] - self.boxes[:, :2], 0), axis=1
+        )
+        extents = self.boxes[:, 2:] - self.boxes[:, :2]
+        if cell_size is None:
+            cell_size = 2 * float(np.median(extents.max(axis=1))) if len(self) else 1
+        self.cell_size = max(cell_size, 1.0)
+        # Largest half extents, by which regions are grown for overlap queries
+        self._reach = extents.max(axis=0) / 2 if len(self) else np.zeros(2)
+
+        # Sort the boxes by grid cell, and keep the slice of each cell
+        cells = np.floor(self.centers / self.cell_size).astype(np.int64)
+        order = np.lexsort((cells[:, 0], cells[:, 1]))
+        keys, starts, counts = np.unique(
+            cells[order], axis=0, return_index=True, return_counts=True
+        )
+        self._order = order
+        self._cells = {
+            (int(cx), int(cy)): (int(start), int(start + count))
+            for (cx, cy), start, count in zip(keys, starts, counts)
+        }
+
+    @classmethod
+    def from_elements(
+        cls, elements: Sequence[BaseElement], cell_size: float | None = None
+    ) -> SpatialIndex:
+        """Builds an index over the bounding boxes of page elements."""
+        return cls([element.bbox for element in elements], cell_size)
+
+    def __len__(self) -> int:
+        return len(self.boxes)
+
+    def _candidates(self, bbox: BoundingBox) -> np.ndarray:
+        """Returns the indices of the boxes whose center cell `bbox` touches."""
+        x1, y1, x2, y2 = (int(np.floor(v / self.cell_size)) for v in bbox)
+        if (x2 - x1 + 1) * (y2 - y1 + 1) >= len(self._cells):
+            return np.arange(len(self))
+        slices = [
+            self._cells[cell]
+            for cell in (
+                (cx, cy) for cy in range(y1, y2 + 1) for cx in range(x1, x2 + 1)
+            )
+            if cell in self._cells
+        ]
+        if not slices:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([self._order[start:end] for start, end in slices])
+
+    def query_centers(self, bbox: BoundingBox) -> np.ndarray:
+        """
+        Finds the boxes whose center lies inside a region, borders included.
+
+        Args:
+            bbox: The region, in the coordinates of the indexed boxes.
+
+        Returns:
+            The indices of the matching boxes, in ascending order.
+        """
+        candidates = self._candidates(bbox)
+        centers = self.centers[candidates]
+        inside = (
+            (centers[:, 0] >= bbox[0])
+            & (centers[:, 0] <= bbox[2])
+            & (centers[:, 1] >= bbox[1])
+            & (centers[:, 1] <= bbox[3])
+        )
+        return np.sort(candidates[inside])
+
+    def overlaps(self, bbox: BoundingBox) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Computes how much of each box a region covers.
+
+        Args:
+            bbox: The region, in the coordinates of the indexed boxes.
+
+        Returns:
+            The indices of the boxes the region intersects, in ascending
+            order, and the fraction of each box's area inside the region.
+        """
+        rx, ry = self._reach
+        grown = (bbox[0] - rx, bbox[1] - ry, bbox[2] + rx, bbox[3] + ry)
+        candidates = self.query_centers(grown)
+        boxes = self.boxes[candidates]
+        width = np.minimum(boxes[:, 2], bbox[2]) - np.maximum(boxes[:, 0], bbox[0])
+        height = np.minimum(boxes[:, 3], bbox[3]) - np.maximum(boxes[:, 1], bbox[1])
+        intersection = np.maximum(width, 0) * np.maximum(height, 0)
+        # Degenerate boxes count as covered when the region touches them
+        areas = self.areas[candidates]
+        fraction = np.where(
+            areas > 0, intersection / np.where(areas > 0, areas, 1), 1.0
+        )
+        touching = (width >= 0) & (height >= 0) & ((intersection > 0) | (areas == 0))
+        return candidates[touching], fraction[touching]
+
+    def query_overlap(self, bbox: BoundingBox, min_overlap: float = 0.5) -> np.ndarray:
+        """
+        Finds the boxes a region covers by at least a fraction of their area.
+
+        Args:
+            bbox: The region, in the coordinates of the indexed boxes.
+            min_overlap: The minimum fraction (0-1] of a box's area that must
+                lie inside the region.
+
+        Returns:
+            The indices of the matching boxes, in ascending order.
+        """
+        candidates, fraction = self.overlaps(bbox)
+        return candidates[fraction >= min_overlap]
+
+    def assign(
+        self, regions: Sequence[BoundingBox], min_overlap: float = 0.5
+    ) -> list[np.ndarray]:
+        """
+        Assigns every box to the region that covers the largest part of it.
+
+        Unlike center containment, a box is never given to two overlapping
+        regions. Ties go to the region listed first.
+
+        Args:
+            regions: The regions, in the coordinates of the indexed boxes.
+            min_overlap: The minimum fraction (0-1] of a box's area a region
+                must cover to be assigned the box.
+
+        Returns:
+            For each region, the indices of its boxes, in ascending order.
+        """
+        best_fraction = np.zeros(len(self))
+        best_region = np.full(len(self), -1, dtype=np.int64)
+        for region_index, bbox in enumerate(regions):
+            candidates, fraction = self.overlaps(bbox)
+            better = (fraction >= min_overlap) & (fraction > best_fraction[candidates])
+            best_fraction[candidates[better]] = fraction[better]
+            best_region[candidates[better]] = region_index
+        # Group the boxes by region; the stable sort keeps them in order
+        order = np.argsort(best_region, kind="stable")
+        bounds = np.searchsorted(best_region[order], np.arange(len(regions) + 1))
+        return [order[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+
+def fill_text_regions(
+    elements: Sequence[Element],
+    ocr_blocks: Sequence[TextBlock],
+    index: SpatialIndex | None = None,
+    min_overlap: float | None = None,
+) -> list[Element]:
+    """
+    Assigns the text of OCR blocks to the text regions that contain them.
+
+    OCR blocks keep their OCR order within a region. Text regions that get no
+    text are dropped; other elements (tables, figures) are kept as they are.
+
+    Args:
+        elements: The layout elements of a page. Their TextBlocks are filled
+            in place.
+        ocr_blocks: The OCR blocks of the page.
+        index: A spatial index over `ocr_blocks`, if already built.
+        min_overlap: If set, each OCR block is assigned to the text region
+            covering the largest fraction of its area, if at least this
+            fraction. By default, OCR blocks are assigned to every text region
+            that contains their center.
+
+    Returns:
+        The elements, without the empty text regions.
+    """
+    if index is None:
+        index = SpatialIndex.from_elements(ocr_blocks)
+    text_elements = [element for element in elements if isinstance(element, TextBlock)]
+    if min_overlap is None:
+        # Each OCR block goes to every element that contains its center
+        assigned = [index.query_centers(element.bbox) for element in text_elements]
+    else:
+        # Each OCR block goes to the element that covers most of its area
+        assigned = index.assign(
+            [element.bbox for element in text_elements], min_overlap
+        )
+    for element, indices in zip(text_elements, assigned):
+        element.text = " ".join(ocr_blocks[i].text for i in indices.tolist())
+
+    return [
+        element
+        for element in elements
+        if not isinstance(element, TextBlock) or element.text.strip()
+    ]
+
+
+def split_words(blocks: Sequence[TextBlock]) -> list[TextBlock]:
+    """
+    Returns the words of OCR blocks, in order.
+
+    OCR blocks are paragraphs, too coarse to fill table cells. Their words
+    are kept as columns and only built into TextBlocks here, for the pages
+    whose tables need them. Blocks that carry no `words` stand for
+    themselves.
+
+    Args:
+        blocks: The OCR blocks (or words) of a page.
+
+    Returns:
+        The words of the blocks.
+    """
+    split: list[TextBlock] = []
+    for block in blocks:
+        if block.words is None:
+            split.append(block)
+            continue
+        split.extend(
+            TextBlock(
+                text=text, bbox=bbox, page_number=block.page_number, confidence=conf
+            )
+            for text, bbox, conf in zip(
+                block.words.texts, block.words.boxes, block.words.confidences
+            )
+        )
+    return split
@@ -6,17 +6,37 @@ Responsibilities:
 - Use a specialized model (e.g., Table Transformer) to understand table structure.
 - Identify rows, columns, headers, and spanning cells.
 - Extract cell content and map it to the recognized structure.
+
+The cell grid is built with array operations over all rows and columns at
+once, so tables with hundreds of cells cost little beyond the forward pass.
 """
 from __future__ import annotations
 
-import torch
+from collections.abc import Mapping, Sequence
+
+import numpy as np
 from PIL import Image
 from transformers import AutoModelForObjectDetection, AutoProcessor
 
-from .models import Table, TableCell, TextBlock
+from . import detection, inference
+from .models import BoundingBox, Table, TableCell, TextBlock
+from .preprocessing import crop_origin, to_rgb_array
+from .spatial import SpatialIndex, split_words
+
+# The Table Transformer classes the cell grid is built from
+ROW_LABEL = "table row"
+COLUMN_LABEL = "table column"
+HEADER_LABEL = "table column header"
+SPANNING_CELL_LABEL = "table spanning cell"
+
+# The minimum score of a structure box
+DEFAULT_SCORE_THRESHOLD = 0.5
+# A row (column) belongs to a header or spanning cell box that covers at
+# least this share of its height (width)
+MIN_COVERAGE = 0.5
 
 
-class TableRecognizer:
+class TableRecognizer(inference.BackendMixin):
     """
     Recognizes the structure of a table from its image using a Table Transformer model.
     """
@@ -24,8 +44,31 @@ class TableRecognizer:
     def __init__(
         self,
         model_name: str = "microsoft/table-transformer-structure-recognition-v1.1-all",  # noqa: E501
+        backend: str = "eager",
+        intra_op_threads: int | None = None,
+        score_threshold: Mapping[str, float] | float = DEFAULT_SCORE_THRESHOLD,
+        nms_threshold: float | None = 0.5,
+        batch_size: int = 4,
     ):
-        """Initializes the TableRecognizer."""
+        """
+        Initializes the TableRecognizer.
+
+        Args:
+            model_name: The Hugging Face model to load.
+            backend: How the model runs (see `inference.BackendMixin`).
+            intra_op_threads: The intra-op threads of an ONNX Runtime session.
+            score_threshold: The minimum score of a structure box, for all
+                classes or by class name (e.g. {"table spanning cell": 0.7}).
+            nms_threshold: The IoU above which overlapping boxes of a class
+                (e.g. two detections of one row) are suppressed. None
+                disables the suppression.
+            batch_size: The number of tables passed through the model at once
+                by `recognize_tables`.
+        """
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self.score_threshold = score_threshold
+        self.nms_threshold = nms_threshold
         try:
             self.processor = AutoProcessor.from_pretrained(
                 model_name, apply_ocr=False
@@ -38,75 +81,303 @@ class TableRecognizer:
             print(f"Could not load model '{model_name}'. Skipping TSR.")
             self.processor = None
             self.model = None
+        self.set_backend(backend, intra_op_threads)
+
+    @property
+    def is_available(self) -> bool:
+        """Whether the model was loaded, i.e. whether tables can be recognized."""
+        return self.model is not None and self.processor is not None
+
+    def warm_up(self) -> None:
+        """Runs the model once on a blank image, ahead of the first table."""
+        if self.runner and self.processor:
+            blank = np.full((224, 224), 255, dtype=np.uint8)
+            self.runner(self.processor(images=to_rgb_array(blank), return_tensors="pt"))
 
     def recognize_table(
         self,
-        table_image: Image.Image,
+        table_image: Image.Image | np.ndarray,
         table_element: Table,
         ocr_blocks: list[TextBlock],
+        index: SpatialIndex | None = None,
     ) -> Table:
         """
         Recognizes the structure of a single table and populates the Table object.
 
         Args:
-            table_image: A PIL Image of the cropped table.
+            table_image: The crop of the table's bounding box from the page
+                (see `PreprocessedPage.crop`), as a PIL Image or an array.
             table_element: The Table object from DLA, containing the bbox.
-            ocr_blocks: A list of all OCR TextBlocks on the page.
+            ocr_blocks: The OCR words of the page, as TextBlocks. Blocks with
+                `words` are split into their words.
+            index: A spatial index over `ocr_blocks`, if already built for the
+                page, so the words are not scanned again for every table.
 
         Returns:
             The populated Table object with structured rows and cells.
         """
-        if not self.model or not self.processor:
-            return table_element  # Return the original element if model failed
-
-        width, height = table_image.size
-        inputs = self.processor(images=table_image, return_tensors="pt")
-
-        with torch.no_grad():
-            self.model(**inputs)
-
-        # The logic to convert model outputs (boxes and labels) to a structured
-        # grid of cells is highly complex. It involves:
-        # 1. Filtering boxes for rows, columns, headers, spanning cells.
-        # 2. Calculating the intersections of row and column boxes to define cell geometry.
-        # 3. Handling spanning cells by merging grid locations.
-        # 4. Associating OCR text with each final cell.
-        #
-        # This is a significant engineering task. For this implementation, we
-        # will create a placeholder logic that extracts all text within the
-        # table's bounding box and places it into a single cell, acknowledging
-        # that the full structure recognition is not yet implemented.
-
-        print(
-            "Full Table Structure Recognition is complex and not fully "
-            "implemented. Using placeholder logic."
+        return self.recognize_tables(
+            [table_image], [table_element], [ocr_blocks], [index]
+        )[0]
+
+    def recognize_tables(
+        self,
+        table_images: Sequence[Image.Image | np.ndarray],
+        table_elements: Sequence[Table],
+        ocr_blocks: Sequence[list[TextBlock]],
+        indexes: Sequence[SpatialIndex | None] | None = None,
+        batch_size: int | None = None,
+    ) -> list[Table]:
+        """
+        Recognizes the structure of several tables, e.g. of a whole document.
+
+        The processor pads the crops of a batch to a common size, and the
+        model runs once per batch, so the cost of a forward pass is shared by
+        the tables of a batch.
+
+        Args:
+            table_images: The cropped tables, as PIL Images or arrays.
+            table_elements: The Table objects from DLA, in the same order.
+            ocr_blocks: The OCR words of the page of each table (see
+                `recognize_table`).
+            indexes: Spatial indexes over the `ocr_blocks` of each table, if
+                already built for its page.
+            batch_size: The number of tables per forward pass. Defaults to the
+                recognizer's `batch_size`.
+
+        Returns:
+            The populated Table objects, in the order of `table_elements`.
+        """
+        if not self.runner or not self.processor:
+            return list(table_elements)  # The original elements if model failed
+
+        batch_size = batch_size or self.batch_size
+        all_indexes = indexes or [None] * len(table_elements)
+        id2label = self.model.config.id2label
+        thresholds = detection.class_thresholds(
+            id2label, self.score_threshold, DEFAULT_SCORE_THRESHOLD
         )
+        tables: list[Table] = []
+        for start in range(0, len(table_elements), batch_size):
+            batch = range(start, min(start + batch_size, len(table_elements)))
+            images = [to_rgb_array(table_images[i]) for i in batch]
+            inputs = self.processor(images=images, return_tensors="pt")
+            outputs = self.runner(inputs)
 
-        # Placeholder logic:
-        # Get all text from OCR blocks that are inside the table's main bounding box.
-        table_bbox = table_element.bbox
-        contained_texts = []
-        for ocr_block in ocr_blocks:
-            ocr_center_x = (ocr_block.bbox[0] + ocr_block.bbox[2]) / 2
-            ocr_center_y = (ocr_block.bbox[1] + ocr_block.bbox[3]) / 2
-            if (
-                table_bbox[0] <= ocr_center_x <= table_bbox[2]
-                and table_bbox[1] <= ocr_center_y <= table_bbox[3]
-            ):
-                contained_texts.append(ocr_block.text)
-
-        # Create a single cell with all the extracted text.
-        if contained_texts:
-            full_text = " ".join(contained_texts)
-            cell = TableCell(
-                text=full_text,
-                bbox=table_bbox,
-                row_span=1,
-                col_span=1,
-                is_header=False,
+            # The structure boxes are normalized to each crop: they are scaled
+            # to its size here, and shifted onto the page when the grid is
+            # built. The crop is clamped to the page, so it can be smaller
+            # than the table's bounding box.
+            sizes = [(image.shape[1], image.shape[0]) for image in images]
+            structures = detection.postprocess(
+                outputs["logits"],
+                detection.box_cxcywh_to_xyxy(outputs["pred_boxes"]),
+                sizes,
+                score_thresholds=thresholds,
+                iou_threshold=self.nms_threshold,
             )
+            for i, structure in zip(batch, structures):
+                tables.append(
+                    _fill_table(
+                        table_elements[i],
+                        structure,
+                        id2label,
+                        ocr_blocks[i],
+                        all_indexes[i],
+                    )
+                )
+        return tables
+
+
+def _fill_table(
+    table_element: Table,
+    structure: detection.Detections,
+    id2label: Mapping[int, str],
+    ocr_blocks: list[TextBlock],
+    index: SpatialIndex | None,
+) -> Table:
+    """
+    Populates a table with the cells of its detected structure.
+
+    Args:
+        table_element: The Table object from DLA.
+        structure: The structure boxes, relative to the crop of the table's
+            bounding box (see `preprocessing.crop_origin`).
+        id2label: The class names of the structure model, by class id.
+        ocr_blocks: The OCR words of the page, or blocks with `words`.
+        index: A spatial index over `ocr_blocks`, if already built.
+
+    Returns:
+        The populated Table object.
+    """
+    if any(block.words for block in ocr_blocks):
+        # Paragraph-level blocks would fill a single cell: use their words
+        ocr_blocks = split_words(ocr_blocks)
+        index = None
+    table_bbox = table_element.bbox
+    x1, y1 = crop_origin(table_bbox)
+    boxes = np.asarray(structure.boxes, dtype=np.float64).reshape(-1, 4)
+    boxes += (x1, y1, x1, y1)
+    labels = [id2label.get(label, "") for label in structure.labels]
+
+    if index is None:
+        index = SpatialIndex.from_elements(ocr_blocks)
+    table_element.rows = build_table_grid(boxes, labels, table_bbox, ocr_blocks, index)
+    if not table_element.rows:
+        # No row or no column was found: keep the table's text as one cell
+        contained_texts = [
+            ocr_blocks[i].text for i in index.query_centers(table_bbox).tolist()
+        ]
+        if contained_texts:
+            cell = TableCell(text=" ".join(contained_texts), bbox=table_bbox)
             table_element.rows = [[cell]]
-        else:
-            table_element.rows = []
+    return table_element
+
+
+def _coverage(boxes: np.ndarray, regions: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Computes the share of the extent of boxes along an axis that regions cover.
+
+    Args:
+        boxes: The (x1, y1, x2, y2) boxes, of shape (N, 4).
+        regions: The (x1, y1, x2, y2) covering regions, of shape (M, 4).
+        axis: 0 for widths, 1 for heights.
+
+    Returns:
+        An array of shape (M, N).
+    """
+    low, high = boxes[:, axis], boxes[:, axis + 2]
+    overlap = np.minimum(high[None, :], regions[:, None, axis + 2]) - np.maximum(
+        low[None, :], regions[:, None, axis]
+    )
+    coverage: np.ndarray = overlap.clip(min=0) / np.maximum(high - low, 1e-9)
+    return coverage
+
+
+def _nearest(values: np.ndarray, intervals: np.ndarray) -> np.ndarray:
+    """
+    Finds the interval that contains each value, or else the closest one.
 
-        return table_element
+    Ties (overlapping intervals) go to the interval with the closest center.
+
+    Args:
+        values: The values, of shape (N,).
+        intervals: The (start, end) intervals, of shape (M, 2).
+
+    Returns:
+        The index of the interval of each value, of shape (N,).
+    """
+    distance = np.maximum(
+        intervals[None, :, 0] - values[:, None], values[:, None] - intervals[None, :, 1]
+    ).clip(min=0)
+    centers = intervals.mean(axis=1)
+    nearest: np.ndarray = np.argmin(
+        distance + 1e-6 * np.abs(values[:, None] - centers), axis=1
+    )
+    return nearest
+
+
+def build_table_grid(
+    boxes: np.ndarray,
+    labels: list[str],
+    table_bbox: BoundingBox,
+    words: list[TextBlock],
+    index: SpatialIndex,
+) -> list[list[TableCell]]:
+    """
+    Builds the cells of a table from its detected structure.
+
+    Cells are the intersections of row and column boxes, computed for the
+    whole grid at once. Rows mostly covered by a column header box are header
+    rows. Spanning cells, by decreasing score, merge the block of grid slots
+    they mostly cover, unless it overlaps a better spanning cell. Each OCR
+    word inside the table goes to the cell of the row and column that
+    contain its center (or are closest to it).
+
+    Args:
+        boxes: The page-space (x1, y1, x2, y2) structure boxes, by decreasing
+            score, of shape (N, 4).
+        labels: The class name of each box.
+        table_bbox: The bounding box of the table on the page.
+        words: The OCR words of the page, as TextBlocks.
+        index: A spatial index over `words`.
+
+    Returns:
+        The rows of cells, top to bottom and left to right. A spanning cell
+        appears once, at its top-left slot; the slots it covers are omitted.
+        An empty list if no row or no column was detected.
+    """
+    classes = np.asarray(labels)
+    rows = boxes[classes == ROW_LABEL]
+    columns = boxes[classes == COLUMN_LABEL]
+    if not len(rows) or not len(columns):
+        return []
+    rows = rows[np.argsort(rows[:, 1] + rows[:, 3], kind="stable")]
+    columns = columns[np.argsort(columns[:, 0] + columns[:, 2], kind="stable")]
+    n_rows, n_columns = len(rows), len(columns)
+
+    # Cell (i, j) spans the width of column j and the height of row i
+    grid = np.stack(
+        np.broadcast_arrays(
+            columns[None, :, 0], rows[:, None, 1], columns[None, :, 2], rows[:, None, 3]
+        ),
+        axis=-1,
+    )
+
+    headers = boxes[classes == HEADER_LABEL]
+    is_header = np.any(_coverage(rows, headers, axis=1) >= MIN_COVERAGE, axis=0)
+
+    # Every slot is owned by the cell (flat index of its top-left slot) it
+    # belongs to; spanning cells hand their whole block to one owner.
+    owner = np.arange(n_rows * n_columns).reshape(n_rows, n_columns)
+    spans: dict[int, tuple[int, int]] = {}
+    spanning = boxes[classes == SPANNING_CELL_LABEL]
+    span_rows = _coverage(rows, spanning, axis=1) >= MIN_COVERAGE
+    span_columns = _coverage(columns, spanning, axis=0) >= MIN_COVERAGE
+    merged = np.zeros((n_rows, n_columns), dtype=bool)
+    for covered_rows, covered_columns in zip(span_rows, span_columns):
+        row_indexes = np.flatnonzero(covered_rows)
+        column_indexes = np.flatnonzero(covered_columns)
+        if len(row_indexes) * len(column_indexes) < 2:
+            continue
+        top, bottom = row_indexes[0], row_indexes[-1] + 1
+        left, right = column_indexes[0], column_indexes[-1] + 1
+        if merged[top:bottom, left:right].any():
+            continue
+        merged[top:bottom, left:right] = True
+        owner[top:bottom, left:right] = owner[top, left]
+        spans[int(owner[top, left])] = (int(bottom - top), int(right - left))
+
+    texts: list[list[str]] = [[] for _ in range(n_rows * n_columns)]
+    contained = index.query_centers(table_bbox)
+    if len(contained):
+        centers = index.centers[contained]
+        cell_rows = _nearest(centers[:, 1], rows[:, [1, 3]])
+        cell_columns = _nearest(centers[:, 0], columns[:, [0, 2]])
+        for word, cell in zip(
+            contained.tolist(), owner[cell_rows, cell_columns].tolist()
+        ):
+            texts[cell].append(words[word].text)
+
+    table_rows: list[list[TableCell]] = []
+    for i in range(n_rows):
+        row: list[TableCell] = []
+        for j in range(n_columns):
+            cell = i * n_columns + j
+            if owner[i, j] != cell:
+                continue
+            row_span, col_span = spans.get(cell, (1, 1))
+            bottom_right = grid[i + row_span - 1, j + col_span - 1]
+            x1, y1 = grid[i, j, :2].tolist()
+            x2, y2 = bottom_right[2:].tolist()
+            row.append(
+                TableCell(
+                    text=" ".join(texts[cell]),
+                    bbox=(x1, y1, x2, y2),
+                    row_span=row_span,
+                    col_span=col_span,
+                    is_header=bool(is_header[i]),
+                )
+            )
+        table_rows.append(row)
+    return table_rows
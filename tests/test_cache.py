@@ -0,0 +1,87 @@
+# tests/test_cache.py
+import os
+import pathlib
+from collections.abc import Callable
+
+import numpy as np
+
+from pyscientificpdfparser.cache import DiskCache, array_sha256, file_sha256
+
+
+def _write_bytes(size: int) -> Callable[[pathlib.Path], None]:
+    """Returns a writer that stores a single file of the given size."""
+
+    def write(entry: pathlib.Path) -> None:
+        (entry / "data.bin").write_bytes(bytes(size))
+
+    return write
+
+
+def test_disk_cache_get_and_put(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that entries can be stored and looked up, counting hits and misses.
+    """
+    # Arrange
+    cache = DiskCache(tmp_path / "cache")
+    key = DiskCache.key("doc-hash", 0, 300)
+
+    # Act / Assert: A miss before the entry is stored
+    assert cache.get(key) is None
+    entry = cache.put(key, _write_bytes(10))
+
+    # A hit afterwards, returning the entry directory with its files
+    assert cache.get(key) == entry
+    assert (entry / "data.bin").stat().st_size == 10
+    assert (cache.hits, cache.misses) == (1, 1)
+    assert cache.size == 10
+
+    # Keys depend on every part
+    assert DiskCache.key("doc-hash", 1, 300) != key
+
+    # A new cache over the same directory sees the stored entries
+    assert DiskCache(tmp_path / "cache").size == 10
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that the least recently used entries are evicted above the size bound.
+    """
+    # Arrange: Room for two 10-byte entries
+    cache = DiskCache(tmp_path / "cache", max_bytes=25)
+    cache.put("a", _write_bytes(10))
+    cache.put("b", _write_bytes(10))
+    # Make "a" older than "b", then use it so that "b" is the LRU entry
+    os.utime(tmp_path / "cache" / "a", (0, 0))
+    os.utime(tmp_path / "cache" / "b", (1, 1))
+    assert cache.get("a") is not None
+
+    # Act: A third entry exceeds the bound
+    cache.put("c", _write_bytes(10))
+
+    # Assert
+    assert cache.get("b") is None
+    assert cache.get("a") is not None
+    assert cache.get("c") is not None
+    assert cache.size == 20
+
+
+def test_file_sha256(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that files are hashed by content.
+    """
+    path = tmp_path / "file.bin"
+    path.write_bytes(b"abc")
+    assert file_sha256(path, chunk_size=2) == (
+        "ba7816bf8f01cfea414140de5dae2223b00361a396177a9cb410ff61f20015ad"
+    )
+
+
+def test_array_sha256() -> None:
+    """
+    Tests that arrays are hashed by shape and content, not by memory layout.
+    """
+    image = np.arange(12, dtype=np.uint8).reshape(3, 4)
+    assert array_sha256(image) == array_sha256(image.copy())
+    assert array_sha256(np.asfortranarray(image)) == array_sha256(image)
+    assert array_sha256(image.reshape(4, 3)) != array_sha256(image)
+    assert array_sha256(image + 1) != array_sha256(image)
@@ -1,25 +1,30 @@
 # tests/test_core.py
+import inspect
+from collections.abc import Generator
 from pathlib import Path
 from unittest import mock
 
 from PIL import Image
 
-from pyscientificpdfparser import core
-from pyscientificpdfparser.models import Document, Section, Table, TextBlock
+from pyscientificpdfparser import core, sectioning
+from pyscientificpdfparser.models import (
+    Document,
+    Figure,
+    Section,
+    Table,
+    TextBlock,
+    Words,
+)
 from pyscientificpdfparser.preprocessing import PreprocessedPage
 
 
 @mock.patch("pyscientificpdfparser.core.output")
 @mock.patch("pyscientificpdfparser.core.sectioning")
-@mock.patch("pyscientificpdfparser.core.table_recognizer")
-@mock.patch("pyscientificpdfparser.core.layout_analyzer")
 @mock.patch("pyscientificpdfparser.core.ocr")
 @mock.patch("pyscientificpdfparser.core.preprocessing")
 def test_parse_pdf_orchestration(
     mock_preprocessing: mock.MagicMock,
     mock_ocr: mock.MagicMock,
-    mock_layout_analyzer: mock.MagicMock,
-    mock_table_recognizer: mock.MagicMock,
     mock_sectioning: mock.MagicMock,
     mock_output: mock.MagicMock,
 ) -> None:
@@ -27,24 +32,35 @@ def test_parse_pdf_orchestration(
     Tests that the main parse_pdf function calls all pipeline stages in order.
     """
     # --- Arrange ---
+    # Preloaded models are passed in, so the model registry is not used
+    mock_layout_analyzer = mock.MagicMock()
+    mock_table_recognizer = mock.MagicMock()
     # 1. Mock the return values for each stage of the pipeline
     mock_page_image = Image.new("RGB", (100, 100))
     mock_preprocessed_page = PreprocessedPage(
         page_number=1, image=mock_page_image, is_scanned=False
     )
-    mock_preprocessing.render_pdf_to_images.return_value = [mock_preprocessed_page]
+    mock_preprocessing.iter_pdf_pages.return_value = (
+        page for page in [mock_preprocessed_page]
+    )
 
     mock_ocr_block = TextBlock(text="ocr text", bbox=(10, 10, 20, 20), page_number=1)
     mock_ocr.extract_text_from_page.return_value = [mock_ocr_block]
 
-    # DLA returns a Table and a TextBlock
+    # DLA returns a Table, a TextBlock and a Figure
     mock_dla_table = Table(bbox=(30, 30, 80, 80), page_number=1, rows=[])
     mock_dla_text = TextBlock(text="dla text", bbox=(5, 5, 25, 25), page_number=1)
-    mock_layout_analyzer.analyze_page.return_value = [mock_dla_table, mock_dla_text]
+    mock_dla_figure = Figure(bbox=(0, 85, 50, 99), page_number=1, image_path="")
+    mock_layout_analyzer.input_size = None
+    mock_layout_analyzer.batch_size = 4
+    mock_layout_analyzer.analyze_pages.return_value = [
+        [mock_dla_table, mock_dla_text, mock_dla_figure]
+    ]
 
     # TSR returns the populated table
     mock_populated_table = Table(bbox=(30, 30, 80, 80), page_number=1, rows=[[]])
-    mock_table_recognizer.recognize_table.return_value = mock_populated_table
+    mock_table_recognizer.batch_size = 4
+    mock_table_recognizer.recognize_tables.return_value = [mock_populated_table]
 
     # Sectioning returns a single section
     mock_section = Section(title="Test Section", elements=[])
@@ -54,24 +70,62 @@ def test_parse_pdf_orchestration(
     dummy_output_dir = Path("output")
 
     # --- Act ---
-    document = core.parse_pdf(pdf_path=dummy_pdf_path, output_dir=dummy_output_dir)
+    document = core.parse_pdf(
+        pdf_path=dummy_pdf_path,
+        output_dir=dummy_output_dir,
+        layout_analyzer=mock_layout_analyzer,
+        table_recognizer=mock_table_recognizer,
+    )
 
     # --- Assert ---
     # 1. Verify that each pipeline stage was called once with expected args
-    mock_preprocessing.render_pdf_to_images.assert_called_once_with(dummy_pdf_path)
-    mock_ocr.extract_text_from_page.assert_called_once_with(mock_preprocessed_page)
-    mock_layout_analyzer.analyze_page.assert_called_once_with(
-        mock_page_image, 1, [mock_ocr_block]
-    )
-    mock_table_recognizer.recognize_table.assert_called_once_with(
-        mock.ANY,  # The cropped image is hard to assert, so we check for any image
-        mock_dla_table,
-        [mock_ocr_block],
-    )
-    # The final elements passed to sectioning should be the populated table and
-    # the text block
+    mock_preprocessing.iter_pdf_pages.assert_called_once_with(
+        dummy_pdf_path,
+        dpi=300,
+        layout_dpi=None,
+        workers=1,
+        cache=None,
+        enhance=False,
+        pages=None,
+    )
+    mock_ocr.get_engine.assert_called_once_with("auto")
+    # The preloaded models keep their backend unless one is asked for
+    mock_layout_analyzer.set_backend.assert_not_called()
+    mock_table_recognizer.set_backend.assert_not_called()
+    mock_ocr.extract_text_from_page.assert_called_once_with(
+        mock_preprocessed_page,
+        engine=mock_ocr.get_engine.return_value,
+        tiles=1,
+        cache=None,
+    )
+    mock_layout_analyzer.analyze_pages.assert_called_once_with(
+        [mock.ANY],
+        [1],
+        [[mock_ocr_block]],
+        [(100, 100)],
+        batch_size=4,
+        ocr_indexes=[mock.ANY],
+        cache=None,
+    )
+    # DLA receives the RGB view derived from the page's grayscale buffer
+    images = mock_layout_analyzer.analyze_pages.call_args.args[0]
+    assert images[0].shape == (100, 100, 3)
+    mock_table_recognizer.recognize_tables.assert_called_once_with(
+        [mock.ANY],  # The cropped image is hard to assert, so we check for any image
+        [mock_dla_table],
+        [[mock_ocr_block]],
+        [mock.ANY],  # The page's spatial index over the OCR blocks
+        batch_size=4,
+    )
+    # Figures are exported while their page image is still available
+    mock_output.save_figure_image.assert_called_once_with(
+        mock_dla_figure, mock.ANY, dummy_output_dir / "assets", 2
+    )
+    assert mock_output.save_figure_image.call_args.args[1].shape == (14, 50)
+    # The final elements passed to sectioning should be the populated table,
+    # the text block and the figure
     mock_sectioning.segment_into_sections.assert_called_once_with(
-        [mock_populated_table, mock_dla_text]
+        [mock_populated_table, mock_dla_text, mock_dla_figure]
     )
 
     # 2. Verify the final Document object
@@ -79,10 +133,257 @@ def test_parse_pdf_orchestration(
     assert document.source_pdf == str(dummy_pdf_path)
     assert document.sections == [mock_section]
 
-    # 3. Verify that the output function was called
+    # 3. Verify that the output function was called without page images,
+    # since pages are not kept alive for the whole run
     mock_output.write_outputs.assert_called_once_with(
-        document, dummy_output_dir, [mock_page_image], filename="dummy"
+        document, dummy_output_dir, filename="dummy"
+    )
+
+
+@mock.patch("pyscientificpdfparser.core.output")
+@mock.patch("pyscientificpdfparser.core.registry")
+@mock.patch("pyscientificpdfparser.core.ocr")
+@mock.patch("pyscientificpdfparser.core.preprocessing")
+def test_parse_pdf_stops_early(
+    mock_preprocessing: mock.MagicMock,
+    mock_ocr: mock.MagicMock,
+    mock_registry: mock.MagicMock,
+    mock_output: mock.MagicMock,
+) -> None:
+    """
+    Tests that no page is processed after the stop condition holds.
+    """
+    # --- Arrange ---
+    # Without preloaded models, the models come from the default registry
+    mock_layout_analyzer = mock_registry.default_registry.layout_analyzer
+    rendered = []
+
+    def render_pages() -> Generator[PreprocessedPage, None, None]:
+        for number in (2, 3, 4):
+            rendered.append(number)
+            yield PreprocessedPage(
+                page_number=number, image=Image.new("L", (10, 10)), is_scanned=False
+            )
+
+    page_iterator = render_pages()
+    mock_preprocessing.iter_pdf_pages.return_value = page_iterator
+    references = TextBlock(text="References", bbox=(0, 0, 5, 5), page_number=3)
+    mock_ocr.extract_text_from_page.side_effect = [
+        [TextBlock(text="Intro", bbox=(0, 0, 5, 5), page_number=2)],
+        [references],
+    ]
+    mock_layout_analyzer.input_size = None
+    mock_layout_analyzer.batch_size = 4
+    mock_layout_analyzer.analyze_pages.side_effect = (
+        lambda images, numbers, blocks, sizes, **_: blocks
+    )
+
+    # --- Act ---
+    document = core.parse_pdf(
+        pdf_path=Path("dummy.pdf"),
+        pages=[2, 3, 4],
+        stop_condition=sectioning.starts_section("References"),
+    )
+
+    # --- Assert ---
+    assert mock_preprocessing.iter_pdf_pages.call_args.kwargs["pages"] == [2, 3, 4]
+    # With a stop condition, pages are analyzed one at a time, so page 4 is
+    # never rendered and the page iterator is closed
+    assert all(
+        call.kwargs["batch_size"] == 1
+        for call in mock_layout_analyzer.analyze_pages.call_args_list
+    )
+    assert rendered == [2, 3]
+    assert mock_ocr.extract_text_from_page.call_count == 2
+    assert inspect.getgeneratorstate(page_iterator) == inspect.GEN_CLOSED
+    assert [section.title for section in document.sections] == [
+        "Header",
+        "References",
+    ]
+
+
+@mock.patch("pyscientificpdfparser.core.output")
+@mock.patch("pyscientificpdfparser.core.ocr")
+@mock.patch("pyscientificpdfparser.core.preprocessing")
+def test_parse_pdf_batches_tables_across_pages(
+    mock_preprocessing: mock.MagicMock,
+    mock_ocr: mock.MagicMock,
+    mock_output: mock.MagicMock,
+) -> None:
+    """
+    Tests that tables of several pages share forward passes of the table model.
+    """
+    # --- Arrange ---
+    mock_layout_analyzer = mock.MagicMock()
+    mock_table_recognizer = mock.MagicMock()
+    mock_preprocessing.iter_pdf_pages.return_value = (
+        PreprocessedPage(
+            page_number=number, image=Image.new("L", (100, 100)), is_scanned=False
+        )
+        for number in (1, 2, 3)
+    )
+    # OCR finds one paragraph-level block of two words per page
+    words = [
+        TextBlock(text="a", bbox=(0, 30, 40, 40), page_number=1),
+        TextBlock(text="b", bbox=(50, 30, 90, 40), page_number=1),
+    ]
+    paragraph = TextBlock(
+        text="a b",
+        bbox=(0, 30, 90, 40),
+        page_number=1,
+        words=Words(["a", "b"], [(0, 30, 40, 40), (50, 30, 90, 40)], [None, None]),
+    )
+    mock_ocr.extract_text_from_page.return_value = [paragraph]
+    mock_layout_analyzer.input_size = None
+    # Pages are analyzed one at a time; each has a text block and a table
+    mock_layout_analyzer.batch_size = 1
+    mock_layout_analyzer.analyze_pages.side_effect = lambda images, numbers, *_, **__: [
+        [
+            TextBlock(text=f"Page {number}", bbox=(0, 0, 90, 10), page_number=number),
+            Table(bbox=(0, 20, 90, 90), page_number=number, rows=[]),
+        ]
+        for number in numbers
+    ]
+    mock_table_recognizer.recognize_tables.side_effect = (
+        lambda images, tables, *_, **__: [
+            table.model_copy(update={"caption": "recognized"}) for table in tables
+        ]
+    )
+
+    # --- Act ---
+    document = core.parse_pdf(
+        pdf_path=Path("dummy.pdf"),
+        table_batch_size=2,
+        inference_backend="quantized",
+        layout_analyzer=mock_layout_analyzer,
+        table_recognizer=mock_table_recognizer,
+    )
+
+    # --- Assert ---
+    mock_layout_analyzer.set_backend.assert_called_once_with("quantized", None, None)
+    mock_table_recognizer.set_backend.assert_called_once_with("quantized", None, None)
+    # A full batch of the tables of pages 1 and 2, then the last table
+    calls = mock_table_recognizer.recognize_tables.call_args_list
+    assert [[table.page_number for table in call.args[1]] for call in calls] == [
+        [1, 2],
+        [3],
+    ]
+    assert all(call.kwargs["batch_size"] == 2 for call in calls)
+    assert calls[0].args[0][0].shape == (70, 90)
+    # Table crops are copies, so pending tables do not keep their page alive
+    assert all(image.base is None for call in calls for image in call.args[0])
+    # Tables are filled from the words of their page, not its OCR blocks
+    assert calls[0].args[2] == [words, words]
+    # The recognized tables replace the detected ones, in reading order
+    elements = [
+        element for section in document.sections for element in section.elements
+    ]
+    assert [type(element).__name__ for element in elements] == [
+        "TextBlock",
+        "Table",
+    ] * 3
+    assert all(
+        element.caption == "recognized"
+        for element in elements
+        if isinstance(element, Table)
+    )
+
+
+@mock.patch("pyscientificpdfparser.core.output")
+@mock.patch("pyscientificpdfparser.core.ocr")
+@mock.patch("pyscientificpdfparser.core.preprocessing")
+def test_parse_pdf_skips_empty_crops(
+    mock_preprocessing: mock.MagicMock,
+    mock_ocr: mock.MagicMock,
+    mock_output: mock.MagicMock,
+) -> None:
+    """
+    Tests that tables and figures without pixels on the page are not cropped.
+    """
+    # --- Arrange ---
+    mock_layout_analyzer = mock.MagicMock()
+    mock_table_recognizer = mock.MagicMock()
+    mock_preprocessing.iter_pdf_pages.return_value = (
+        page
+        for page in [
+            PreprocessedPage(
+                page_number=1, image=Image.new("L", (100, 90)), is_scanned=False
+            )
+        ]
+    )
+    mock_ocr.extract_text_from_page.return_value = []
+    mock_layout_analyzer.input_size = None
+    mock_layout_analyzer.batch_size = 1
+    # A table beyond the right edge of the page, and a figure without width
+    table = Table(bbox=(120, 0, 150, 90), page_number=1, rows=[])
+    figure = Figure(bbox=(40.2, 10, 40.7, 80), page_number=1, image_path="")
+    mock_layout_analyzer.analyze_pages.return_value = [[table, figure]]
+
+    # --- Act ---
+    document = core.parse_pdf(
+        pdf_path=Path("dummy.pdf"),
+        output_dir=Path("output"),
+        layout_analyzer=mock_layout_analyzer,
+        table_recognizer=mock_table_recognizer,
+    )
+
+    # --- Assert: The elements are kept as detected ---
+    mock_table_recognizer.recognize_tables.assert_not_called()
+    mock_output.save_figure_image.assert_not_called()
+    assert [
+        element for section in document.sections for element in section.elements
+    ] == [table, figure]
+
+
+@mock.patch("pyscientificpdfparser.core.output")
+@mock.patch("pyscientificpdfparser.core.ocr")
+@mock.patch("pyscientificpdfparser.core.preprocessing")
+def test_parse_pdf_layout_first(
+    mock_preprocessing: mock.MagicMock,
+    mock_ocr: mock.MagicMock,
+    mock_output: mock.MagicMock,
+) -> None:
+    """
+    Tests that scanned pages are OCR'd region by region in layout-first mode.
+    """
+    # --- Arrange ---
+    mock_layout_analyzer = mock.MagicMock()
+    scanned_page = PreprocessedPage(
+        page_number=1, image=Image.new("L", (100, 100)), is_scanned=True
+    )
+    mock_preprocessing.iter_pdf_pages.return_value = (page for page in [scanned_page])
+    region = TextBlock(text="", bbox=(10, 10, 90, 40), page_number=1)
+    ocr_block = TextBlock(text="region text", bbox=(12, 12, 80, 30), page_number=1)
+    filled = TextBlock(text="region text", bbox=(10, 10, 90, 40), page_number=1)
+    mock_layout_analyzer.input_size = None
+    mock_layout_analyzer.batch_size = 4
+    mock_layout_analyzer.is_available = True
+    mock_layout_analyzer.detect_regions_batch.return_value = [[region]]
+    mock_ocr.extract_text_from_regions.return_value = [ocr_block]
+    mock_layout_analyzer.associate_text.return_value = [filled]
+
+    # --- Act ---
+    document = core.parse_pdf(
+        pdf_path=Path("dummy.pdf"),
+        layout_first=True,
+        layout_analyzer=mock_layout_analyzer,
+        table_recognizer=mock.MagicMock(),
+    )
+
+    # --- Assert ---
+    mock_layout_analyzer.detect_regions_batch.assert_called_once_with(
+        [mock.ANY], [1], [(100, 100)], batch_size=4, cache=None
+    )
+    mock_ocr.extract_text_from_regions.assert_called_once_with(
+        scanned_page, [region], engine=mock_ocr.get_engine.return_value
+    )
+    mock_layout_analyzer.associate_text.assert_called_once_with(
+        [region], [ocr_block], mock.ANY
     )
+    # Whole-page OCR and the combined DLA call are skipped
+    mock_ocr.extract_text_from_page.assert_not_called()
+    mock_layout_analyzer.analyze_pages.assert_not_called()
+    assert document.sections[0].elements == [filled]
 
 
 def test_parse_pdf_integration() -> None:
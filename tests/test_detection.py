@@ -0,0 +1,111 @@
+# tests/test_detection.py
+import pytest
+import torch
+
+from pyscientificpdfparser.detection import (
+    batched_nms,
+    box_iou,
+    class_thresholds,
+    postprocess,
+)
+
+
+def test_box_iou() -> None:
+    """
+    Tests the pairwise IoU of two sets of boxes.
+    """
+    boxes = torch.tensor([[0.0, 0.0, 10.0, 10.0], [5.0, 0.0, 15.0, 10.0]])
+    far = torch.tensor([[20.0, 20.0, 30.0, 30.0]])
+
+    iou = box_iou(boxes, torch.cat([boxes, far]))
+
+    assert iou.shape == (2, 3)
+    assert iou[0, 0] == pytest.approx(1.0)
+    assert iou[0, 1] == pytest.approx(50 / 150)
+    assert iou[1, 2] == 0
+
+
+def test_batched_nms_is_class_aware() -> None:
+    """
+    Tests that overlapping boxes only suppress boxes of their own class.
+    """
+    # Arrange: two overlapping text boxes and a table on top of them
+    boxes = torch.tensor(
+        [
+            [0.0, 0.0, 10.0, 10.0],
+            [1.0, 0.0, 11.0, 10.0],
+            [0.0, 0.0, 10.0, 10.0],
+            [50.0, 50.0, 60.0, 60.0],
+        ]
+    )
+    scores = torch.tensor([0.6, 0.9, 0.5, 0.7])
+    labels = torch.tensor([1, 1, 2, 1])
+
+    # Act
+    kept = batched_nms(boxes, scores, labels, iou_threshold=0.5)
+
+    # Assert: the weaker text duplicate is dropped, results by decreasing score
+    assert kept.tolist() == [1, 3, 2]
+    assert batched_nms(boxes[:0], scores[:0], labels[:0], 0.5).numel() == 0
+
+
+def test_postprocess() -> None:
+    """
+    Tests scoring, per-class thresholds, NMS and box denormalization.
+    """
+    # Arrange: one page with five queries over classes (title, text, table)
+    # and "no object"
+    logits = torch.tensor(
+        [
+            [
+                [0.0, 5.0, 0.0, 0.0],  # Confident text
+                [0.0, 4.0, 0.0, 0.0],  # Duplicate of the first text box
+                [0.0, 0.0, 1.0, 0.0],  # Unsure table
+                [5.0, 0.0, 0.0, 0.0],  # Title, not kept
+                [0.0, 0.0, 2.0, 9.0],  # Most likely no object at all
+            ]
+        ]
+    )
+    pred_boxes = torch.tensor(
+        [
+            [
+                [0.1, 0.1, 0.5, 0.2],
+                [0.1, 0.1, 0.5, 0.21],
+                [0.1, 0.5, 0.9, 0.9],
+                [0.1, 0.0, 0.9, 0.05],
+                [0.0, 0.0, 1.0, 1.0],
+            ]
+        ]
+    )
+    thresholds = class_thresholds({0: "title", 1: "text", 2: "table"}, {"table": 0.6})
+
+    # Act
+    (page,) = postprocess(
+        logits, pred_boxes, [(1000, 2000)], thresholds, 0.5, keep_labels=[1, 2]
+    )
+    (lenient,) = postprocess(logits, pred_boxes, [(1000, 2000)], 0.0, None, [1, 2])
+
+    # Assert
+    assert page.labels == [1]
+    assert page.scores[0] == pytest.approx(torch.softmax(logits[0, 0], 0)[1].item())
+    assert page.boxes[0] == pytest.approx((100.0, 200.0, 500.0, 400.0))
+    # A "no object" query is never a detection of its own, only a weak
+    # detection of the best object class
+    assert lenient.labels == [1, 1, 2, 2]
+    assert lenient.scores[-1] == pytest.approx(torch.softmax(logits[0, 4], 0)[2].item())
+    assert class_thresholds({0: "text"}, 0.4) == 0.4
+
+
+def test_postprocess_clamps_boxes_to_the_image() -> None:
+    """
+    Tests that boxes are clamped to the image, and dropped if outside of it.
+    """
+    # Arrange: one box sticking out of the image, one entirely outside of it
+    logits = torch.tensor([[[5.0, 0.0], [5.0, 0.0]]])
+    pred_boxes = torch.tensor([[[-0.2, 0.5, 0.5, 1.3], [1.1, 0.2, 1.4, 0.4]]])
+
+    # Act
+    (page,) = postprocess(logits, pred_boxes, [(1000, 2000)])
+
+    # Assert
+    assert page.boxes == [pytest.approx((0.0, 1000.0, 500.0, 2000.0))]
@@ -1,15 +1,17 @@
 # tests/test_dla.py
+import pathlib
 from unittest import mock
 
 import pytest
 import torch
 from PIL import Image
 
+from pyscientificpdfparser.cache import DiskCache
 from pyscientificpdfparser.dla import LayoutAnalyzer
 from pyscientificpdfparser.models import Table, TextBlock
 
 
-def create_mock_model_output() -> dict[str, torch.Tensor]:
+def create_mock_model_output(pages: int = 1) -> dict[str, torch.Tensor]:
     """Creates a mock output similar to what LayoutLMv3ForObjectDetection produces."""
     # Mock two predicted boxes and their classes
     # Mock logits for 2 boxes, with 5 possible classes each
@@ -19,14 +21,19 @@ def create_mock_model_output() -> dict[str, torch.Tensor]:
             [0.0, 0.0, 0.9, 0.1, 0.0],  # Prediction for box 2 -> Class 2 ("table")
         ]
     )
-    # Mock two corresponding bounding boxes (normalized)
+    # Mock two corresponding bounding boxes, normalized (center x, center y,
+    # width, height) as DETR-style heads predict them
     pred_boxes = torch.tensor(
         [
-            [0.1, 0.1, 0.8, 0.4],  # Box for the text block
-            [0.1, 0.5, 0.8, 0.9],  # Box for the table
+            [0.45, 0.25, 0.7, 0.3],  # Box for the text block, (0.1, 0.1, 0.8, 0.4)
+            [0.45, 0.7, 0.7, 0.4],  # Box for the table, (0.1, 0.5, 0.8, 0.9)
         ]
     )
-    return {"logits": logits, "pred_boxes": pred_boxes}
+    # The model returns a batch of predictions, one per page
+    return {
+        "logits": logits.repeat(pages, 1, 1),
+        "pred_boxes": pred_boxes.repeat(pages, 1, 1),
+    }
 
 
 @mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
@@ -101,6 +108,222 @@ def test_layout_analyzer(
     assert final_table.bbox == pytest.approx((100.0, 750.0, 800.0, 1350.0))
 
 
+@mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.dla.AutoProcessor")
+def test_layout_analyzer_detects_regions_before_ocr(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that region detection and text association can run separately.
+    """
+    # --- Arrange ---
+    mock_model = mock_model_cls.from_pretrained.return_value
+    mock_model.return_value = create_mock_model_output()
+    mock_model.config.id2label = {0: "title", 1: "text", 2: "table"}
+    analyzer = LayoutAnalyzer()
+
+    # --- Act ---
+    # The regions are mapped to the page size, not the (smaller) image size
+    regions = analyzer.detect_regions(
+        Image.new("L", (100, 150)), page_number=2, page_size=(1000, 1500)
+    )
+    ocr_block = TextBlock(text="Region text.", bbox=(150, 160, 300, 180), page_number=2)
+    layout_elements = analyzer.associate_text(regions, [ocr_block])
+
+    # --- Assert ---
+    assert analyzer.is_available
+    assert [type(region) for region in regions] == [TextBlock, Table]
+    assert regions[0].bbox == pytest.approx((100.0, 150.0, 800.0, 600.0))
+    assert isinstance(layout_elements[0], TextBlock)
+    assert layout_elements[0].text == "Region text."
+    assert isinstance(layout_elements[1], Table)
+
+
+@mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.dla.AutoProcessor")
+def test_layout_analyzer_analyzes_pages_in_batches(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that several pages share a forward pass and get their own elements.
+    """
+    # --- Arrange ---
+    mock_processor = mock_processor_cls.from_pretrained.return_value
+    mock_model = mock_model_cls.from_pretrained.return_value
+    mock_model.side_effect = [create_mock_model_output(2), create_mock_model_output(1)]
+    mock_model.config.id2label = {0: "title", 1: "text", 2: "table"}
+    analyzer = LayoutAnalyzer(batch_size=2)
+    ocr_blocks = [
+        [TextBlock(text=f"Page {n}.", bbox=(300, 400, 600, 500), page_number=n)]
+        for n in (1, 2, 3)
+    ]
+
+    # --- Act ---
+    pages = analyzer.analyze_pages(
+        [Image.new("L", (100, 150))] * 3,
+        [1, 2, 3],
+        ocr_blocks,
+        [(1000, 1500), (1000, 1500), (2000, 3000)],
+    )
+
+    # --- Assert ---
+    # Three pages in batches of two take two forward passes
+    assert mock_model.call_count == 2
+    assert [len(call.kwargs["images"]) for call in mock_processor.call_args_list] == [
+        2,
+        1,
+    ]
+    assert len(pages) == 3
+    for number, elements in zip((1, 2, 3), pages):
+        assert [type(element) for element in elements] == [TextBlock, Table]
+        assert all(element.page_number == number for element in elements)
+    assert isinstance(pages[1][0], TextBlock)
+    assert pages[1][0].text == "Page 2."
+    # Each page is mapped to its own coordinate space
+    assert pages[2][1].bbox == pytest.approx((200.0, 1500.0, 1600.0, 2700.0))
+
+
+@mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.dla.AutoProcessor")
+def test_layout_analyzer_associates_text_by_overlap(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that OCR blocks are assigned by center or by area overlap.
+    """
+    # --- Arrange ---
+    upper = TextBlock(text="", bbox=(0, 0, 100, 50), page_number=1)
+    lower = TextBlock(text="", bbox=(0, 40, 100, 100), page_number=1)
+    ocr_blocks = [
+        TextBlock(text="first", bbox=(10, 10, 90, 20), page_number=1),
+        # Its center lies in both regions, but most of it lies in the lower one
+        TextBlock(text="second", bbox=(10, 36, 90, 62), page_number=1),
+    ]
+
+    # --- Act ---
+    by_center = LayoutAnalyzer().associate_text(
+        [upper.model_copy(), lower.model_copy()], ocr_blocks
+    )
+    by_overlap = LayoutAnalyzer(min_overlap=0.5).associate_text(
+        [upper.model_copy(), lower.model_copy()], ocr_blocks
+    )
+
+    # --- Assert ---
+    assert [element.text for element in by_center] == [
+        "first second",
+        "second",
+    ]
+    assert [element.text for element in by_overlap] == [
+        "first",
+        "second",
+    ]
+
+
+@mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.dla.AutoProcessor")
+def test_layout_analyzer_filters_regions(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that unsure and duplicate regions are dropped and scores are kept.
+    """
+    # --- Arrange ---
+    mock_model = mock_model_cls.from_pretrained.return_value
+    mock_model.return_value = {
+        "logits": torch.tensor(
+            [
+                [
+                    [0.0, 6.0, 0.0, 0.0],  # Text
+                    [0.0, 5.0, 0.0, 0.0],  # The same text, detected twice
+                    [0.0, 0.0, 1.0, 0.0],  # An unsure table
+                    [0.0, 0.0, 0.0, 6.0],  # The "no object" class
+                ]
+            ]
+        ),
+        "pred_boxes": torch.tensor(
+            [
+                [
+                    [0.45, 0.25, 0.7, 0.3],
+                    [0.45, 0.26, 0.7, 0.32],
+                    [0.45, 0.7, 0.7, 0.4],
+                    [0.5, 0.5, 1.0, 1.0],
+                ]
+            ]
+        ),
+    }
+    mock_model.config.id2label = {0: "title", 1: "text", 2: "table"}
+
+    # --- Act ---
+    default = LayoutAnalyzer().detect_regions(Image.new("L", (100, 100)), 1)
+    strict = LayoutAnalyzer(score_threshold={"table": 0.9}).detect_regions(
+        Image.new("L", (100, 100)), 1
+    )
+    unfiltered = LayoutAnalyzer(score_threshold=0.0, nms_threshold=None)
+    all_regions = unfiltered.detect_regions(Image.new("L", (100, 100)), 1)
+
+    # --- Assert ---
+    assert [type(region) for region in default] == [TextBlock, Table]
+    assert default[0].score == pytest.approx(
+        torch.softmax(torch.tensor([0.0, 6.0, 0.0, 0.0]), 0)[1].item()
+    )
+    assert default[0].bbox == pytest.approx((10.0, 10.0, 80.0, 40.0))
+    assert [type(region) for region in strict] == [TextBlock]
+    assert [type(region) for region in all_regions] == [TextBlock, TextBlock, Table]
+
+
+@mock.patch("pyscientificpdfparser.dla.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.dla.AutoProcessor")
+def test_layout_analyzer_uses_layout_cache(
+    mock_processor_cls: mock.MagicMock,
+    mock_model_cls: mock.MagicMock,
+    tmp_path: pathlib.Path,
+) -> None:
+    """
+    Tests that cached pages skip the model but are still mapped and filled.
+    """
+    # --- Arrange ---
+    mock_processor = mock_processor_cls.from_pretrained.return_value
+    mock_model = mock_model_cls.from_pretrained.return_value
+    mock_model.side_effect = lambda **inputs: create_mock_model_output()
+    mock_model.config.id2label = {0: "title", 1: "text", 2: "table"}
+    mock_model.config._commit_hash = "abc123"
+    analyzer = LayoutAnalyzer()
+    cache = DiskCache(tmp_path)
+    image = Image.new("L", (100, 150))
+    other_image = Image.new("L", (100, 150), color=128)
+    ocr_block = TextBlock(text="Cached.", bbox=(150, 160, 300, 180), page_number=1)
+    larger_block = TextBlock(text="Cached.", bbox=(300, 320, 600, 360), page_number=1)
+
+    # --- Act ---
+    first = analyzer.analyze_pages(
+        [image], [1], [[ocr_block]], [(1000, 1500)], cache=cache
+    )
+    # The same image again, on a page of another size, and a new image
+    second = analyzer.analyze_pages(
+        [image, other_image],
+        [1, 2],
+        [[larger_block], []],
+        [(2000, 3000), None],
+        cache=cache,
+    )
+    # Other post-processing settings do not reuse the cached detections
+    analyzer.nms_threshold = None
+    analyzer.detect_regions(image, 1, cache=cache)
+
+    # --- Assert ---
+    assert mock_model.call_count == 3
+    # Only the new image went through the model on the second call
+    assert len(mock_processor.call_args_list[1].kwargs["images"]) == 1
+    assert (cache.hits, cache.misses) == (1, 3)
+    assert analyzer.model_revision == "abc123"
+    assert isinstance(first[0][0], TextBlock) and first[0][0].text == "Cached."
+    assert isinstance(second[0][0], TextBlock) and second[0][0].text == "Cached."
+    assert first[0][1].bbox == pytest.approx((100.0, 750.0, 800.0, 1350.0))
+    assert second[0][1].bbox == pytest.approx((200.0, 1500.0, 1600.0, 2700.0))
+    assert second[0][1].score == pytest.approx(first[0][1].score)
+    assert second[1][0].bbox == pytest.approx((10.0, 75.0, 80.0, 135.0))
+
+
 @mock.patch("pyscientificpdfparser.dla.AutoProcessor.from_pretrained")
 def test_layout_analyzer_handles_model_loading_error(
     mock_from_pretrained: mock.MagicMock,
@@ -117,6 +340,7 @@ def test_layout_analyzer_handles_model_loading_error(
     # Assert: The internal model and processor should be None
     assert analyzer.model is None
     assert analyzer.processor is None
+    assert not analyzer.is_available
 
     # Further Act: Check if analyze_page falls back gracefully
     layout_elements = analyzer.analyze_page(
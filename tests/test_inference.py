@@ -0,0 +1,259 @@
+# tests/test_inference.py
+import pathlib
+from typing import Any
+from unittest import mock
+
+import pytest
+import torch
+
+from pyscientificpdfparser import inference
+from pyscientificpdfparser.dla import LayoutAnalyzer
+from pyscientificpdfparser.inference import (
+    BackendMixin,
+    EagerBackend,
+    OnnxBackend,
+    QuantizedBackend,
+    create_backend,
+    onnx_file_name,
+)
+from pyscientificpdfparser.tsr import TableRecognizer
+
+
+class TinyDetector(torch.nn.Module):
+    """A stand-in for a detection model: queries in, logits and boxes out."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        torch.manual_seed(0)
+        self.encoder = torch.nn.Linear(16, 64)
+        self.classifier = torch.nn.Linear(64, 5)
+        self.box_head = torch.nn.Linear(64, 4)
+
+    def forward(self, pixel_values: torch.Tensor) -> dict[str, torch.Tensor]:
+        hidden = torch.relu(self.encoder(pixel_values))
+        return {
+            "logits": self.classifier(hidden),
+            "pred_boxes": torch.sigmoid(self.box_head(hidden)),
+        }
+
+
+class TinyImageDetector(torch.nn.Module):
+    """A stand-in taking padded images and their mask, like DETR models."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        torch.manual_seed(0)
+        self.classifier = torch.nn.Linear(3, 10 * 5)
+        self.box_head = torch.nn.Linear(3, 10 * 4)
+
+    def forward(
+        self, pixel_values: torch.Tensor, pixel_mask: torch.Tensor
+    ) -> dict[str, torch.Tensor]:
+        mask = pixel_mask[:, None].to(pixel_values.dtype)
+        pooled = (pixel_values * mask).sum(dim=(2, 3)) / mask.sum(dim=(2, 3))
+        return {
+            "logits": self.classifier(pooled).reshape(-1, 10, 5),
+            "pred_boxes": torch.sigmoid(self.box_head(pooled)).reshape(-1, 10, 4),
+        }
+
+
+def make_image_inputs(batch: int, height: int, width: int) -> dict[str, torch.Tensor]:
+    """A padded batch of images, as a DETR processor returns it."""
+    torch.manual_seed(batch)
+    pixel_mask = torch.zeros(batch, height, width, dtype=torch.long)
+    pixel_mask[:, : height - 3, : width - 5] = 1
+    return {
+        "pixel_values": torch.randn(batch, 3, height, width),
+        "pixel_mask": pixel_mask,
+    }
+
+
+def make_inputs() -> dict[str, torch.Tensor]:
+    """A batch of two pages with ten queries each."""
+    torch.manual_seed(1)
+    return {"pixel_values": torch.randn(2, 10, 16)}
+
+
+def test_eager_and_quantized_backends_agree() -> None:
+    """
+    Tests that the int8 backend stays close to the eager model it was built from.
+    """
+    # Arrange
+    model = TinyDetector().eval()
+    inputs = make_inputs()
+
+    # Act
+    eager = EagerBackend(model)(inputs)
+    quantized = QuantizedBackend(model)(inputs)
+
+    # Assert
+    assert eager["logits"].shape == quantized["logits"].shape == (2, 10, 5)
+    assert not eager["logits"].requires_grad
+    assert torch.allclose(eager["pred_boxes"], quantized["pred_boxes"], atol=0.05)
+    agreement = (
+        (eager["logits"].argmax(-1) == quantized["logits"].argmax(-1)).float().mean()
+    )
+    assert agreement >= 0.9
+    # The eager model itself is not modified
+    assert isinstance(model.encoder, torch.nn.Linear)
+
+
+def test_create_backend() -> None:
+    """
+    Tests backend selection by name and the errors for unusable backends.
+    """
+    model = TinyDetector().eval()
+    with pytest.raises(TypeError):
+        inference.InferenceBackend()
+    assert isinstance(create_backend("eager", model), EagerBackend)
+    assert isinstance(create_backend("quantized", model), QuantizedBackend)
+    with pytest.raises(ValueError):
+        create_backend("tensorrt", model)
+    with mock.patch.object(inference, "onnxruntime", None):
+        with pytest.raises(ImportError):
+            create_backend("onnx", model)
+
+
+def test_onnx_backend_matches_eager(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that the exported ONNX Runtime session reproduces the eager outputs.
+    """
+    pytest.importorskip("onnxruntime")
+    # Arrange
+    model = TinyDetector().eval()
+    inputs = make_inputs()
+    backend = create_backend(
+        "onnx", model, intra_op_threads=1, onnx_dir=tmp_path, model_name="org/tiny"
+    )
+
+    # Act
+    outputs = backend(inputs)
+
+    # Assert
+    assert isinstance(backend, OnnxBackend)
+    assert (tmp_path / onnx_file_name("org/tiny", model)).exists()
+    eager = EagerBackend(model)(inputs)
+    for name in ("logits", "pred_boxes"):
+        assert torch.allclose(outputs[name], eager[name], atol=1e-4)
+    # The batch dimension is dynamic
+    single = backend({"pixel_values": inputs["pixel_values"][:1]})
+    assert single["logits"].shape == (1, 10, 5)
+
+
+def test_onnx_file_name() -> None:
+    """
+    Tests that exports of other model revisions or torch versions do not clash.
+    """
+    model = mock.MagicMock(spec=torch.nn.Module)
+    model.config = mock.MagicMock(_commit_hash="abc123")
+
+    name = onnx_file_name("org/tiny", model)
+
+    assert name == f"org--tiny-abc123-torch{torch.__version__}.onnx"
+    assert "/" not in onnx_file_name("org/tiny", object())
+    model.config._commit_hash = "def456"
+    assert onnx_file_name("org/tiny", model) != name
+
+
+def write_model(
+    model: torch.nn.Module, args: tuple[Any, ...], path: str, **_: Any
+) -> None:
+    """Stands in for `torch.onnx.export`, writing a placeholder model."""
+    pathlib.Path(path).write_bytes(b"onnx")
+
+
+def test_onnx_export_is_atomic(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that models are exported aside and only then moved into place.
+    """
+    # Arrange
+    onnx_path = tmp_path / "onnx" / "model.onnx"
+    with mock.patch.object(inference, "onnxruntime", mock.MagicMock()):
+        backend = OnnxBackend(TinyDetector().eval(), onnx_path=onnx_path)
+
+    def fail_midway(model: torch.nn.Module, args: Any, path: str, **_: Any) -> None:
+        pathlib.Path(path).write_bytes(b"partial")
+        raise RuntimeError("Export interrupted")
+
+    # Act / Assert: A failed export leaves nothing behind
+    with mock.patch.object(torch.onnx, "export", side_effect=fail_midway):
+        with pytest.raises(RuntimeError):
+            backend._export(make_inputs())
+    assert list(onnx_path.parent.iterdir()) == []
+
+    # A finished export is moved into place
+    with mock.patch.object(torch.onnx, "export", side_effect=write_model) as export:
+        backend._export(make_inputs())
+    assert export.call_args.args[2] != str(onnx_path)
+    assert list(onnx_path.parent.iterdir()) == [onnx_path]
+    assert onnx_path.read_bytes() == b"onnx"
+
+
+def test_onnx_export_marks_image_axes_dynamic(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that the batch and image size of every input are exported as dynamic.
+    """
+    # Arrange
+    with mock.patch.object(inference, "onnxruntime", mock.MagicMock()):
+        backend = OnnxBackend(TinyImageDetector().eval(), onnx_path=tmp_path / "m")
+
+    # Act
+    with mock.patch.object(torch.onnx, "export", side_effect=write_model) as export:
+        backend._export(make_image_inputs(2, 32, 48))
+
+    # Assert
+    assert export.call_args.kwargs["input_names"] == ["pixel_values", "pixel_mask"]
+    assert export.call_args.kwargs["dynamic_axes"] == {
+        "pixel_values": {0: "batch", 2: "height", 3: "width"},
+        "pixel_mask": {0: "batch", 1: "height", 2: "width"},
+        "logits": {0: "batch"},
+        "pred_boxes": {0: "batch"},
+    }
+
+
+def test_onnx_backend_runs_batches_of_other_sizes(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that a session exported from one batch runs batches of another
+    size and with larger images.
+    """
+    pytest.importorskip("onnxruntime")
+    # Arrange
+    model = TinyImageDetector().eval()
+    backend = create_backend("onnx", model, intra_op_threads=1, onnx_dir=tmp_path)
+    first = make_image_inputs(2, 32, 48)
+    second = make_image_inputs(3, 40, 36)
+
+    # Act
+    backend(first)
+    outputs = backend(second)
+
+    # Assert
+    eager = EagerBackend(model)(second)
+    assert outputs["logits"].shape == (3, 10, 5)
+    for name in ("logits", "pred_boxes"):
+        assert torch.allclose(outputs[name], eager[name], atol=1e-4)
+
+
+def test_backend_mixin_switches_backends() -> None:
+    """
+    Tests that models switch backends once per configuration, if loaded.
+    """
+
+    # Arrange: The mixin needs no more than a model and its name
+    wrapper, unloaded = BackendMixin(), BackendMixin()
+    wrapper.model, wrapper.model_name = TinyDetector().eval(), "org/tiny"
+    unloaded.model, unloaded.model_name = None, "org/tiny"
+
+    # Act
+    wrapper.set_backend("quantized")
+    runner = wrapper.runner
+    wrapper.set_backend("quantized")
+    unloaded.set_backend("quantized")
+
+    # Assert
+    assert isinstance(runner, QuantizedBackend)
+    assert wrapper.runner is runner
+    assert wrapper.backend_config == ("quantized", None, None)
+    assert unloaded.runner is None
+    assert issubclass(LayoutAnalyzer, BackendMixin)
+    assert issubclass(TableRecognizer, BackendMixin)
@@ -0,0 +1,35 @@
+# tests/test_layout.py
+from unittest import mock
+
+from pyscientificpdfparser import layout
+from pyscientificpdfparser.models import Figure, TextBlock
+from pyscientificpdfparser.server import RemoteLayoutAnalyzer
+
+
+def test_analyze_pages_fills_and_sorts_detected_regions() -> None:
+    """
+    Tests that the detected regions of each page are filled and sorted.
+    """
+    # --- Arrange ---
+    # A remote analyzer stands in for any analyzer: only detection differs
+    analyzer = mock.MagicMock(spec=RemoteLayoutAnalyzer)
+    analyzer.min_overlap = None
+    figure = Figure(bbox=(0, 60, 100, 100), page_number=1, image_path="")
+    region = TextBlock(text="", bbox=(0, 0, 100, 50), page_number=1)
+    empty_region = TextBlock(text="", bbox=(0, 200, 100, 250), page_number=1)
+    analyzer.detect_regions_batch.return_value = [[figure, empty_region, region]]
+    ocr_blocks = [TextBlock(text="Hello", bbox=(10, 10, 90, 20), page_number=1)]
+
+    # --- Act ---
+    elements = layout.analyze_pages(
+        analyzer, ["image"], [1], [ocr_blocks], [(100, 300)], batch_size=2
+    )
+
+    # --- Assert ---
+    analyzer.detect_regions_batch.assert_called_once_with(
+        ["image"], [1], [(100, 300)], 2, None
+    )
+    # Empty text regions are dropped, the others are in reading order
+    (page,) = elements
+    assert [type(element) for element in page] == [TextBlock, Figure]
+    assert page[0].text == "Hello"
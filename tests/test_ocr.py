@@ -1,11 +1,28 @@
 # tests/test_ocr.py
+import pathlib
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
 from unittest import mock
 
+import numpy as np
 import pytesseract
+import pytest
 from PIL import Image
 
-from pyscientificpdfparser.models import TextBlock
-from pyscientificpdfparser.ocr import extract_text_from_page
+from pyscientificpdfparser.cache import DiskCache
+from pyscientificpdfparser.models import Figure, Table, TextBlock
+from pyscientificpdfparser.ocr import (
+    OcrEngine,
+    PytesseractEngine,
+    TesserocrEngine,
+    _process_ocr_data,
+    extract_text_from_page,
+    extract_text_from_regions,
+    get_engine,
+    refine_low_confidence_blocks,
+)
 from pyscientificpdfparser.preprocessing import PreprocessedPage
 
 # This is a sample dictionary that mimics the output of
@@ -47,7 +64,7 @@ def test_extract_text_from_page_groups_blocks_correctly(
     )
 
     # Act
-    text_blocks = extract_text_from_page(preprocessed_page)
+    text_blocks = extract_text_from_page(preprocessed_page, engine=PytesseractEngine())
 
     # Assert
     # 1. We should get 2 text blocks from the mock data
@@ -82,8 +99,43 @@ def test_extract_text_from_page_groups_blocks_correctly(
 
     # 4. Verify that pytesseract was called correctly
     mock_image_to_data.assert_called_once_with(
-        dummy_image, lang="eng", config="", output_type=pytesseract.Output.DICT
+        mock.ANY, lang="eng", config="", output_type=pytesseract.Output.DICT
     )
+    # Scanned pages are read from their binarized view
+    assert mock_image_to_data.call_args.args[0] is preprocessed_page.binarized
+
+
+def test_process_ocr_data_keeps_block_and_word_order() -> None:
+    """
+    Tests the columnar grouping of interleaved Tesseract blocks.
+    """
+    # Arrange: Block 7 appears first and its words are interleaved with block 3
+    ocr_data: dict[str, list[str | int]] = {
+        "block_num": [7, 3, 7, 3, 3],
+        "left": [0, 100, 40, 150, 0],
+        "top": [0, 50, 2, 50, 0],
+        "width": [30, 40, 30, 40, 10],
+        "height": [10, 10, 10, 12, 10],
+        "conf": ["90", "80", "70.5", "60", "-1"],
+        "text": ["first", "second", "block", "block", "   "],
+    }
+
+    # Act
+    text_blocks = _process_ocr_data(ocr_data, page_number=4, scale=0.5)
+
+    # Assert
+    assert [block.text for block in text_blocks] == ["first block", "second block"]
+    assert text_blocks[0].bbox == (0.0, 0.0, 140.0, 24.0)
+    assert text_blocks[1].bbox == (200.0, 100.0, 380.0, 124.0)
+    assert text_blocks[0].confidence == 80.25
+    assert text_blocks[1].confidence == 70.0
+    # The words of each block are kept as columns, in page coordinates
+    first_words, second_words = text_blocks[0].words, text_blocks[1].words
+    assert first_words is not None and second_words is not None
+    assert first_words.texts == ["first", "block"]
+    assert second_words.boxes[1] == (300.0, 100.0, 380.0, 124.0)
+    assert second_words.confidences[1] == 60.0
+    assert _process_ocr_data({**ocr_data, "conf": [-1] * 5}, page_number=4) == []
 
 
 @mock.patch("pytesseract.image_to_data")
@@ -101,7 +153,430 @@ def test_extract_text_handles_tesseract_not_found(
     )
 
     # Act
-    text_blocks = extract_text_from_page(preprocessed_page)
+    text_blocks = extract_text_from_page(preprocessed_page, engine=PytesseractEngine())
 
     # Assert
     assert text_blocks == []
+
+
+@mock.patch("pytesseract.image_to_data")
+def test_extract_text_uses_text_layer_for_digital_pages(
+    mock_image_to_data: mock.MagicMock,
+) -> None:
+    """
+    Tests that digital pages are read from their text layer without Tesseract.
+    """
+    # Arrange: Two PyMuPDF blocks, the second with two lines
+    text_layer = [
+        (10.0, 10.0, 60.0, 20.0, "Hello", 0, 0, 0),
+        (65.0, 12.0, 115.0, 22.0, "world", 0, 0, 1),
+        (200.0, 62.0, 245.0, 72.0, "works.", 1, 1, 0),
+        (200.0, 50.0, 240.0, 60.0, "This", 1, 0, 0),
+    ]
+    preprocessed_page = PreprocessedPage(
+        page_number=3,
+        image=Image.new("L", (300, 100)),
+        is_scanned=False,
+        text_layer=text_layer,
+    )
+
+    # Act
+    text_blocks = extract_text_from_page(preprocessed_page, engine=PytesseractEngine())
+
+    # Assert
+    mock_image_to_data.assert_not_called()
+    assert len(text_blocks) == 2
+    assert text_blocks[0].text == "Hello world"
+    assert text_blocks[0].bbox == (10.0, 10.0, 115.0, 22.0)
+    assert text_blocks[0].confidence is None
+    # Words are put back in line order within a block
+    assert text_blocks[1].text == "This works."
+    assert text_blocks[1].bbox == (200.0, 50.0, 245.0, 72.0)
+    assert text_blocks[1].words is not None
+    assert text_blocks[1].words.boxes[0] == (200.0, 50.0, 240.0, 60.0)
+    assert all(block.page_number == 3 for block in text_blocks)
+
+    # The text layer can be bypassed to force OCR
+    mock_image_to_data.return_value = MOCK_TESSERACT_DATA
+    ocr_blocks = extract_text_from_page(
+        preprocessed_page, use_text_layer=False, engine=PytesseractEngine()
+    )
+    mock_image_to_data.assert_called_once()
+    assert ocr_blocks[0].text == "Hello world !"
+
+
+def one_word_data(
+    image: np.ndarray, lang: str = "eng", config: str = ""
+) -> dict[str, list[Any]]:
+    """Tesseract output with one word, at the top left of any image."""
+    return {
+        "block_num": [1],
+        "left": [2],
+        "top": [3],
+        "width": [18],
+        "height": [7],
+        "conf": [90],
+        "text": [config],
+    }
+
+
+def test_extract_text_from_regions() -> None:
+    """
+    Tests layout-guided OCR of the text and table regions of a page.
+
+    Verifies that:
+    - Figures are not OCR'd.
+    - Each region type uses its own page segmentation mode.
+    - Blocks found in region crops are mapped back to page coordinates.
+    """
+    # Arrange
+    page = PreprocessedPage(
+        page_number=5, image=np.full((100, 200), 255, dtype=np.uint8), is_scanned=True
+    )
+    regions = [
+        TextBlock(text="", bbox=(10, 10, 90, 40), page_number=5),
+        Figure(bbox=(10, 50, 90, 95), page_number=5, image_path=""),
+        Table(bbox=(100, 10, 198, 98), page_number=5, rows=[]),
+    ]
+    engine = mock.MagicMock(spec=OcrEngine)
+    engine.image_to_data.side_effect = one_word_data
+
+    # Act
+    blocks = extract_text_from_regions(page, regions, engine=engine, padding=4)
+
+    # Assert
+    calls = sorted(
+        (call.args[0].shape, call.kwargs["config"])
+        for call in engine.image_to_data.call_args_list
+    )
+    assert calls == [((38, 88), "--psm 6"), ((94, 104), "--psm 11")]
+    assert [block.text for block in blocks] == ["--psm 6", "--psm 11"]
+    # Crops start at the region minus the padding, clamped to the page
+    assert blocks[0].bbox == (8.0, 9.0, 26.0, 16.0)
+    assert blocks[1].bbox == (98.0, 9.0, 116.0, 16.0)
+    assert all(block.page_number == 5 for block in blocks)
+
+
+def test_extract_text_from_page_in_tiles() -> None:
+    """
+    Tests OCR of a page split into overlapping bands.
+
+    Verifies that:
+    - Each band is OCR'd with its overlap.
+    - Words seen by two bands are kept once, by the band owning their center.
+    - Boxes are mapped back to page coordinates and blocks stay separate.
+    """
+    # Arrange
+    page = PreprocessedPage(
+        page_number=1, image=np.full((1024, 300), 255, dtype=np.uint8), is_scanned=True
+    )
+    # (text, top, height) of the words on the page
+    words = [("above", 100, 20), ("on-cut", 500, 30), ("below", 800, 20)]
+
+    def fake_image_to_data(
+        image: np.ndarray, lang: str = "eng", config: str = ""
+    ) -> dict[str, list[Any]]:
+        # Recover the band's position from the view into the page image
+        top = (image.ctypes.data - page.ocr_image.ctypes.data) // image.strides[0]
+        visible = [
+            (text, y - top, h)
+            for text, y, h in words
+            if y >= top and y + h <= top + image.shape[0]
+        ]
+        return {
+            "block_num": [1] * len(visible),
+            "left": [10] * len(visible),
+            "top": [y for _, y, _ in visible],
+            "width": [50] * len(visible),
+            "height": [h for _, _, h in visible],
+            "conf": [90] * len(visible),
+            "text": [text for text, _, _ in visible],
+        }
+
+    engine = mock.MagicMock(spec=OcrEngine)
+    engine.image_to_data.side_effect = fake_image_to_data
+
+    # Act
+    blocks = extract_text_from_page(page, engine=engine, tiles=2, tile_overlap=32)
+
+    # Assert
+    shapes = [call.args[0].shape for call in engine.image_to_data.call_args_list]
+    assert shapes == [(544, 300), (544, 300)]
+    assert [block.text for block in blocks] == ["above", "on-cut below"]
+    assert blocks[0].bbox == (10.0, 100.0, 60.0, 120.0)
+    assert blocks[1].bbox == (10.0, 500.0, 60.0, 820.0)
+
+    # Pages too small to split are OCR'd whole
+    engine.image_to_data.reset_mock(side_effect=True)
+    engine.image_to_data.side_effect = one_word_data
+    small_page = PreprocessedPage(
+        page_number=1, image=np.full((300, 300), 255, dtype=np.uint8), is_scanned=True
+    )
+    extract_text_from_page(small_page, engine=engine, tiles=4)
+    engine.image_to_data.assert_called_once()
+
+
+def test_tiled_ocr_reuses_threads_across_pages() -> None:
+    """
+    Tests that the bands of all pages run on one pool of `max_workers` threads.
+    """
+    # Arrange
+    threads: list[threading.Thread] = []
+
+    def fake_image_to_data(
+        image: np.ndarray, lang: str = "eng", config: str = ""
+    ) -> dict[str, list[Any]]:
+        threads.append(threading.current_thread())
+        return one_word_data(image)
+
+    engine = mock.MagicMock(spec=OcrEngine)
+    engine.image_to_data.side_effect = fake_image_to_data
+    pages = [
+        PreprocessedPage(
+            page_number=number,
+            image=np.full((1024, 300), 255, dtype=np.uint8),
+            is_scanned=True,
+        )
+        for number in range(1, 6)
+    ]
+
+    # Act
+    for page in pages:
+        extract_text_from_page(page, engine=engine, tiles=4, max_workers=2)
+
+    # Assert
+    assert len(threads) == 20
+    assert 1 <= len(set(threads)) <= 2
+    assert all(thread.is_alive() for thread in threads)
+
+
+def test_extract_text_from_page_uses_ocr_cache(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that OCR results are cached by page image, language and config.
+    """
+    # Arrange
+    cache = DiskCache(tmp_path / "ocr")
+    engine = mock.MagicMock(spec=OcrEngine)
+    engine.name, engine.version = "fake", "1.0"
+    engine.image_to_data.side_effect = one_word_data
+
+    def make_page(page_number: int) -> PreprocessedPage:
+        image = np.full((100, 100), 255, dtype=np.uint8)
+        image[40:60, 20:80] = 0
+        return PreprocessedPage(page_number=page_number, image=image, is_scanned=True)
+
+    # Act
+    first = extract_text_from_page(
+        make_page(1), config="--psm 6", engine=engine, cache=cache
+    )
+    # The same image on a different page, e.g. in a re-run of the pipeline
+    second = extract_text_from_page(
+        make_page(7), config="--psm 6", engine=engine, cache=cache
+    )
+    other_config = extract_text_from_page(
+        make_page(1), config="--psm 4", engine=engine, cache=cache
+    )
+
+    # Assert
+    assert engine.image_to_data.call_count == 2
+    assert (cache.hits, cache.misses) == (1, 2)
+    assert [b.model_dump() for b in second] == [
+        b.model_copy(update={"page_number": 7}).model_dump() for b in first
+    ]
+    # Words are cached with their blocks
+    assert first[0].words
+    assert [b.words for b in second] == [b.words for b in first]
+    assert other_config[0].text == "--psm 4"
+
+
+@mock.patch.object(PreprocessedPage, "render_for_ocr")
+def test_refine_low_confidence_blocks(mock_render: mock.MagicMock) -> None:
+    """
+    Tests selective re-OCR of low-confidence blocks at a higher resolution.
+
+    Verifies that:
+    - Only blocks below the threshold are re-rendered, with padding.
+    - A re-OCR'd block replaces the original only if its confidence is higher.
+    - Blocks without a confidence are left alone.
+    """
+    # Arrange
+    page = PreprocessedPage(
+        page_number=1,
+        image=np.full((100, 100), 255, dtype=np.uint8),
+        is_scanned=True,
+        source_path=pathlib.Path("test.pdf"),
+    )
+    blocks = [
+        TextBlock(text="good", bbox=(0, 0, 50, 10), page_number=1, confidence=95.0),
+        TextBlock(text="b4d", bbox=(0, 20, 50, 30), page_number=1, confidence=40.0),
+        TextBlock(text="w0rse", bbox=(0, 40, 50, 50), page_number=1, confidence=50.0),
+        TextBlock(text="layer", bbox=(0, 60, 50, 70), page_number=1),
+    ]
+    # The rendered crops carry the confidence the fake engine reports for them
+    crop_confidences = iter([80, 30])
+    mock_render.side_effect = lambda bbox, dpi: np.full(
+        (10, 10), next(crop_confidences), dtype=np.uint8
+    )
+
+    def fake_image_to_data(
+        image: np.ndarray, lang: str = "eng", config: str = ""
+    ) -> dict[str, list[Any]]:
+        data = one_word_data(image)
+        data["text"], data["conf"] = ["better"], [int(image[0, 0])]
+        return data
+
+    engine = mock.MagicMock(spec=OcrEngine)
+    engine.image_to_data.side_effect = fake_image_to_data
+
+    # Act
+    refined = refine_low_confidence_blocks(
+        page, blocks, threshold=60.0, dpi=600, engine=engine
+    )
+
+    # Assert
+    assert mock_render.call_args_list == [
+        mock.call((0, 18.0, 52.0, 32.0), 600),
+        mock.call((0, 38.0, 52.0, 52.0), 600),
+    ]
+    assert [block.text for block in refined] == ["good", "better", "w0rse", "layer"]
+    assert refined[1].confidence == 80.0
+    assert refined[1].bbox == blocks[1].bbox
+    # Words are mapped from the 600 DPI render back to the page
+    assert refined[1].words is not None
+    assert refined[1].words.boxes[0] == (1.0, 19.5, 10.0, 23.0)
+    assert blocks[1].text == "b4d"  # The input list is not modified
+
+
+class FakeWord:
+    """A tesserocr result iterator positioned on one word."""
+
+    def __init__(self, text: str, box: tuple[int, int, int, int], new_block: bool):
+        self.text, self.box, self.new_block = text, box, new_block
+
+    def IsAtBeginningOf(self, level: int) -> bool:
+        return self.new_block
+
+    def BoundingBox(self, level: int) -> tuple[int, int, int, int]:
+        return self.box
+
+    def Confidence(self, level: int) -> float:
+        return 90.0
+
+    def GetUTF8Text(self, level: int) -> str:
+        return self.text
+
+
+def make_fake_tesserocr() -> mock.MagicMock:
+    """Builds a stand-in for the tesserocr module with a two-block page."""
+    fake = mock.MagicMock()
+    fake.iterate_level.return_value = [
+        FakeWord("Hello", (10, 10, 60, 20), True),
+        FakeWord("world", (65, 12, 115, 22), False),
+        FakeWord("Next", (10, 50, 50, 60), True),
+    ]
+    created: list[mock.MagicMock] = []
+
+    def create_api(**kwargs: Any) -> mock.MagicMock:
+        api = mock.MagicMock(init=kwargs)
+        api.Recognize.side_effect = lambda: time.sleep(0.01)
+        created.append(api)
+        return api
+
+    create_api.created = created  # type: ignore[attr-defined]
+    fake.PyTessBaseAPI.side_effect = create_api
+    return fake
+
+
+def test_tesserocr_engine_pools_api_handles() -> None:
+    """
+    Tests the persistent tesserocr engine.
+
+    Verifies that:
+    - Images are passed to Tesseract as raw 8-bit buffers.
+    - API handles are created once per configuration and reused by later
+      calls, from any thread.
+    - Results are returned as Tesseract columns grouped into blocks.
+    """
+    # Arrange
+    fake_tesserocr = make_fake_tesserocr()
+    image = np.zeros((30, 40), dtype=np.uint8)
+    config = "--psm 6 -c tessedit_do_invert=0"
+
+    with mock.patch("pyscientificpdfparser.ocr.tesserocr", fake_tesserocr):
+        engine = TesserocrEngine()
+
+        # Act
+        data = engine.image_to_data(image, config=config)
+        # Short-lived threads, as a thread pool per page would create
+        for _ in range(3):
+            with ThreadPoolExecutor(1) as executor:
+                executor.submit(engine.image_to_data, image, config=config).result()
+        engine.image_to_data(image)
+
+        # Assert
+        assert fake_tesserocr.PyTessBaseAPI.call_count == 2
+        api = fake_tesserocr.PyTessBaseAPI.side_effect.created[0]
+        assert api.init["psm"] == 6
+        api.SetVariable.assert_called_once_with("tessedit_do_invert", "0")
+        assert api.SetImageBytes.call_args.args[1:] == (40, 30, 1, 40)
+        assert api.Recognize.call_count == 4
+
+        blocks = _process_ocr_data(data, page_number=1)
+        assert [block.text for block in blocks] == ["Hello world", "Next"]
+        assert blocks[0].bbox == (10.0, 10.0, 115.0, 22.0)
+
+        engine.close()
+        api.End.assert_called_once()
+
+
+def test_tesserocr_engine_bounds_concurrent_api_handles() -> None:
+    """
+    Tests that concurrent calls never create more handles than the pool size.
+    """
+    # Arrange
+    fake_tesserocr = make_fake_tesserocr()
+    image = np.zeros((30, 40), dtype=np.uint8)
+
+    with mock.patch("pyscientificpdfparser.ocr.tesserocr", fake_tesserocr):
+        engine = TesserocrEngine(pool_size=2)
+
+        # Act
+        with ThreadPoolExecutor(6) as executor:
+            results = list(
+                executor.map(lambda _: engine.image_to_data(image), range(12))
+            )
+
+        # Assert
+        assert all(data["text"] == ["Hello", "world", "Next"] for data in results)
+        created = fake_tesserocr.PyTessBaseAPI.side_effect.created
+        assert 1 <= len(created) <= 2
+        assert sum(api.Recognize.call_count for api in created) == 12
+
+
+def test_get_engine_falls_back_to_pytesseract() -> None:
+    """
+    Tests that pytesseract is used when tesserocr is not installed.
+    """
+    get_engine.cache_clear()
+    try:
+        with mock.patch("pyscientificpdfparser.ocr.tesserocr", None):
+            assert isinstance(get_engine(), PytesseractEngine)
+            with pytest.raises(ImportError):
+                get_engine("tesserocr")
+        with pytest.raises(ValueError):
+            get_engine("unknown")
+    finally:
+        get_engine.cache_clear()
+
+
+def test_ocr_engines_implement_the_interface() -> None:
+    """
+    Tests that the engine interface cannot be used without an implementation.
+    """
+    with pytest.raises(TypeError):
+        OcrEngine()
+    # Engines that leave out a method cannot be created either
+    version_only = type("VersionOnly", (OcrEngine,), {"version": "1.0"})
+    with pytest.raises(TypeError):
+        version_only()
+    assert PytesseractEngine().name == "pytesseract"
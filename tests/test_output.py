@@ -12,7 +12,7 @@ from pyscientificpdfparser.models import (
     TableCell,
     TextBlock,
 )
-from pyscientificpdfparser.output import write_outputs
+from pyscientificpdfparser.output import save_figure_image, write_outputs
 
 
 def test_write_outputs(tmp_path: Path) -> None:
@@ -88,3 +88,71 @@ def test_write_outputs(tmp_path: Path) -> None:
     saved_figure = Image.open(figure_file)
     # width = 100-10=90, height = 100-10=90
     assert saved_figure.size == (90, 90)
+
+
+def test_write_outputs_links_exported_figures(tmp_path: Path) -> None:
+    """
+    Tests that figures exported during parsing are linked without page images.
+    """
+    # --- Arrange ---
+    output_dir = tmp_path / "test_output"
+    assets_dir = output_dir / "assets"
+    figure = Figure(bbox=(10, 10, 100, 100), page_number=1, image_path="")
+    figure_image = Image.new("RGB", (90, 90), color="blue")
+    save_figure_image(figure, figure_image, assets_dir, 0)
+    doc = Document(
+        source_pdf="test.pdf",
+        sections=[Section(title="Figures", elements=[figure])],
+    )
+
+    # --- Act ---
+    write_outputs(document=doc, output_dir=output_dir)
+
+    # --- Assert ---
+    assert figure.image_path == "assets/figure_1_0.png"
+    assert (assets_dir / "figure_1_0.png").is_file()
+    md_content = (output_dir / "test_output.md").read_text()
+    assert "![Figure 1](assets/figure_1_0.png)" in md_content
+
+
+def test_write_outputs_renders_table_grid(tmp_path: Path) -> None:
+    """
+    Tests that header rows name the columns and spanning cells are laid out.
+    """
+    # --- Arrange ---
+    box = (0, 0, 1, 1)
+    table = Table(
+        bbox=box,
+        page_number=1,
+        rows=[
+            [
+                TableCell(text="Name", bbox=box, is_header=True),
+                TableCell(text="Value", bbox=box, is_header=True),
+                TableCell(text="Value", bbox=box, is_header=True),
+            ],
+            [
+                TableCell(text="alpha", bbox=box, row_span=2),
+                TableCell(text="1", bbox=box),
+                TableCell(text="x", bbox=box),
+            ],
+            [TableCell(text="Total 2", bbox=box, col_span=2)],
+        ],
+    )
+    doc = Document(
+        source_pdf="test.pdf",
+        sections=[Section(title="Tables", elements=[table])],
+    )
+    output_dir = tmp_path / "test_output"
+
+    # --- Act ---
+    write_outputs(document=doc, output_dir=output_dir)
+
+    # --- Assert ---
+    lines = [
+        line.replace(" ", "")
+        for line in (output_dir / "test_output.md").read_text().splitlines()
+    ]
+    assert "|Name|Value|Value(2)|" in lines
+    assert "|alpha|1|x|" in lines
+    # The second row of "alpha" is empty; "Total 2" spans the last columns
+    assert "||Total2||" in lines
@@ -1,21 +1,31 @@
 # tests/test_preprocessing.py
 import pathlib
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any
 from unittest import mock
 
+import cv2
+import fitz
+import numpy as np
+import pytest
 from PIL import Image
 
-from pyscientificpdfparser.preprocessing import render_pdf_to_images
+from pyscientificpdfparser.cache import DiskCache
+from pyscientificpdfparser.preprocessing import (
+    PreprocessedPage,
+    _pixmap_to_array,
+    crop_origin,
+    estimate_skew,
+    iter_pdf_pages,
+    render_pdf_to_images,
+)
 
 
-class MockPixmap:
-    """A mock class for the fitz.Pixmap object."""
-
-    def __init__(self, width: int = 10, height: int = 10) -> None:
-        self.width = width
-        self.height = height
-        # Create a simple black image sample
-        self.samples = bytes(width * height * 3)
+def make_pixmap(width: int = 10, height: int = 10) -> fitz.Pixmap:
+    """Creates a real, black grayscale pixmap of the given size."""
+    pix = fitz.Pixmap(fitz.csGRAY, fitz.IRect(0, 0, width, height), False)
+    pix.clear_with(0)
+    return pix
 
 
 class MockPage:
@@ -23,12 +33,21 @@ class MockPage:
 
     def __init__(self, has_text: bool = True) -> None:
         self._has_text = has_text
+        self.rotation_matrix = fitz.Identity
 
-    def get_text(self, format: str = "text") -> str:
+    def get_text(self, format: str = "text") -> Any:
+        if format == "words":
+            words = [
+                (1.0, 2.0, 3.0, 4.0, "some", 0, 0, 0),
+                (4.0, 2.0, 6.0, 4.0, "text", 0, 0, 1),
+            ]
+            return words if self._has_text else []
         return "some text" if self._has_text else ""
 
-    def get_pixmap(self, matrix: Any = None) -> MockPixmap:
-        return MockPixmap()
+    def get_pixmap(self, matrix: Any = None, colorspace: Any = None) -> fitz.Pixmap:
+        # The 10x10 point page is scaled by the render matrix
+        zoom = matrix.a if matrix is not None else 1
+        return make_pixmap(width=round(10 * zoom), height=round(10 * zoom))
 
 
 @mock.patch("fitz.open")
@@ -61,17 +80,419 @@ def test_render_pdf_to_images(mock_fitz_open: mock.MagicMock) -> None:
     page1 = preprocessed_pages[0]
     assert page1.page_number == 1
     assert not page1.is_scanned
-    assert isinstance(page1.image, Image.Image)
-    assert page1.image.mode == "L"  # Should be converted to grayscale
-    assert page1.image.size == (10, 10)
+    assert isinstance(page1.image, np.ndarray)
+    assert page1.image.shape == (10, 10)  # Rendered straight to grayscale
 
     # 3. Check Page 2 (Scanned)
     page2 = preprocessed_pages[1]
     assert page2.page_number == 2
     assert page2.is_scanned
-    assert isinstance(page2.image, Image.Image)
-    assert page2.image.mode == "L"  # Binarization results in a grayscale mode image
-    assert page2.image.size == (10, 10)
+    assert isinstance(page2.image, np.ndarray)
+    assert page2.image.shape == (10, 10)
+    # Scanned pages are binarized for OCR, keeping a single channel
+    assert page2.binarized.shape == (10, 10)
+    assert set(np.unique(page2.binarized)) <= {0, 255}
+    assert page2.ocr_image is page2.binarized
+    assert page2.text_layer is None
 
     # 4. Verify that fitz.open was called correctly
     mock_fitz_open.assert_called_once_with(dummy_path)
+
+
+@mock.patch("fitz.open")
+def test_iter_pdf_pages_renders_lazily(mock_fitz_open: mock.MagicMock) -> None:
+    """
+    Tests that iter_pdf_pages only renders a page when it is consumed.
+    """
+    # Arrange: A 3-page document whose pages record when they are rendered
+    pages = [MockPage(has_text=True) for _ in range(3)]
+    renders = [mock.MagicMock(return_value=make_pixmap()) for _ in pages]
+    for page, render in zip(pages, renders):
+        page.get_pixmap = render  # type: ignore[method-assign]
+    mock_doc = mock.MagicMock()
+    mock_doc.__enter__.return_value = pages
+    mock_fitz_open.return_value = mock_doc
+
+    # Act: Consume only the first page
+    page_iter = iter_pdf_pages(pathlib.Path("test.pdf"), dpi=72)
+    first_page = next(page_iter)
+
+    # Assert: Only the first page has been rendered so far
+    assert first_page.page_number == 1
+    assert [render.call_count for render in renders] == [1, 0, 0]
+
+    # Consuming the rest renders the remaining pages in order
+    remaining = list(page_iter)
+    assert [p.page_number for p in remaining] == [2, 3]
+    mock_doc.__exit__.assert_called_once()
+
+
+@mock.patch("fitz.open")
+def test_render_pdf_to_images_scales_text_layer(mock_fitz_open: mock.MagicMock) -> None:
+    """
+    Tests that the text layer of digital pages is scaled to render coordinates.
+    """
+    # Arrange: A single digital page rendered at twice the PDF resolution
+    mock_doc = mock.MagicMock()
+    mock_doc.__enter__.return_value = [MockPage(has_text=True)]
+    mock_fitz_open.return_value = mock_doc
+
+    # Act
+    (page,) = render_pdf_to_images(pathlib.Path("test.pdf"), dpi=144)
+
+    # Assert: Word boxes are scaled by dpi / 72 and keep their text and order
+    assert page.text_layer is not None
+    assert [w[4] for w in page.text_layer] == ["some", "text"]
+    assert page.text_layer[0][:4] == pytest.approx((2.0, 4.0, 6.0, 8.0))
+    assert page.text_layer[1][:4] == pytest.approx((8.0, 4.0, 12.0, 8.0))
+
+
+@mock.patch("fitz.open")
+def test_render_pdf_to_images_multi_resolution(mock_fitz_open: mock.MagicMock) -> None:
+    """
+    Tests that multi-resolution mode renders layout images at the lower DPI.
+
+    Verifies that:
+    - Digital pages are only rendered at the layout resolution.
+    - Scanned pages keep a full-resolution base image for OCR and derive a
+      downscaled layout image from it.
+    - Page coordinates stay at the full resolution.
+    """
+    # Arrange: A digital and a scanned page, each 10x10 points
+    mock_doc = mock.MagicMock()
+    mock_doc.__enter__.return_value = [
+        MockPage(has_text=True),
+        MockPage(has_text=False),
+    ]
+    mock_fitz_open.return_value = mock_doc
+
+    # Act: Full resolution is 4x the PDF resolution, layout is 2x
+    digital, scanned = render_pdf_to_images(
+        pathlib.Path("test.pdf"), dpi=288, layout_dpi=144
+    )
+
+    # Assert
+    assert digital.image.shape == (20, 20)
+    assert digital.scale == 0.5
+    assert digital.page_size == (40, 40)
+    assert digital.layout_image is digital.image
+    # The text layer is expressed in full-resolution coordinates
+    assert digital.text_layer is not None
+    assert digital.text_layer[0][:4] == pytest.approx((4.0, 8.0, 12.0, 16.0))
+
+    assert scanned.image.shape == (40, 40)
+    assert scanned.scale == 1.0
+    assert scanned.page_size == (40, 40)
+    assert scanned.ocr_image.shape == (40, 40)
+    assert scanned.layout_scale == 0.5
+    assert scanned.layout_image.shape == (20, 20)
+    assert scanned.rgb.shape == (20, 20, 3)
+    assert scanned.source_path == pathlib.Path("test.pdf")
+
+
+@mock.patch("pyscientificpdfparser.preprocessing.render_region")
+def test_preprocessed_page_crop(mock_render_region: mock.MagicMock) -> None:
+    """
+    Tests that crops of low-resolution pages are re-rendered from the PDF.
+    """
+    # Arrange
+    region_image = np.zeros((20, 40), dtype=np.uint8)
+    mock_render_region.return_value = region_image
+    full_page = PreprocessedPage(
+        page_number=1, image=Image.new("L", (100, 100)), is_scanned=False
+    )
+    low_res_page = PreprocessedPage(
+        page_number=2,
+        image=Image.new("L", (50, 50)),
+        is_scanned=False,
+        scale=0.5,
+        source_path=pathlib.Path("test.pdf"),
+    )
+
+    # Act / Assert: Full-resolution pages are cropped directly
+    assert full_page.crop((10, 10, 50, 30)).shape == (20, 40)
+    mock_render_region.assert_not_called()
+
+    # Low-resolution pages render the region at the coordinate DPI
+    assert low_res_page.crop((10, 10, 50, 30)) is region_image
+    mock_render_region.assert_called_once_with(
+        pathlib.Path("test.pdf"), 2, (10, 10, 50, 30), 300
+    )
+
+
+@mock.patch("pyscientificpdfparser.preprocessing.render_region")
+def test_preprocessed_page_crop_is_clamped(mock_render_region: mock.MagicMock) -> None:
+    """
+    Tests that crops of boxes sticking out of the page are clamped to it.
+    """
+    # Arrange
+    full_page = PreprocessedPage(
+        page_number=1, image=Image.new("L", (100, 100)), is_scanned=False
+    )
+    low_res_page = full_page.model_copy(
+        update={"image": np.zeros((50, 50), dtype=np.uint8), "scale": 0.5}
+    )
+    rendered_page = low_res_page.model_copy(
+        update={"source_path": pathlib.Path("test.pdf")}
+    )
+    bbox = (-50.0, -50.0, 60.5, 150.0)
+
+    # Act / Assert
+    assert crop_origin(bbox) == (0, 0)
+    assert full_page.crop_box(bbox) == (0, 0, 60, 100)
+    assert full_page.crop(bbox).shape == (100, 60)
+    assert low_res_page.crop(bbox).shape == (100, 60)
+    assert low_res_page.crop((120, 10, 150, 30)).size == 0
+    assert rendered_page.crop((120, 10, 150, 30)).size == 0
+    rendered_page.crop(bbox)
+    mock_render_region.assert_called_once_with(
+        pathlib.Path("test.pdf"), 1, (0, 0, 60, 100), 300
+    )
+
+
+@mock.patch("pyscientificpdfparser.preprocessing.render_region")
+def test_preprocessed_page_render_for_ocr(mock_render_region: mock.MagicMock) -> None:
+    """
+    Tests re-rendering a region at a higher resolution for OCR.
+    """
+    # Arrange
+    region_image = np.full((40, 80), 200, dtype=np.uint8)
+    mock_render_region.return_value = region_image
+    scanned = PreprocessedPage(
+        page_number=3,
+        image=np.zeros((100, 100), dtype=np.uint8),
+        is_scanned=True,
+        source_path=pathlib.Path("test.pdf"),
+    )
+    digital = scanned.model_copy(update={"is_scanned": False})
+
+    # Act
+    binarized = scanned.render_for_ocr((10, 10, 50, 30), dpi=600)
+
+    # Assert: The bbox is scaled to the requested DPI and the region binarized
+    mock_render_region.assert_called_once_with(
+        pathlib.Path("test.pdf"), 3, (20.0, 20.0, 100.0, 60.0), 600
+    )
+    assert binarized.shape == (40, 80)
+    assert set(np.unique(binarized)) <= {0, 255}
+    assert digital.render_for_ocr((10, 10, 50, 30), dpi=600) is region_image
+
+    # Enhanced pages deskew the region like the page: a level bar of the
+    # rendered region ends up tilted
+    bar = np.full((80, 200), 255, dtype=np.uint8)
+    bar[35:45, 20:180] = 0
+    mock_render_region.return_value = bar
+    skewed = scanned.model_copy(update={"enhance": True, "skew_angle": 3.0})
+    deskewed = skewed.render_for_ocr((10, 10, 110, 50), dpi=600)
+    assert np.any(deskewed == 0, axis=1).sum() > 15
+
+    # Pages without a source PDF cannot be re-rendered
+    with pytest.raises(ValueError):
+        PreprocessedPage(
+            page_number=1, image=np.zeros((10, 10), dtype=np.uint8), is_scanned=True
+        ).render_for_ocr((0, 0, 5, 5), dpi=600)
+
+
+def test_preprocessed_page_views_are_memoized() -> None:
+    """
+    Tests that derived page views are computed once and can be released.
+    """
+    # Arrange
+    page = PreprocessedPage(
+        page_number=1,
+        image=np.full((40, 40), 200, dtype=np.uint8),
+        is_scanned=True,
+        dpi=288,
+        layout_dpi=144,
+    )
+
+    # Act / Assert: Repeated accesses return the same arrays
+    assert page.binarized is page.binarized
+    assert page.rgb is page.rgb
+    model_image = page.model_image((10, 5))
+    assert model_image.shape == (5, 10, 3)
+    assert page.model_image((10, 5)) is model_image
+    assert page.gray is page.image
+
+    # Released views are recomputed on the next access
+    binarized, rgb = page.binarized, page.rgb
+    page.release("binarized")
+    assert page.binarized is not binarized
+    assert page.rgb is rgb
+    page.release()
+    assert page.rgb is not rgb
+
+
+def make_text_page(skew: float) -> np.ndarray:
+    """Draws lines of word-like boxes on a white page, rotated by `skew`."""
+    page = np.full((1100, 850), 255, dtype=np.uint8)
+    for y in range(80, 1000, 30):
+        for x in range(80, 740, 60):
+            cv2.rectangle(page, (x, y), (x + 45, y + 12), 0, -1)
+    matrix = cv2.getRotationMatrix2D((425, 550), skew, 1)
+    return cv2.warpAffine(page, matrix, (850, 1100), borderValue=255)
+
+
+@pytest.mark.parametrize("skew", [-3.0, -0.5, 0.0, 2.0])
+def test_estimate_skew(skew: float) -> None:
+    """
+    Tests that the skew of a page of text lines is recovered.
+    """
+    # Rotating by the estimated angle undoes the skew
+    assert estimate_skew(make_text_page(skew)) == pytest.approx(-skew, abs=0.1)
+
+
+def test_enhanced_page_is_deskewed_and_denoised() -> None:
+    """
+    Tests the optional deskew/denoise stage of scanned page preprocessing.
+
+    Verifies that:
+    - The skew is estimated when the binarized view is computed.
+    - Isolated noise pixels are removed.
+    - Boxes on the deskewed view are mapped back onto the original page.
+    """
+    # Arrange: A skewed page with a speck of noise in its margin
+    image = make_text_page(2.0)
+    image[20, 20] = 0
+    page = PreprocessedPage(page_number=1, image=image, is_scanned=True, enhance=True)
+    plain = PreprocessedPage(page_number=1, image=image, is_scanned=True)
+
+    # Act
+    binarized = page.binarized
+
+    # Assert
+    assert page.skew_angle == pytest.approx(-2.0, abs=0.1)
+    assert binarized.shape == image.shape
+    assert binarized[20, 20] == 255
+    assert plain.binarized[20, 20] == 0
+    assert plain.skew_angle == 0.0
+    # The deskewed first line maps back to its rotated position on the page
+    x1, y1, x2, y2 = page.unskew((80, 80, 785, 92))
+    assert x2 - x1 > 700 and y2 - y1 > 30
+    assert plain.unskew((80, 80, 785, 92)) == (80, 80, 785, 92)
+
+
+def test_unskew_region() -> None:
+    """
+    Tests that boxes found on a deskewed region render map back to the page.
+    """
+    # Arrange: a point of the page, as `render_for_ocr` deskews it about the
+    # center of the region
+    page = PreprocessedPage(
+        page_number=1,
+        image=np.zeros((400, 400), dtype=np.uint8),
+        is_scanned=True,
+        enhance=True,
+        skew_angle=3.0,
+    )
+    region = (100.0, 200.0, 300.0, 260.0)
+    matrix = cv2.getRotationMatrix2D((100, 30), 3.0, 1)
+    x, y = matrix @ np.array([150 - 100, 210 - 200, 1])
+
+    # Act
+    mapped = page.unskew_region((x, y, x, y), region)
+    center = page.unskew_region((95, 25, 105, 35), region)
+
+    # Assert
+    assert mapped == pytest.approx((150, 210, 150, 210))
+    assert (center[0] + center[2]) / 2 == pytest.approx(200)
+    assert (center[1] + center[3]) / 2 == pytest.approx(230)
+    plain = page.model_copy(update={"skew_angle": 0.0})
+    assert plain.unskew_region((1, 2, 3, 4), region) == (101, 202, 103, 204)
+
+
+def test_pixmap_to_array_is_a_zero_copy_view() -> None:
+    """
+    Tests that rendered pixmaps are wrapped without copying their samples.
+    """
+    # Arrange
+    pix = make_pixmap(width=8, height=4)
+
+    # Act
+    array = _pixmap_to_array(pix)
+    pix.set_pixel(3, 2, (200,))
+
+    # Assert: Writes to the pixmap are visible through the array
+    assert array.shape == (4, 8)
+    assert array[2, 3] == 200
+    assert not array.flags.owndata
+
+    # Views keep the pixmap memory alive after the pixmap goes out of scope
+    del pix
+    region = array[1:3, 2:5]
+    del array
+    assert region[1, 1] == 200
+
+
+def test_iter_pdf_pages_parallel_matches_sequential(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that rendering in a process pool yields the same pages, in order.
+    """
+    # Arrange: A real 6-page PDF where every third page has no text layer
+    pdf_path = tmp_path / "parallel.pdf"
+    with fitz.open() as doc:
+        for index in range(6):
+            page = doc.new_page(width=72, height=72)
+            if index % 3:
+                page.insert_text((10, 30), f"Page {index + 1}")
+        doc.save(pdf_path)
+
+    # Act
+    sequential = list(iter_pdf_pages(pdf_path, dpi=72))
+    with mock.patch(
+        "pyscientificpdfparser.preprocessing.ProcessPoolExecutor",
+        wraps=ProcessPoolExecutor,
+    ) as pool:
+        parallel = list(iter_pdf_pages(pdf_path, dpi=72, workers=2))
+
+    # Assert: Workers are spawned, so they inherit no threads of the parent
+    assert pool.call_args.kwargs["mp_context"].get_start_method() == "spawn"
+    assert [p.page_number for p in parallel] == [1, 2, 3, 4, 5, 6]
+    assert [p.is_scanned for p in parallel] == [True, False, False] * 2
+    for expected, actual in zip(sequential, parallel):
+        assert np.array_equal(expected.image, actual.image)
+        assert expected.text_layer == actual.text_layer
+
+    # Only selected pages are rendered, in page order, past-the-end ignored
+    for workers in (1, 2):
+        selected = iter_pdf_pages(pdf_path, dpi=72, workers=workers, pages=[5, 2, 9])
+        assert [p.page_number for p in selected] == [2, 5]
+    with pytest.raises(ValueError):
+        list(iter_pdf_pages(pdf_path, pages=[0, 1]))
+
+
+def test_iter_pdf_pages_uses_render_cache(tmp_path: pathlib.Path) -> None:
+    """
+    Tests that cached pages are memory-mapped instead of being rendered again.
+    """
+    # Arrange: A real 2-page PDF, the second page without a text layer
+    pdf_path = tmp_path / "cached.pdf"
+    with fitz.open() as doc:
+        doc.new_page(width=72, height=72).insert_text((10, 30), "Cached")
+        doc.new_page(width=72, height=72)
+        doc.save(pdf_path)
+    cache = DiskCache(tmp_path / "render")
+    first_run = list(iter_pdf_pages(pdf_path, dpi=144, layout_dpi=72, cache=cache))
+
+    # Act: Render again, failing if any page is rasterized
+    with mock.patch(
+        "pyscientificpdfparser.preprocessing._render_page",
+        side_effect=AssertionError("page was rendered"),
+    ):
+        second_run = list(iter_pdf_pages(pdf_path, dpi=144, layout_dpi=72, cache=cache))
+
+    # Assert
+    assert (cache.hits, cache.misses) == (2, 2)
+    for expected, actual in zip(first_run, second_run):
+        assert isinstance(actual.image, np.memmap)
+        assert np.array_equal(expected.image, actual.image)
+        assert actual.is_scanned == expected.is_scanned
+        assert actual.scale == expected.scale
+        assert actual.text_layer == expected.text_layer
+    # The binarized view of scanned pages is cached along with the page
+    assert isinstance(second_run[1].binarized, np.memmap)
+    assert np.array_equal(first_run[1].binarized, second_run[1].binarized)
+
+    # A different resolution is a different cache entry
+    list(iter_pdf_pages(pdf_path, dpi=72, cache=cache))
+    assert cache.misses == 4
@@ -0,0 +1,67 @@
+# tests/test_reading_order.py
+import numpy as np
+
+from pyscientificpdfparser.models import TextBlock
+from pyscientificpdfparser.reading_order import sort_elements, xy_cut_order
+
+
+def test_xy_cut_order_reads_columns_and_spanning_elements() -> None:
+    """
+    Tests a two-column page with a full-width title and figure.
+    """
+    # Arrange: paragraphs of both columns line up, which interleaves them
+    # when sorting by (top, left)
+    boxes = {
+        "title": (100, 50, 900, 100),
+        "left 1": (100, 150, 480, 300),
+        "right 1": (520, 150, 900, 300),
+        "left 2": (100, 320, 480, 500),
+        "right 2": (520, 320, 900, 500),
+        "figure": (100, 550, 900, 800),
+        "left 3": (100, 850, 480, 1000),
+        "right 3": (520, 850, 900, 1000),
+    }
+    names = list(boxes)
+    shuffled = [names[i] for i in np.random.default_rng(0).permutation(len(names))]
+
+    # Act
+    order = xy_cut_order([boxes[name] for name in shuffled])
+
+    # Assert
+    assert [shuffled[i] for i in order.tolist()] == [
+        "title",
+        "left 1",
+        "left 2",
+        "right 1",
+        "right 2",
+        "figure",
+        "left 3",
+        "right 3",
+    ]
+
+
+def test_xy_cut_order_edge_cases() -> None:
+    """
+    Tests empty pages, overlapping boxes and the gap tolerance.
+    """
+    assert xy_cut_order([]).tolist() == []
+    # Overlapping boxes cannot be cut and are read top to bottom, left to right
+    assert xy_cut_order([(50, 10, 150, 60), (0, 0, 100, 50)]).tolist() == [1, 0]
+    # Columns that slightly overlap are only separated with a negative gap
+    columns = [(0, 0, 105, 40), (0, 50, 105, 90), (100, 0, 200, 40)]
+    assert xy_cut_order(columns).tolist() == [0, 2, 1]
+    assert xy_cut_order(columns, min_gap=-10).tolist() == [0, 1, 2]
+    # Bands with different columns are not merged and are read one by one
+    bands = [(0, 0, 90, 40), (110, 0, 200, 40), (0, 50, 60, 90), (70, 50, 130, 90)]
+    assert xy_cut_order(bands).tolist() == [0, 1, 2, 3]
+
+
+def test_sort_elements() -> None:
+    """
+    Tests that elements are returned in reading order.
+    """
+    right = TextBlock(text="right", bbox=(520, 100, 900, 200), page_number=1)
+    left_lower = TextBlock(text="left 2", bbox=(100, 300, 480, 400), page_number=1)
+    left = TextBlock(text="left", bbox=(100, 100, 480, 200), page_number=1)
+
+    assert sort_elements([right, left_lower, left]) == [left, left_lower, right]
@@ -0,0 +1,95 @@
+# tests/test_registry.py
+import os
+import pathlib
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import pytest
+
+import pyscientificpdfparser
+from pyscientificpdfparser.registry import ModelRegistry
+
+
+def test_model_registry_loads_lazily_and_once() -> None:
+    """
+    Tests that a model is loaded on first use, once, even from many threads.
+    """
+    # Arrange
+    calls = []
+    lock = threading.Lock()
+
+    def slow_factory() -> object:
+        with lock:
+            calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry = ModelRegistry({"layout": slow_factory})
+
+    # Act
+    loaded_before = registry.is_loaded("layout")
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        instances = list(executor.map(lambda _: registry.get("layout"), range(8)))
+
+    # Assert
+    assert not loaded_before
+    assert len(calls) == 1
+    assert all(instance is instances[0] for instance in instances)
+    assert registry.is_loaded("layout")
+    with pytest.raises(KeyError):
+        registry.get("unknown")
+
+
+def test_model_registry_set_warm_up_and_unload() -> None:
+    """
+    Tests preloaded instances, warm-up and unloading.
+    """
+    # Arrange
+    factory = mock.MagicMock()
+    preloaded = mock.MagicMock()
+    registry = ModelRegistry({"layout": factory, "table": factory})
+
+    # Act
+    registry.set("table", preloaded)
+    registry.warm_up("table")
+
+    # Assert: the preloaded instance is used and warmed up
+    factory.assert_not_called()
+    assert registry.table_recognizer is preloaded
+    preloaded.warm_up.assert_called_once_with()
+
+    # Act: unload, then use again
+    registry.unload("table")
+
+    # Assert: the next use loads the model from its factory
+    assert not registry.is_loaded("table")
+    assert registry.table_recognizer is factory.return_value
+    factory.assert_called_once_with()
+
+
+def test_importing_the_pipeline_does_not_load_the_models() -> None:
+    """
+    Tests that importing the pipeline and the CLI imports no ML framework.
+    """
+    code = (
+        "import sys, pyscientificpdfparser.core, pyscientificpdfparser.cli; "
+        "print(sorted({'torch', 'transformers'} & set(sys.modules)))"
+    )
+
+    # The package may be importable only through the pytest `pythonpath`
+    source_dir = pathlib.Path(pyscientificpdfparser.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(source_dir)}
+
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env=env,
+    )
+
+    assert result.stdout.splitlines()[-1] == "[]"
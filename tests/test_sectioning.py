@@ -1,6 +1,6 @@
 # tests/test_sectioning.py
 from pyscientificpdfparser.models import TextBlock
-from pyscientificpdfparser.sectioning import segment_into_sections
+from pyscientificpdfparser.sectioning import segment_into_sections, starts_section
 
 
 def test_segment_into_sections() -> None:
@@ -61,3 +61,18 @@ def test_segment_no_headers() -> None:
     assert len(sections) == 1
     assert sections[0].title == "Content"
     assert len(sections[0].elements) == 2
+
+
+def test_starts_section() -> None:
+    """
+    Tests the stop condition that waits for a given section header.
+    """
+    # Arrange
+    condition = starts_section("references")
+    intro = TextBlock(text="1. Introduction", bbox=(0, 0, 1, 1), page_number=1)
+    citing = TextBlock(text="See the references.", bbox=(0, 0, 1, 1), page_number=2)
+    header = TextBlock(text="7. REFERENCES", bbox=(0, 0, 1, 1), page_number=3)
+
+    # Act / Assert
+    assert not condition([intro, citing])
+    assert condition([citing, header])
@@ -0,0 +1,266 @@
+# tests/test_server.py
+import os
+import pathlib
+import stat
+import subprocess
+import sys
+import threading
+from collections.abc import Iterator
+from multiprocessing import AuthenticationError
+from typing import Any
+from unittest import mock
+
+import numpy as np
+import pytest
+
+import pyscientificpdfparser
+from pyscientificpdfparser.dla import LayoutAnalyzer
+from pyscientificpdfparser.models import Table, TableCell, TextBlock
+from pyscientificpdfparser.server import (
+    ModelClient,
+    ModelServer,
+    RemoteLayoutAnalyzer,
+    RemoteTableRecognizer,
+    connect,
+    read_authkey,
+    server_authkey,
+)
+from pyscientificpdfparser.tsr import TableRecognizer
+
+
+def detect(
+    images: Any, page_numbers: Any, page_sizes: Any, **kwargs: Any
+) -> list[list[Any]]:
+    """Stands in for the layout model: one text region and one table per page."""
+    return [
+        [
+            TextBlock(text="", bbox=(0, 0, 100, 50), page_number=number),
+            Table(bbox=(0, 60, 100, 100), page_number=number, rows=[]),
+        ]
+        for number in page_numbers
+    ]
+
+
+@pytest.fixture
+def models() -> tuple[mock.MagicMock, mock.MagicMock]:
+    """A mock layout analyzer and table recognizer with picklable results."""
+    layout_analyzer = mock.MagicMock(spec=LayoutAnalyzer)
+    layout_analyzer.batch_size = 4
+    layout_analyzer.input_size = (224, 224)
+    layout_analyzer.min_overlap = None
+    layout_analyzer.is_available = True
+    layout_analyzer.detect_regions_batch.side_effect = detect
+    table_recognizer = mock.MagicMock(spec=TableRecognizer)
+    table_recognizer.is_available = True
+    table_recognizer.batch_size = 4
+    table_recognizer.recognize_tables.side_effect = (
+        lambda images, elements, ocr_blocks, **kwargs: [
+            element.model_copy(
+                update={
+                    "rows": [
+                        [
+                            TableCell(
+                                text=" ".join(b.text for b in blocks),
+                                bbox=element.bbox,
+                            )
+                        ]
+                    ]
+                }
+            )
+            for element, blocks in zip(elements, ocr_blocks)
+        ]
+    )
+    return layout_analyzer, table_recognizer
+
+
+@pytest.fixture
+def address(
+    tmp_path: pathlib.Path, models: tuple[mock.MagicMock, mock.MagicMock]
+) -> Iterator[str]:
+    """A running model server; yields its socket path."""
+    model_server = ModelServer(
+        str(tmp_path / "models.sock"),
+        *models,
+        max_batch_size=8,
+        max_wait=0.2,
+        authkey=b"secret",
+    )
+    model_server.start()
+    yield model_server.address
+    model_server.close()
+
+
+def test_model_server_batches_requests_of_several_workers(
+    address: str, models: tuple[mock.MagicMock, mock.MagicMock]
+) -> None:
+    """
+    Tests that concurrent workers share batches and get their own results.
+    """
+    # Arrange: four workers with a connection each, two pages per request
+    layout_analyzer, _ = models
+    clients = [ModelClient(address, b"secret") for _ in range(4)]
+    barrier = threading.Barrier(len(clients))
+    results: dict[int, list[list[Any]]] = {}
+
+    def work(worker: int) -> None:
+        analyzer = RemoteLayoutAnalyzer(clients[worker])
+        barrier.wait()
+        results[worker] = analyzer.detect_regions_batch(
+            [np.zeros((4, 4), dtype=np.uint8)] * 2,
+            [2 * worker + 1, 2 * worker + 2],
+            [(100, 100), None],
+        )
+
+    # Act
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # Assert: fewer forward passes than requests, and every page accounted for
+    calls = layout_analyzer.detect_regions_batch.call_args_list
+    assert 1 <= len(calls) < 4
+    assert sum(len(call.args[1]) for call in calls) == 8
+    assert calls[0].kwargs["batch_size"] == 8
+    for worker, pages in results.items():
+        assert [page[0].page_number for page in pages] == [
+            2 * worker + 1,
+            2 * worker + 2,
+        ]
+    for client in clients:
+        client.close()
+
+
+def test_remote_models_stand_in_for_local_ones(
+    address: str, models: tuple[mock.MagicMock, mock.MagicMock]
+) -> None:
+    """
+    Tests text association in the worker, table requests and error reporting.
+    """
+    # Arrange
+    layout_analyzer, table_recognizer = models
+    remote_layout, remote_tables = connect(address, b"secret")
+    ocr_blocks = [
+        TextBlock(text="Cell", bbox=(10, 70, 30, 80), page_number=1),
+        TextBlock(text="Body", bbox=(10, 10, 30, 20), page_number=1),
+    ]
+
+    # Act
+    (elements,) = remote_layout.analyze_pages(
+        [np.zeros((4, 4), dtype=np.uint8)], [1], [ocr_blocks]
+    )
+    table = remote_tables.recognize_table(
+        np.zeros((40, 100), dtype=np.uint8), elements[1], ocr_blocks
+    )
+    tables = remote_tables.recognize_tables(
+        [np.zeros((40, 100), dtype=np.uint8)] * 2,
+        [elements[1], elements[1].model_copy(update={"bbox": (0, 0, 100, 50)})],
+        [ocr_blocks, ocr_blocks],
+    )
+    layout_analyzer.detect_regions_batch.side_effect = ValueError("bad image")
+
+    # Assert
+    assert isinstance(remote_tables, RemoteTableRecognizer)
+    assert remote_layout.batch_size == 4
+    assert remote_layout.input_size == (224, 224)
+    assert remote_layout.is_available and remote_tables.is_available
+    assert isinstance(elements[0], TextBlock) and elements[0].text == "Body"
+    assert remote_tables.batch_size == 4
+    # Only the OCR blocks inside each table are sent to the server, and the
+    # tables of a request are recognized in one call
+    assert table_recognizer.recognize_tables.call_args.args[2] == (
+        [ocr_blocks[0]],
+        [ocr_blocks[1]],
+    )
+    assert table.rows[0][0].text == "Cell"
+    assert [t.rows[0][0].text for t in tables] == ["Cell", "Body"]
+    with pytest.raises(RuntimeError, match="bad image"):
+        remote_layout.detect_regions(np.zeros((4, 4), dtype=np.uint8), 1)
+    with pytest.raises(AuthenticationError):
+        ModelClient(address, b"wrong")
+    assert stat.S_IMODE(os.stat(address).st_mode) == 0o600
+    with pytest.raises(OSError):
+        ModelServer(address, *models).start()
+    remote_layout.client.close()
+
+
+def test_server_authkey(tmp_path: pathlib.Path) -> None:
+    """
+    Tests the key generated for the servers and workers of a user.
+    """
+    # Arrange
+    key_file = tmp_path / "run" / "models.key"
+
+    # Act
+    key = server_authkey(key_file)
+
+    # Assert
+    assert len(key) == 64
+    assert stat.S_IMODE(key_file.parent.stat().st_mode) == 0o700
+    assert stat.S_IMODE(key_file.stat().st_mode) == 0o600
+    # Later servers and the workers get the same key
+    assert server_authkey(key_file) == read_authkey(key_file) == key
+    assert os.listdir(key_file.parent) == ["models.key"]
+    with pytest.raises(FileNotFoundError):
+        read_authkey(tmp_path / "missing.key")
+    # A directory other users can access is refused
+    key_file.parent.chmod(0o755)
+    with pytest.raises(PermissionError):
+        server_authkey(key_file)
+
+
+def test_server_requires_authkey(
+    tmp_path: pathlib.Path, models: tuple[mock.MagicMock, mock.MagicMock]
+) -> None:
+    """
+    Tests that servers without a key generate one, and never run without one.
+    """
+    # Arrange
+    key_file = tmp_path / "run" / "models.key"
+    address = str(tmp_path / "models.sock")
+
+    with mock.patch(
+        "pyscientificpdfparser.server.default_key_file", return_value=key_file
+    ):
+        # Act
+        model_server = ModelServer(address, *models)
+        model_server.start()
+        try:
+            # Assert
+            assert model_server.authkey == read_authkey(key_file)
+            # Workers of the same user find the key themselves
+            client = ModelClient(address)
+            assert client.call("info")["batch_size"] == 4
+            client.close()
+            with pytest.raises(AuthenticationError):
+                ModelClient(address, b"wrong")
+        finally:
+            model_server.close()
+
+    with pytest.raises(ValueError):
+        ModelServer(address, *models, authkey=b"").start()
+
+
+def test_modules_import_without_user_ids() -> None:
+    """
+    Tests that the server and the CLI import where `os.getuid` is missing.
+    """
+    # Arrange: as on Windows, which has no user ids
+    code = (
+        "import os, sys; del os.getuid; "
+        "import pyscientificpdfparser.cli; "
+        "assert 'pyscientificpdfparser.server' not in sys.modules; "
+        "import pyscientificpdfparser.server"
+    )
+    source_dir = pathlib.Path(pyscientificpdfparser.__file__).parent.parent
+    env = {**os.environ, "PYTHONPATH": str(source_dir)}
+    env.pop("XDG_RUNTIME_DIR", None)
+
+    # Act
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, env=env
+    )
+
+    # Assert
+    assert result.returncode == 0, result.stderr
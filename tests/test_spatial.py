@@ -0,0 +1,81 @@
+# tests/test_spatial.py
+import numpy as np
+import pytest
+
+from pyscientificpdfparser.models import TextBlock
+from pyscientificpdfparser.spatial import SpatialIndex
+
+
+def random_boxes(count: int, seed: int = 0) -> np.ndarray:
+    """Random word-sized boxes on a 2500x3500 page."""
+    rng = np.random.default_rng(seed)
+    origins = rng.uniform(0, [2400, 3450], size=(count, 2))
+    sizes = rng.uniform([10, 8], [100, 40], size=(count, 2))
+    return np.hstack([origins, origins + sizes])
+
+
+@pytest.mark.parametrize("cell_size", [None, 5.0, 500.0])
+def test_query_centers_matches_brute_force(cell_size: float | None) -> None:
+    """
+    Tests that containment queries find exactly the boxes whose center is inside.
+    """
+    # Arrange
+    boxes = random_boxes(2000)
+    centers = (boxes[:, :2] + boxes[:, 2:]) / 2
+    index = SpatialIndex(boxes, cell_size=cell_size)
+    regions = random_boxes(50, seed=1) * [1, 1, 3, 3] + [0, 0, 200, 200]
+
+    for region in regions.tolist():
+        # Act
+        found = index.query_centers(tuple(region))
+
+        # Assert
+        expected = np.flatnonzero(
+            (centers[:, 0] >= region[0])
+            & (centers[:, 0] <= region[2])
+            & (centers[:, 1] >= region[1])
+            & (centers[:, 1] <= region[3])
+        )
+        np.testing.assert_array_equal(found, expected)
+
+
+def test_overlap_queries_and_assignment() -> None:
+    """
+    Tests area-overlap queries and the assignment of boxes to regions.
+
+    Verifies that:
+    - Overlap fractions are relative to the area of each box.
+    - A box straddling two regions goes to the one covering most of it.
+    - Boxes not covered enough by any region are left unassigned.
+    """
+    # Arrange
+    blocks = [
+        TextBlock(text="left", bbox=(0, 0, 40, 10), page_number=1),
+        TextBlock(text="straddling", bbox=(40, 0, 80, 10), page_number=1),
+        TextBlock(text="right", bbox=(110, 0, 150, 10), page_number=1),
+        TextBlock(text="far away", bbox=(500, 500, 540, 510), page_number=1),
+    ]
+    index = SpatialIndex.from_elements(blocks)
+    left_region, right_region = (0, 0, 70, 20), (70, 0, 160, 20)
+
+    # Act
+    candidates, fraction = index.overlaps(left_region)
+    assigned = index.assign([left_region, right_region], min_overlap=0.5)
+
+    # Assert
+    assert candidates.tolist() == [0, 1]
+    assert fraction.tolist() == pytest.approx([1.0, 0.75])
+    assert index.query_overlap(right_region, min_overlap=0.5).tolist() == [2]
+    assert index.query_overlap(right_region, min_overlap=0.1).tolist() == [1, 2]
+    assert [indices.tolist() for indices in assigned] == [[0, 1], [2]]
+
+
+def test_empty_index() -> None:
+    """
+    Tests that an index without boxes answers every query with no results.
+    """
+    index = SpatialIndex([])
+    assert len(index) == 0
+    assert index.query_centers((0, 0, 100, 100)).tolist() == []
+    assert index.query_overlap((0, 0, 100, 100)).tolist() == []
+    assert [indices.tolist() for indices in index.assign([(0, 0, 1, 1)])] == [[]]
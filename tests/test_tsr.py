@@ -1,19 +1,216 @@
 # tests/test_tsr.py
+import contextlib
+from pathlib import Path
 from unittest import mock
 
+import numpy as np
+import torch
 from PIL import Image
 
+from pyscientificpdfparser import ocr, preprocessing
 from pyscientificpdfparser.models import Table, TextBlock
-from pyscientificpdfparser.tsr import TableRecognizer
+from pyscientificpdfparser.spatial import SpatialIndex, split_words
+from pyscientificpdfparser.tsr import (
+    COLUMN_LABEL,
+    ROW_LABEL,
+    TableRecognizer,
+    build_table_grid,
+)
+
+# The classes of the Table Transformer structure model
+TATR_ID2LABEL = {
+    0: "table",
+    1: "table column",
+    2: "table row",
+    3: "table column header",
+    4: "table projected row header",
+    5: "table spanning cell",
+}
+NO_OBJECT = 6
+
+
+def _structure_outputs(
+    queries: list[tuple[int, tuple[float, float, float, float]]],
+) -> dict[str, torch.Tensor]:
+    """
+    Builds Table Transformer outputs with confident queries.
+
+    Args:
+        queries: The class id and the normalized (x1, y1, x2, y2) box of each
+            query.
+    """
+    logits = torch.zeros(1, len(queries), NO_OBJECT + 1)
+    boxes = torch.zeros(1, len(queries), 4)
+    for i, (label, (x1, y1, x2, y2)) in enumerate(queries):
+        logits[0, i, label] = 10.0
+        # The model predicts centers and sizes
+        boxes[0, i] = torch.tensor([(x1 + x2) / 2, (y1 + y2) / 2, x2 - x1, y2 - y1])
+    return {"logits": logits, "pred_boxes": boxes}
+
+
+@mock.patch("pyscientificpdfparser.tsr.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.tsr.AutoProcessor")
+def test_table_recognizer_builds_cell_grid(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that rows, columns, headers and spanning cells become a cell grid.
+    """
+    # --- Arrange ---
+    mock_model_instance = mock.MagicMock()
+    mock_model_instance.config.id2label = TATR_ID2LABEL
+    mock_model_cls.from_pretrained.return_value = mock_model_instance
+    # Two columns and three rows; the first row is a header and the last row
+    # is a single cell spanning both columns
+    mock_model_instance.return_value = _structure_outputs(
+        [
+            (1, (0.0, 0.0, 0.5, 1.0)),
+            (1, (0.5, 0.0, 1.0, 1.0)),
+            (2, (0.0, 0.6, 1.0, 1.0)),
+            (2, (0.0, 0.0, 1.0, 0.2)),
+            (2, (0.0, 0.2, 1.0, 0.6)),
+            (3, (0.0, 0.0, 1.0, 0.2)),
+            (5, (0.0, 0.6, 1.0, 1.0)),
+            (NO_OBJECT, (0.0, 0.0, 1.0, 1.0)),
+        ]
+    )
+    table_from_dla = Table(bbox=(100, 100, 400, 400), page_number=1, rows=[])
+    # Page-space words: columns split at x=250, rows at y=160 and y=280
+    words = {
+        "Name": (130, 120, 170, 140),
+        "Value": (280, 120, 320, 140),
+        "alpha": (130, 190, 170, 210),
+        "1": (290, 210, 310, 230),
+        "Total": (130, 320, 170, 340),
+        "2": (320, 340, 340, 360),
+        "Page text": (20, 40, 80, 60),
+    }
+    ocr_blocks = [
+        TextBlock(text=text, bbox=bbox, page_number=1) for text, bbox in words.items()
+    ]
+
+    # --- Act ---
+    recognizer = TableRecognizer()
+    table = recognizer.recognize_table(
+        table_image=Image.new("RGB", (300, 300)),
+        table_element=table_from_dla,
+        ocr_blocks=ocr_blocks,
+    )
+
+    # --- Assert ---
+    assert [[cell.text for cell in row] for row in table.rows] == [
+        ["Name", "Value"],
+        ["alpha", "1"],
+        ["Total 2"],
+    ]
+    assert [cell.is_header for cell in table.rows[0]] == [True, True]
+    assert not table.rows[1][0].is_header
+    # Cells are the intersections of their row and column, on the page
+    assert table.rows[0][1].bbox == (250, 100, 400, 160)
+    spanning = table.rows[2][0]
+    assert (spanning.row_span, spanning.col_span) == (1, 2)
+    assert spanning.bbox == (100, 280, 400, 400)
+
+
+@mock.patch("pyscientificpdfparser.tsr.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.tsr.AutoProcessor")
+def test_table_recognizer_places_cells_of_clamped_crops(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests that cells are placed by the crop, for tables sticking out of the page.
+    """
+    # --- Arrange ---
+    mock_model_instance = mock.MagicMock()
+    mock_model_instance.config.id2label = TATR_ID2LABEL
+    mock_model_cls.from_pretrained.return_value = mock_model_instance
+    mock_model_instance.return_value = _structure_outputs(
+        [(1, (0.0, 0.0, 1.0, 1.0)), (2, (0.0, 0.0, 1.0, 0.5))]
+    )
+    page = preprocessing.PreprocessedPage(
+        page_number=1, image=np.zeros((300, 300), dtype=np.uint8), is_scanned=False
+    )
+    table_from_dla = Table(bbox=(-50, -50, 100, 100), page_number=1, rows=[])
+    crop = page.crop(table_from_dla.bbox)
+
+    # --- Act ---
+    table = TableRecognizer().recognize_table(crop, table_from_dla, [])
+
+    # --- Assert: The crop is the 100x100 pixels on the page ---
+    assert crop.shape == (100, 100)
+    assert table.rows[0][0].bbox == (0, 0, 100, 50)
 
 
 @mock.patch("pyscientificpdfparser.tsr.AutoModelForObjectDetection")
 @mock.patch("pyscientificpdfparser.tsr.AutoProcessor")
-def test_table_recognizer_placeholder_logic(
+def test_recognize_tables_batches_forward_passes(
     mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
 ) -> None:
     """
-    Tests the placeholder logic in the TableRecognizer.
+    Tests that tables share forward passes and get their own results back.
+    """
+    # --- Arrange ---
+    mock_processor_instance = mock.MagicMock()
+    mock_model_instance = mock.MagicMock()
+    mock_processor_cls.from_pretrained.return_value = mock_processor_instance
+    mock_model_cls.from_pretrained.return_value = mock_model_instance
+    mock_model_instance.config.id2label = TATR_ID2LABEL
+    two_columns = [(1, (0.0, 0.0, 0.5, 1.0)), (1, (0.5, 0.0, 1.0, 1.0))]
+    one_row = [(2, (0.0, 0.0, 1.0, 1.0))]
+    nothing = [(NO_OBJECT, (0.0, 0.0, 1.0, 1.0))] * 3
+
+    def batch(
+        *tables: list[tuple[int, tuple[float, float, float, float]]],
+    ) -> dict[str, torch.Tensor]:
+        outputs = [_structure_outputs(queries) for queries in tables]
+        return {
+            key: torch.cat([output[key] for output in outputs])
+            for key in ("logits", "pred_boxes")
+        }
+
+    # A batch of two tables, then a batch of one
+    mock_model_instance.side_effect = [
+        batch(two_columns + one_row, nothing),
+        batch(one_row + [(1, (0.0, 0.0, 1.0, 1.0))] + nothing[:1]),
+    ]
+    tables = [
+        Table(bbox=(0, 0, 100, 100), page_number=1, rows=[]),
+        Table(bbox=(0, 200, 100, 300), page_number=1, rows=[]),
+        Table(bbox=(0, 0, 100, 100), page_number=2, rows=[]),
+    ]
+    page_1 = [
+        TextBlock(text="a", bbox=(10, 40, 20, 60), page_number=1),
+        TextBlock(text="b", bbox=(60, 40, 70, 60), page_number=1),
+        TextBlock(text="c", bbox=(10, 240, 20, 260), page_number=1),
+    ]
+    page_2 = [TextBlock(text="d", bbox=(40, 40, 60, 60), page_number=2)]
+
+    # --- Act ---
+    recognizer = TableRecognizer(batch_size=2)
+    results = recognizer.recognize_tables(
+        [Image.new("RGB", (100, 100))] * 3, tables, [page_1, page_1, page_2]
+    )
+
+    # --- Assert ---
+    assert mock_model_instance.call_count == 2
+    assert [
+        len(call.kwargs["images"]) for call in mock_processor_instance.call_args_list
+    ] == [2, 1]
+    assert [[[cell.text for cell in row] for row in t.rows] for t in results] == [
+        [["a", "b"]],
+        [["c"]],  # No structure: the single-cell fallback
+        [["d"]],
+    ]
+    assert results[0].rows[0][1].bbox == (50, 0, 100, 100)
+
+
+@mock.patch("pyscientificpdfparser.tsr.AutoModelForObjectDetection")
+@mock.patch("pyscientificpdfparser.tsr.AutoProcessor")
+def test_table_recognizer_falls_back_to_single_cell(
+    mock_processor_cls: mock.MagicMock, mock_model_cls: mock.MagicMock
+) -> None:
+    """
+    Tests the fallback when no rows or columns are detected.
 
     Verifies that it correctly aggregates all text within the table's
     bounding box into a single cell.
@@ -24,8 +221,11 @@ def test_table_recognizer_placeholder_logic(
     mock_model_instance = mock.MagicMock()
     mock_processor_cls.from_pretrained.return_value = mock_processor_instance
     mock_model_cls.from_pretrained.return_value = mock_model_instance
-    # The model's output is not used by the placeholder logic, so it's simple
-    mock_model_instance.return_value = {}
+    mock_model_instance.config.id2label = TATR_ID2LABEL
+    # Every query predicts "no object"
+    mock_model_instance.return_value = _structure_outputs(
+        [(NO_OBJECT, (0.0, 0.0, 1.0, 1.0))] * 3
+    )
 
     # 2. Dummy input data
     dummy_image = Image.new("RGB", (500, 500))
@@ -89,3 +289,49 @@ def test_table_recognizer_handles_model_loading_error(
     assert recognizer.processor is None
     # It should return the original, unmodified table element
     assert populated_table == table_from_dla
+
+
+def test_build_table_grid_fills_cells_from_real_ocr_output() -> None:
+    """
+    Tests the grid on the text of a real table, as `extract_text_from_page`
+    returns it: one paragraph-level block whose words fill the cells.
+    """
+    # --- Arrange ---
+    pdf_path = Path(__file__).parent / "fixtures" / "arxiv-1410.6579.pdf"
+    with contextlib.closing(preprocessing.iter_pdf_pages(pdf_path, pages=[7])) as pages:
+        page = next(pages)
+    blocks = ocr.extract_text_from_page(page)
+    # Table 1 of the paper: a label column and five columns k = 0..4, below
+    # a header row, over ten rows of states
+    table_bbox = (685.0, 371.0, 1769.0, 1244.0)
+    column_edges = [685.0, 830.0, 1027.0, 1224.0, 1421.0, 1618.0, 1769.0]
+    row_edges = np.linspace(371.0, 1244.0, 12).tolist()
+    boxes = np.array(
+        [(x1, 371.0, x2, 1244.0) for x1, x2 in zip(column_edges, column_edges[1:])]
+        + [(685.0, y1, 1769.0, y2) for y1, y2 in zip(row_edges, row_edges[1:])]
+    )
+    labels = [COLUMN_LABEL] * 6 + [ROW_LABEL] * 11
+    words = split_words(blocks)
+
+    # --- Act ---
+    rows = build_table_grid(
+        boxes, labels, table_bbox, words, SpatialIndex.from_elements(words)
+    )
+
+    # --- Assert ---
+    # The whole table is a single OCR block, but every cell gets its own text
+    table_blocks = SpatialIndex.from_elements(blocks).query_centers(table_bbox)
+    assert len(table_blocks) == 1
+    assert len(blocks[int(table_blocks[0])].words or []) > 60
+    assert len(rows) == 11 and all(len(row) == 6 for row in rows)
+    assert all(cell.text for row in rows for cell in row)
+    assert [cell.text for cell in rows[0]] == [
+        "πn",
+        "k = 0",
+        "k = 1",
+        "k = 2",
+        "k = 3",
+        "k = 4",
+    ]
+    assert [cell.text for cell in rows[1]] == ["|0⟩", "E1", "∗", "∗", "∗", "∗"]
+    assert [cell.text for cell in rows[3]] == ["|φ1⟩", "∗", "E2", "∗", "∗", "∗"]